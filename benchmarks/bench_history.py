@@ -0,0 +1,136 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+# ---------------------------------------------------------- #
+# Timing and result history shared by the benchmarks
+# ---------------------------------------------------------- #
+# Every benchmark run is appended to a JSON history file as one record
+# (suite, scale, environment, one timing summary per measurement), and
+# compared with the previous record of the same suite and scale.
+HISTORY_PATH = os.path.join('benchmarks', 'results', 'history.json')
+
+# A measurement whose median grew by more than this share is a regression
+REGRESSION_THRESHOLD = 0.25
+# Measurements faster than this (seconds) are too noisy to flag
+MIN_REGRESSION_SECONDS = 0.001
+
+
+def time_call(fn, repeat=5, setup=None):
+    """
+    Run fn repeat times and summarize the wall clock times.
+
+    Args:
+        fn (callable): Measured call (no arguments).
+        repeat (int): Number of timed runs.
+        setup (callable): Called untimed before every run (e.g. to clear caches).
+
+    Returns:
+        dict: runs, min, median, mean and max seconds.
+    """
+    samples = []
+    for _ in range(max(int(repeat), 1)):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    return {
+        'runs': len(samples),
+        'min': round(min(samples), 6),
+        'median': round(statistics.median(samples), 6),
+        'mean': round(statistics.fmean(samples), 6),
+        'max': round(max(samples), 6),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_record(suite, scale, params, results):
+    """
+    One history entry: what was measured, where, and the timing summaries.
+    """
+    return {
+        'suite': suite,
+        'scale': scale,
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'params': params,
+        'results': results,
+    }
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def append_history(record, path=HISTORY_PATH):
+    history = load_history(path)
+    history.append(record)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(history, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def previous_record(history, suite, scale):
+    """
+    The latest recorded run of the same suite and scale, or None.
+    """
+    for record in reversed(history):
+        if record.get('suite') == suite and record.get('scale') == scale:
+            return record
+    return None
+
+
+def find_regressions(record, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare the medians of two runs.
+
+    Args:
+        record (dict): New run (see run_record()).
+        baseline (dict): Earlier run of the same suite and scale.
+        threshold (float): Allowed relative growth of a median.
+
+    Returns:
+        list: (measurement, baseline median, new median) for every measurement
+        that got slower than allowed.
+    """
+    regressions = []
+    for name, result in record['results'].items():
+        before = baseline['results'].get(name)
+        if not before or 'median' not in result or 'median' not in before:
+            continue
+        if result['median'] < MIN_REGRESSION_SECONDS:
+            continue
+        if result['median'] > before['median'] * (1 + threshold):
+            regressions.append((name, before['median'], result['median']))
+    return regressions
+
+
+def print_results(record, baseline=None):
+    print(f"\n{record['suite']} [{record['scale']}] {record['params']}")
+    for name, result in record['results'].items():
+        line = f"  {name:<45} median {result['median'] * 1000:10.2f} ms   min {result['min'] * 1000:10.2f} ms"
+        before = baseline['results'].get(name) if baseline else None
+        if before and before.get('median'):
+            line += f"   ({result['median'] / before['median']:.2f}x previous)"
+        print(line)
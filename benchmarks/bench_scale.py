@@ -0,0 +1,205 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+
+import columnar_engine
+import stats_queries
+import step_4_dashboard as dashboard
+from db_connection import get_engine
+from db_loader import TABLE_LOAD_ORDER, build_and_swap_database
+from figure_cache import clear_figure_cache
+from parquet_store import read_parquet_tables, save_dfs_to_parquet
+from benchmarks.bench_history import (
+    HISTORY_PATH, REGRESSION_THRESHOLD, time_call, run_record, load_history, append_history,
+    previous_record, find_regressions, print_results)
+from benchmarks.synthetic_data import SCALES, LEAGUES, generate_tables, write_csvs
+
+# ---------------------------------------------------------- #
+# Scale benchmark: import, queries and dashboard data preparation
+# ---------------------------------------------------------- #
+# Run from the repository root:
+#   python -m benchmarks.bench_scale
+#   BENCH_SCALES=small,medium BENCH_REPEAT=3 python -m benchmarks.bench_scale
+# Every scale is generated, imported like step_2 does, and queried through
+# stats_queries (both engines); results are appended to the history file and
+# compared with the previous run of the same scale. The exit status is 1 if a
+# measurement regressed by more than BENCH_THRESHOLD.
+BENCH_SCALES = [scale.strip() for scale in os.environ.get('BENCH_SCALES', 'current,small').split(',') if scale.strip()]
+BENCH_REPEAT = int(os.environ.get('BENCH_REPEAT', 5))
+BENCH_HISTORY = os.environ.get('BENCH_HISTORY', HISTORY_PATH)
+BENCH_THRESHOLD = float(os.environ.get('BENCH_THRESHOLD', REGRESSION_THRESHOLD))
+# Working directory for the generated csv/, parquet/ and database ('' = a temporary directory, removed afterwards)
+BENCH_WORKDIR = os.environ.get('BENCH_WORKDIR', '')
+
+SCHEMA_PATH = os.path.join('db', 'schema.sql')
+SUITE = 'scale'
+
+
+def benchmark_import(workdir, tables, results):
+    """
+    Time step_2's import path: CSV read, full build and swap, and the Parquet round trip.
+
+    Returns:
+        str: Path of the imported database.
+    """
+    csv_dir = os.path.join(workdir, 'csv')
+    parquet_dir = os.path.join(workdir, 'parquet')
+    db_path = os.path.join(workdir, 'db', 'baseball_stats.db')
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    write_csvs(tables, csv_dir)
+    with open(SCHEMA_PATH) as f:
+        schema_sql = f.read()
+
+    def read_csvs():
+        return {name: pd.read_csv(os.path.join(csv_dir, f"{name}.csv")) for name in TABLE_LOAD_ORDER}
+
+    dfs = read_csvs()
+    results['import.read_csv'] = time_call(read_csvs, BENCH_REPEAT)
+    results['import.build_and_swap'] = time_call(lambda: build_and_swap_database(db_path, schema_sql, dfs), BENCH_REPEAT)
+    results['import.write_parquet'] = time_call(lambda: save_dfs_to_parquet(dfs, parquet_dir), BENCH_REPEAT)
+    results['import.read_parquet'] = time_call(lambda: read_parquet_tables(parquet_dir), BENCH_REPEAT)
+    return db_path
+
+
+def query_calls(engine, tables):
+    """
+    One call of every stats_queries function, with parameters that exist in the generated data.
+    """
+    years = tables['years']['year']
+    league = LEAGUES[0]
+    stat_title = 'Hitting Statistics'
+    statistic = 'Home Runs'
+    year = int(years.iloc[len(years) // 2])
+
+    return {
+        'distinct_values': lambda: stats_queries.distinct_values(engine, 'years', 'year'),
+        'statistics_by_title': lambda: stats_queries.statistics_by_title(engine, stat_title),
+        'stats_by_league_year_title': lambda: stats_queries.stats_by_league_year_title(
+            engine, league, year, stat_title, 'no', 'desc'),
+        'statistic_results': lambda: stats_queries.statistic_results(engine, league, stat_title, statistic),
+        'statistic_ranking': lambda: stats_queries.statistic_ranking(engine, league, stat_title, statistic),
+        'league_comparison': lambda: stats_queries.league_comparison(engine, stat_title, statistic),
+        'top_25_players': lambda: stats_queries.top_25_players(engine),
+        'players_per_team': lambda: stats_queries.players_per_team(engine),
+        'max_player_appearances': lambda: stats_queries.max_player_appearances(engine),
+        'player_appearances': lambda: stats_queries.player_appearances(engine, 1),
+    }
+
+
+def benchmark_queries(db_path, tables, results):
+    engine = get_engine(db_path)
+    calls = query_calls(engine, tables)
+
+    query_engine = stats_queries.QUERY_ENGINE
+    try:
+        # SQL: cold (result cache cleared before every run) and served from the result cache
+        stats_queries.QUERY_ENGINE = 'sql'
+        for name, call in calls.items():
+            results[f"query.sql.{name}"] = time_call(call, BENCH_REPEAT, setup=stats_queries.clear_query_cache)
+            results[f"query.sql.{name}.cached"] = time_call(call, BENCH_REPEAT)
+
+        # Columnar engine: loading the arrays once per database version, then every query
+        stats_queries.QUERY_ENGINE = 'memory'
+        results['query.memory.load'] = time_call(
+            lambda: columnar_engine.get_columnar_stats(db_path), BENCH_REPEAT,
+            setup=columnar_engine.loaded_stats.clear)
+        for name, call in calls.items():
+            results[f"query.memory.{name}"] = time_call(call, BENCH_REPEAT, setup=stats_queries.clear_query_cache)
+    finally:
+        stats_queries.QUERY_ENGINE = query_engine
+        stats_queries.clear_query_cache()
+        columnar_engine.loaded_stats.clear()
+        engine.dispose()
+
+
+def benchmark_dashboard(db_path, tables, results):
+    """
+    Time the dashboard's data preparation and figure construction on query results of this scale.
+    """
+    engine = get_engine(db_path)
+    league = LEAGUES[0]
+    stat_title = 'Hitting Statistics'
+    statistic = 'Home Runs'
+
+    yearly = stats_queries.statistic_results(engine, league, stat_title, statistic)
+    leagues = stats_queries.league_comparison(engine, stat_title, statistic)
+    ranking = stats_queries.statistic_ranking(engine, league, stat_title, statistic)
+    appearances = stats_queries.player_appearances(engine, 1)
+
+    # Page sections with the query results cached: building the figures vs. serving them from figure_cache
+    sections = {
+        'yearly_results_section': lambda: dashboard.yearly_results_section(engine, league, stat_title, statistic),
+        'league_comparison_section': lambda: dashboard.league_comparison_section(engine, stat_title, statistic),
+    }
+    for name, call in sections.items():
+        results[f"dashboard.{name}"] = time_call(call, BENCH_REPEAT, setup=clear_figure_cache)
+        results[f"dashboard.{name}.cached"] = time_call(call, BENCH_REPEAT)
+    clear_figure_cache()
+    engine.dispose()
+
+    yearly_df, year_order = dashboard.yearly_chart_data(yearly.copy())
+    leagues_df = dashboard.league_comparison_data(leagues.copy())
+
+    results['dashboard.yearly_chart_data'] = time_call(
+        lambda: dashboard.yearly_chart_data(yearly.copy()), BENCH_REPEAT)
+    results['dashboard.yearly_bar_chart'] = time_call(
+        lambda: dashboard.yearly_bar_chart(yearly_df, year_order, league, stat_title, statistic), BENCH_REPEAT)
+    results['dashboard.league_comparison_data'] = time_call(
+        lambda: dashboard.league_comparison_data(leagues.copy()), BENCH_REPEAT)
+    results['dashboard.league_comparison_chart'] = time_call(
+        lambda: dashboard.league_comparison_chart(leagues_df, stat_title, statistic), BENCH_REPEAT)
+    results['dashboard.ranking_table'] = time_call(
+        lambda: dashboard.ranking_table(ranking.copy()), BENCH_REPEAT)
+    results['dashboard.player_sunburst'] = time_call(
+        lambda: dashboard.player_sunburst(appearances), BENCH_REPEAT)
+
+
+def run_scale(scale, workdir):
+    """
+    Generate, import, query and prepare one scale.
+
+    Returns:
+        dict: History record of the run.
+    """
+    params = SCALES[scale]
+    tables = generate_tables(**params)
+    params = dict(params, fact_rows=len(tables['last_5_ys_yearly_stats']), repeat=BENCH_REPEAT)
+    print(f"\nScale '{scale}': {params['fact_rows']} fact rows")
+
+    results = {}
+    db_path = benchmark_import(workdir, tables, results)
+    benchmark_queries(db_path, tables, results)
+    benchmark_dashboard(db_path, tables, results)
+    return run_record(SUITE, scale, params, results)
+
+
+if __name__ == "__main__":
+    unknown = [scale for scale in BENCH_SCALES if scale not in SCALES]
+    if unknown:
+        print(f"Unknown BENCH_SCALES {unknown}, expected some of {list(SCALES)}")
+        sys.exit(2)
+
+    workdir = BENCH_WORKDIR or tempfile.mkdtemp(prefix='baseball_bench_')
+    history = load_history(BENCH_HISTORY)
+    regressions = []
+    try:
+        for scale in BENCH_SCALES:
+            record = run_scale(scale, os.path.join(workdir, scale))
+            baseline = previous_record(history, SUITE, scale)
+            print_results(record, baseline)
+            if baseline is not None:
+                regressions += [(scale, *regression) for regression in find_regressions(record, baseline, BENCH_THRESHOLD)]
+            append_history(record, BENCH_HISTORY)
+        print(f"\nSaved: {BENCH_HISTORY}")
+    finally:
+        if not BENCH_WORKDIR:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if regressions:
+        print(f"\n{len(regressions)} measurements are more than {BENCH_THRESHOLD:.0%} slower than the previous run:")
+        for scale, name, before, after in regressions:
+            print(f"  [{scale}] {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        sys.exit(1)
@@ -0,0 +1,206 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from scraper_parse import parse_html, scrape_stats_table, iter_page_stats, link_list
+from benchmarks.bench_history import (
+    HISTORY_PATH, REGRESSION_THRESHOLD, time_call, run_record, load_history, append_history,
+    previous_record, find_regressions, print_results)
+from benchmarks.page_corpus import MENU_PATH, load_manifest, synthesize_corpus
+from benchmarks.replay_server import start_replay_server
+
+# ---------------------------------------------------------- #
+# Scraper benchmark: parser per page and the full scrape path offline
+# ---------------------------------------------------------- #
+# Run from the repository root:
+#   python -m benchmarks.bench_scraper
+#   BENCH_SEASONS=50 REPLAY_LATENCY_MS=100 REPLAY_ERROR_RATE=0.05 python -m benchmarks.bench_scraper
+#   BENCH_CORPUS=benchmarks/corpus python -m benchmarks.bench_scraper   (a recorded corpus)
+# The parser functions are timed on every page of the corpus; step_1_scrape_data.py
+# itself then runs against the replay server in csv mode (the five-season window)
+# and backfill mode (every season), and its run report supplies the per-stage
+# times and pages/sec. Same history and regression check as bench_scale.
+BENCH_CORPUS = os.environ.get('BENCH_CORPUS', '')
+# Synthetic corpus size: 500 seasons = 1000 year pages, 100x the scraped window
+BENCH_SEASONS = int(os.environ.get('BENCH_SEASONS', 500))
+BENCH_REPEAT = int(os.environ.get('BENCH_REPEAT', 3))
+BENCH_HISTORY = os.environ.get('BENCH_HISTORY', HISTORY_PATH)
+BENCH_THRESHOLD = float(os.environ.get('BENCH_THRESHOLD', REGRESSION_THRESHOLD))
+# Scrape modes to run against the replay server
+BENCH_SCRAPE_MODES = [mode.strip() for mode in os.environ.get('BENCH_SCRAPE_MODES', 'csv,backfill').split(',') if mode.strip()]
+REPLAY_LATENCY_MS = float(os.environ.get('REPLAY_LATENCY_MS', 20))
+REPLAY_JITTER_MS = float(os.environ.get('REPLAY_JITTER_MS', 10))
+REPLAY_ERROR_RATE = float(os.environ.get('REPLAY_ERROR_RATE', 0))
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRAPER_SCRIPT = os.path.join(REPO_DIR, 'step_1_scrape_data.py')
+SCHEMA_PATH = os.path.join(REPO_DIR, 'db', 'schema.sql')
+SUITE = 'scraper'
+
+# step_1 settings per benchmarked mode
+SCRAPE_MODES = {
+    'csv': {'SCRAPER_MODE': 'full', 'SCRAPER_PIPELINE': 'csv'},
+    'stream': {'SCRAPER_MODE': 'full', 'SCRAPER_PIPELINE': 'stream'},
+    'backfill': {'SCRAPER_MODE': 'backfill', 'SCRAPER_YEARS': 'all'},
+}
+
+
+def per_page(result, pages):
+    # Timing summary of a whole-corpus loop, as seconds per page
+    return dict(result, **{key: round(result[key] / pages, 6) for key in ('min', 'median', 'mean', 'max')})
+
+
+def benchmark_parser(corpus_dir, manifest, results):
+    """
+    Time parse_html, scrape_stats_table and iter_page_stats per year page, and link_list on the menu.
+    """
+    bodies = []
+    for page in manifest['pages']:
+        if page['path'] == MENU_PATH:
+            continue
+        with open(os.path.join(corpus_dir, *page['path'].split('/')), 'rb') as f:
+            bodies.append(f.read())
+    with open(os.path.join(corpus_dir, MENU_PATH), 'rb') as f:
+        menu = f.read()
+
+    soups = [parse_html(body) for body in bodies]
+    pages = len(bodies)
+
+    def scrape_tables():
+        for soup in soups:
+            for table in soup.find_all('table', class_='boxed')[:2]:
+                scrape_stats_table(table)
+
+    def iterate_rows():
+        for soup in soups:
+            for _ in iter_page_stats(soup):
+                pass
+
+    menu_soup = parse_html(menu)
+    headers = menu_soup.find('table', class_='boxed').find_all('td', class_='header')[:2]
+
+    results['parse.parse_html_per_page'] = per_page(
+        time_call(lambda: [parse_html(body) for body in bodies], BENCH_REPEAT), pages)
+    results['parse.scrape_stats_table_per_page'] = per_page(time_call(scrape_tables, BENCH_REPEAT), pages)
+    results['parse.iter_page_stats_per_page'] = per_page(time_call(iterate_rows, BENCH_REPEAT), pages)
+    results['parse.year_menu'] = time_call(
+        lambda: [link_list(header, 'http://127.0.0.1/') for header in parse_html(menu).find('table', class_='boxed')
+                 .find_all('td', class_='header')[:2]], BENCH_REPEAT)
+    results['parse.link_list'] = time_call(
+        lambda: [link_list(header, 'http://127.0.0.1/') for header in headers], BENCH_REPEAT)
+    return pages
+
+
+def run_scraper(mode, base_url, workdir):
+    """
+    Run step_1_scrape_data.py against the replay server in a scratch directory.
+
+    Returns:
+        dict: The scraper's run report (db/scrape_metrics.json).
+    """
+    shutil.rmtree(workdir, ignore_errors=True)
+    os.makedirs(os.path.join(workdir, 'db'))
+    shutil.copy(SCHEMA_PATH, os.path.join(workdir, 'db', 'schema.sql'))
+    metrics_path = os.path.join(workdir, 'db', 'scrape_metrics.json')
+
+    env = dict(os.environ)
+    env.update({
+        'SCRAPER_BASE_URL': base_url,
+        'SCRAPER_CACHE_DIR': '',
+        'SCRAPER_RATE_LIMIT': env.get('SCRAPER_RATE_LIMIT', '0'),
+        'SCRAPER_METRICS_PATH': metrics_path,
+    })
+    env.update(SCRAPE_MODES[mode])
+
+    with open(os.path.join(workdir, 'scrape.log'), 'w') as log:
+        subprocess.run([sys.executable, SCRAPER_SCRIPT], cwd=workdir, env=env,
+                       stdout=log, stderr=subprocess.STDOUT, check=False)
+    with open(metrics_path) as f:
+        return json.load(f)
+
+
+def benchmark_scrape(mode, base_url, workdir, results, throughput):
+    report = run_scraper(mode, base_url, workdir)
+    duration = report['duration_seconds']
+    counters = report['counters']
+    pages = counters.get('pages_requested', 0)
+
+    results[f"scrape.{mode}.run"] = {'runs': 1, 'min': duration, 'median': duration, 'mean': duration, 'max': duration}
+    for stage, timing in report['stages'].items():
+        results[f"scrape.{mode}.{stage}"] = {
+            'runs': timing['count'],
+            'min': timing['min_seconds'],
+            'median': timing['p50_seconds'],
+            'mean': timing['mean_seconds'],
+            'max': timing['max_seconds'],
+        }
+    throughput[mode] = {
+        'pages': pages,
+        'pages_per_second': round(pages / duration, 2) if duration else None,
+        'counters': counters,
+    }
+
+
+if __name__ == "__main__":
+    unknown = [mode for mode in BENCH_SCRAPE_MODES if mode not in SCRAPE_MODES]
+    if unknown:
+        print(f"Unknown BENCH_SCRAPE_MODES {unknown}, expected some of {list(SCRAPE_MODES)}")
+        sys.exit(2)
+
+    workdir = tempfile.mkdtemp(prefix='baseball_scraper_bench_')
+    server = None
+    try:
+        if BENCH_CORPUS:
+            corpus_dir = BENCH_CORPUS
+            manifest = load_manifest(corpus_dir)
+        else:
+            corpus_dir = os.path.join(workdir, 'corpus')
+            manifest = synthesize_corpus(corpus_dir, seasons=BENCH_SEASONS)
+        scale = f"{manifest['source']}:{len(manifest['pages']) - 1} pages"
+        print(f"Corpus {corpus_dir}: {scale}")
+
+        results = {}
+        throughput = {}
+        pages = benchmark_parser(corpus_dir, manifest, results)
+
+        server = start_replay_server(corpus_dir, latency_ms=REPLAY_LATENCY_MS, jitter_ms=REPLAY_JITTER_MS,
+                                     error_rate=REPLAY_ERROR_RATE, seed=0)
+        for mode in BENCH_SCRAPE_MODES:
+            print(f"Scraping in {mode} mode from {server.base_url}")
+            benchmark_scrape(mode, server.base_url, os.path.join(workdir, mode), results, throughput)
+
+        params = {
+            'pages': pages,
+            'latency_ms': REPLAY_LATENCY_MS,
+            'jitter_ms': REPLAY_JITTER_MS,
+            'error_rate': REPLAY_ERROR_RATE,
+            'concurrency': os.environ.get('SCRAPER_CONCURRENCY', 'default'),
+            'repeat': BENCH_REPEAT,
+        }
+        record = run_record(SUITE, scale, params, results)
+        record['throughput'] = throughput
+        record['replay_server'] = dict(server.counters)
+
+        history = load_history(BENCH_HISTORY)
+        baseline = previous_record(history, SUITE, scale)
+        print_results(record, baseline)
+        for mode, mode_throughput in throughput.items():
+            print(f"  {mode}: {mode_throughput['pages']} pages, {mode_throughput['pages_per_second']} pages/sec")
+        print(f"  replay server: {server.counters}")
+        append_history(record, BENCH_HISTORY)
+        print(f"\nSaved: {BENCH_HISTORY}")
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    regressions = find_regressions(record, baseline, BENCH_THRESHOLD) if baseline is not None else []
+    if regressions:
+        print(f"\n{len(regressions)} measurements are more than {BENCH_THRESHOLD:.0%} slower than the previous run:")
+        for name, before, after in regressions:
+            print(f"  {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        sys.exit(1)
@@ -0,0 +1,302 @@
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+import numpy as np
+
+from benchmarks.bench_history import (
+    HISTORY_PATH, REGRESSION_THRESHOLD, run_record, load_history, append_history, previous_record, find_regressions)
+
+# ---------------------------------------------------------- #
+# Concurrent-session load harness for the dashboard
+# ---------------------------------------------------------- #
+# Run from the repository root:
+#   python -m benchmarks.load_dashboard
+#   LOAD_SESSIONS=32 LOAD_PROCESSES=8 LOAD_SCALE=medium python -m benchmarks.load_dashboard
+# Every simulated session is a Streamlit AppTest of step_4_dashboard.py that
+# clicks through pages, leagues, statistic groups, statistics, years and the
+# min_count slider at random. AppTest keeps one global runtime per process, so
+# sessions are spread over LOAD_PROCESSES worker processes that run at the same
+# time; the sessions of one worker take turns and share its caches, like the
+# sessions of one Streamlit server process.
+LOAD_SESSIONS = int(os.environ.get('LOAD_SESSIONS', 8))
+LOAD_PROCESSES = int(os.environ.get('LOAD_PROCESSES', 4))
+LOAD_INTERACTIONS = int(os.environ.get('LOAD_INTERACTIONS', 20))
+# Pause between two interactions of a worker
+LOAD_THINK_MS = float(os.environ.get('LOAD_THINK_MS', 0))
+# '' = the dashboard's own db/baseball_stats.db, else a benchmarks.synthetic_data scale
+LOAD_SCALE = os.environ.get('LOAD_SCALE', '')
+LOAD_TIMEOUT = float(os.environ.get('LOAD_TIMEOUT', 60))
+LOAD_SEED = int(os.environ.get('LOAD_SEED', 0))
+BENCH_HISTORY = os.environ.get('BENCH_HISTORY', HISTORY_PATH)
+BENCH_THRESHOLD = float(os.environ.get('BENCH_THRESHOLD', REGRESSION_THRESHOLD))
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_SCRIPT = os.path.join(REPO_DIR, 'step_4_dashboard.py')
+SUITE = 'dashboard_load'
+
+YEARLY_PAGE = "Yearly Best Results"
+RANKING_PAGE = "Best Players Ranked"
+
+# Interaction -> relative frequency
+INTERACTION_WEIGHTS = {'page': 1, 'league': 2, 'stat_title': 2, 'statistic': 3, 'year': 2, 'min_count': 2}
+
+
+def sidebar_widget(at, kind, label):
+    for widget in getattr(at.sidebar, kind):
+        if widget.label == label:
+            return widget
+    return None
+
+
+def choose_interaction(at, rng):
+    """
+    Pick a random widget change available on the session's current page.
+
+    Returns:
+        tuple: (interaction name, widget with the new value set), or (None, None).
+    """
+    page_box = sidebar_widget(at, 'selectbox', "Choose Page")
+    if page_box is None:
+        return None, None
+    page = page_box.value
+
+    candidates = {
+        'page': page_box,
+        'league': sidebar_widget(at, 'radio', "Select League"),
+        'stat_title': sidebar_widget(at, 'radio', "Select Statistic Group"),
+        'statistic': sidebar_widget(at, 'selectbox', "Choose Specific Statistic"),
+    }
+    if page == YEARLY_PAGE:
+        candidates['year'] = sidebar_widget(at, 'selectbox', "Select Year")
+    else:
+        sliders = [slider for slider in at.slider if slider.key == 'min_count']
+        candidates['min_count'] = sliders[0] if sliders else None
+
+    candidates = {name: widget for name, widget in candidates.items() if widget is not None}
+    if not candidates:
+        return None, None
+    names = list(candidates)
+    name = rng.choices(names, weights=[INTERACTION_WEIGHTS[n] for n in names])[0]
+    widget = candidates[name]
+
+    if name == 'min_count':
+        return name, widget.set_value(rng.randint(widget.min, widget.max))
+    options = [option for option in widget.options if option != str(widget.value)] or list(widget.options)
+    return name, widget.set_value(rng.choice(options))
+
+
+def run_worker(worker_id, session_count, interactions, workdir, seed, start_event, results):
+    """
+    Worker process: open session_count sessions and let them take turns until each did its interactions.
+
+    Puts one dict on results: samples [(interaction, seconds, ok)], cpu_seconds, max_rss_kib
+    and up to 5 distinct error messages.
+    """
+    warnings.filterwarnings('ignore')
+    os.chdir(workdir)
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed * 1000 + worker_id)
+    samples = []
+    error_messages = set()
+    start_event.wait()
+    usage_start = resource.getrusage(resource.RUSAGE_SELF)
+
+    def timed(name, at, changed=None):
+        # changed: widget with a new value (its run() reruns the session), None for a plain run
+        start = time.perf_counter()
+        try:
+            (changed or at).run(timeout=LOAD_TIMEOUT)
+            messages = [str(element.value) for element in (*at.exception, *at.error)]
+        except Exception as e:
+            messages = [f"{type(e).__name__}: {e}"]
+        samples.append((name, time.perf_counter() - start, not messages))
+        if len(error_messages) < 5:
+            error_messages.update(message[:300] for message in messages)
+
+    sessions = [AppTest.from_file(DASHBOARD_SCRIPT, default_timeout=LOAD_TIMEOUT) for _ in range(session_count)]
+    for at in sessions:
+        timed('initial_load', at)
+
+    for _ in range(interactions):
+        for at in sessions:
+            name, changed = choose_interaction(at, rng)
+            if LOAD_THINK_MS:
+                time.sleep(LOAD_THINK_MS / 1000)
+            timed(name or 'rerun', at, changed)
+
+    usage_end = resource.getrusage(resource.RUSAGE_SELF)
+    results.put({
+        'samples': samples,
+        'cpu_seconds': (usage_end.ru_utime - usage_start.ru_utime) + (usage_end.ru_stime - usage_start.ru_stime),
+        'max_rss_kib': usage_end.ru_maxrss,
+        'errors': sorted(error_messages)[:5],
+    })
+
+
+def rss_kib(pid):
+    # Current resident set size of a process (Linux), or None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler(threading.Thread):
+    """
+    Samples the summed RSS of the worker processes while the load runs.
+    """
+
+    def __init__(self, pids, interval=0.25):
+        super().__init__(daemon=True)
+        self.pids = pids
+        self.interval = interval
+        self.peak_kib = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            values = [rss_kib(pid) for pid in self.pids]
+            values = [value for value in values if value is not None]
+            if values:
+                self.peak_kib = max(self.peak_kib or 0, sum(values))
+
+
+def latency_summary(latencies, errors):
+    values = np.array(latencies)
+    return {
+        'runs': len(values),
+        'errors': errors,
+        'min': round(float(values.min()), 6),
+        'median': round(float(np.percentile(values, 50)), 6),
+        'mean': round(float(values.mean()), 6),
+        'p90': round(float(np.percentile(values, 90)), 6),
+        'p95': round(float(np.percentile(values, 95)), 6),
+        'p99': round(float(np.percentile(values, 99)), 6),
+        'max': round(float(values.max()), 6),
+    }
+
+
+def prepare_database(workdir):
+    """
+    Working directory with db/baseball_stats.db: the repo's, or a generated LOAD_SCALE dataset.
+    """
+    if not LOAD_SCALE:
+        return REPO_DIR
+
+    from db_loader import build_and_swap_database
+    from benchmarks.synthetic_data import SCALES, generate_tables
+
+    tables = generate_tables(**SCALES[LOAD_SCALE])
+    os.makedirs(os.path.join(workdir, 'db'), exist_ok=True)
+    with open(os.path.join(REPO_DIR, 'db', 'schema.sql')) as f:
+        build_and_swap_database(os.path.join(workdir, 'db', 'baseball_stats.db'), f.read(), tables)
+    print(f"Generated '{LOAD_SCALE}' database: {len(tables['last_5_ys_yearly_stats'])} fact rows")
+    return workdir
+
+
+if __name__ == "__main__":
+    processes = max(1, min(LOAD_PROCESSES, LOAD_SESSIONS))
+    sessions_per_worker = [LOAD_SESSIONS // processes + (i < LOAD_SESSIONS % processes) for i in range(processes)]
+
+    tmpdir = tempfile.mkdtemp(prefix='baseball_load_')
+    try:
+        workdir = prepare_database(tmpdir)
+        ctx = multiprocessing.get_context('spawn')
+        start_event = ctx.Event()
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(target=run_worker,
+                        args=(i, count, LOAD_INTERACTIONS, workdir, LOAD_SEED, start_event, results))
+            for i, count in enumerate(sessions_per_worker)
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Let the workers import Streamlit first, so the clock covers the load only
+        time.sleep(3)
+        sampler = RssSampler([worker.pid for worker in workers])
+        sampler.start()
+        start = time.perf_counter()
+        start_event.set()
+
+        worker_results = [results.get() for _ in workers]
+        wall_seconds = time.perf_counter() - start
+        sampler.stopped.set()
+        for worker in workers:
+            worker.join()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    by_interaction = {}
+    for worker_result in worker_results:
+        for name, seconds, ok in worker_result['samples']:
+            latencies, errors = by_interaction.setdefault(name, ([], [0]))
+            latencies.append(seconds)
+            errors[0] += not ok
+
+    results = {
+        f"interaction.{name}": latency_summary(latencies, errors[0])
+        for name, (latencies, errors) in sorted(by_interaction.items())
+    }
+    all_samples = [sample for worker_result in worker_results for sample in worker_result['samples']]
+    results['interaction.all'] = latency_summary([seconds for _, seconds, _ in all_samples],
+                                                 sum(not ok for _, _, ok in all_samples))
+
+    cpu_seconds = sum(worker_result['cpu_seconds'] for worker_result in worker_results)
+    server = {
+        'wall_seconds': round(wall_seconds, 3),
+        'interactions_per_second': round(len(all_samples) / wall_seconds, 2),
+        'cpu_seconds': round(cpu_seconds, 3),
+        'cpu_cores_used': round(cpu_seconds / wall_seconds, 2),
+        'peak_rss_mib': round(sampler.peak_kib / 1024, 1) if sampler.peak_kib else None,
+        'max_worker_rss_mib': round(max(worker_result['max_rss_kib'] for worker_result in worker_results) / 1024, 1),
+    }
+
+    params = {
+        'sessions': LOAD_SESSIONS,
+        'processes': processes,
+        'interactions': LOAD_INTERACTIONS,
+        'think_ms': LOAD_THINK_MS,
+        'query_engine': os.environ.get('QUERY_ENGINE', 'sql'),
+        'seed': LOAD_SEED,
+    }
+    scale = f"{LOAD_SCALE or 'db'}:{LOAD_SESSIONS}x{processes}"
+    record = run_record(SUITE, scale, params, results)
+    record['server'] = server
+
+    print(f"\n{SUITE} [{scale}] {params}")
+    print(f"  {'interaction':<25} {'runs':>6} {'errors':>6} {'p50 ms':>9} {'p90 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, summary in results.items():
+        print(f"  {name:<25} {summary['runs']:>6} {summary['errors']:>6} "
+              + ' '.join(f"{summary[key] * 1000:9.1f}" for key in ('median', 'p90', 'p95', 'p99', 'max')))
+    print(f"  server: {server}")
+    error_messages = sorted({message for worker_result in worker_results for message in worker_result['errors']})
+    for message in error_messages[:5]:
+        print(f"  error: {message}")
+
+    history = load_history(BENCH_HISTORY)
+    baseline = previous_record(history, SUITE, scale)
+    append_history(record, BENCH_HISTORY)
+    print(f"\nSaved: {BENCH_HISTORY}")
+
+    regressions = find_regressions(record, baseline, BENCH_THRESHOLD) if baseline is not None else []
+    if regressions:
+        print(f"\n{len(regressions)} interactions are more than {BENCH_THRESHOLD:.0%} slower than the previous run:")
+        for name, before, after in regressions:
+            print(f"  {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        sys.exit(1)
+    if results['interaction.all']['errors']:
+        sys.exit(1)
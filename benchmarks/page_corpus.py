@@ -0,0 +1,201 @@
+import hashlib
+import html
+import json
+import os
+from urllib.parse import urljoin, urlparse
+
+import pandas as pd
+
+from scraper_http import create_session, fetch_page, iter_fetch_pages
+from scraper_parse import parse_html, link_list
+from benchmarks.synthetic_data import generate_tables
+
+# ---------------------------------------------------------- #
+# Page corpus for the scraper benchmarks
+# ---------------------------------------------------------- #
+# A corpus is a directory laid out like the site (yearmenu.shtml,
+# yearly/yr2024a.shtml, ...) plus manifest.json. It is either recorded from
+# the live site once, or synthesized in the same markup at any size; either
+# way benchmarks/replay_server.py serves it to the unchanged scraper.
+CORPUS_DIR = os.path.join('benchmarks', 'corpus')
+MANIFEST_FILE = 'manifest.json'
+SITE_URL = 'https://www.baseball-almanac.com/'
+MENU_PATH = 'yearmenu.shtml'
+
+LEAGUE_CODES = {'American League': 'a', 'National League': 'n'}
+
+# Markup outside the boxed tables (navigation, ads, text), repeated to reach a page's real size;
+# the parser skips it, but still has to tokenize it
+FILLER_BLOCK = (
+    '<div class="nav"><ul><li><a href="/players/">Players</a></li><li><a href="/teams/">Teams</a></li>'
+    '<li><a href="/yearmenu.shtml">Years</a></li></ul></div>'
+    '<p class="text">Baseball Almanac is pleased to present a unique set of yearly league leader tables '
+    'with links to every season, team and player for the baseball historian.</p>\n'
+)
+
+
+def write_page(corpus_dir, path, body):
+    file_path = os.path.join(corpus_dir, *path.split('/'))
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'wb') as f:
+        f.write(body)
+    return {'path': path, 'bytes': len(body), 'sha256': hashlib.sha256(body).hexdigest()}
+
+
+def write_manifest(corpus_dir, source, pages):
+    with open(os.path.join(corpus_dir, MANIFEST_FILE), 'w') as f:
+        json.dump({'source': source, 'pages': pages}, f, indent=2)
+        f.write('\n')
+
+
+def load_manifest(corpus_dir):
+    with open(os.path.join(corpus_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def record_corpus(corpus_dir=CORPUS_DIR, base_url=SITE_URL, years=None, requests_per_second=1):
+    """
+    Download yearmenu.shtml and the year pages from the site into a corpus directory.
+
+    Args:
+        corpus_dir (str): Directory to record into.
+        base_url (str): Site root.
+        years (set): Seasons to record. None records every season in the menu.
+        requests_per_second (float): Rate limit towards the site.
+
+    Returns:
+        dict: The manifest written to the corpus.
+    """
+    session = create_session()
+    try:
+        menu = fetch_page(session, urljoin(base_url, MENU_PATH))
+        pages = [write_page(corpus_dir, MENU_PATH, menu)]
+
+        headers = parse_html(menu).find('table', class_='boxed').find_all('td', class_='header')[:2]
+        year_links = [year_link for header in headers for year_link in (link_list(header, base_url) or [])]
+        if years is not None:
+            year_links = [year_link for year_link in year_links if int(year_link['year']) in years]
+
+        urls = [year_link['year_href'] for year_link in year_links]
+        bodies = iter_fetch_pages(session, urls, max_workers=2, requests_per_second=requests_per_second)
+        for page_url, body in zip(urls, bodies):
+            if body is None:
+                print(f"WARNING: {page_url} could not be recorded")
+                continue
+            pages.append(write_page(corpus_dir, urlparse(page_url).path.lstrip('/'), body))
+    finally:
+        session.close()
+
+    manifest = {'source': base_url, 'pages': pages}
+    write_manifest(corpus_dir, base_url, pages)
+    print(f"Recorded {len(pages)} pages into {corpus_dir}")
+    return manifest
+
+
+def year_page_html(year, league, stat_tables, filler_bytes=0):
+    """
+    A year page in the site's markup: one table.boxed per statistic group.
+
+    Args:
+        year (int): Season.
+        league (str): League name.
+        stat_tables (list): (stat_title, rows) per group, rows being (statistic, player, team, result) tuples.
+        filler_bytes (int): Approximate size of the non-table markup around the tables.
+    """
+    filler = FILLER_BLOCK * (filler_bytes // len(FILLER_BLOCK))
+    tables = []
+    for stat_title, rows in stat_tables:
+        body = ''.join(
+            f'<tr><td class="datacolBlue">{html.escape(statistic)}</td>'
+            f'<td class="datacolBox">{html.escape(player)}</td>'
+            f'<td class="datacolBox">{html.escape(team)}</td>'
+            f'<td class="datacolBox">{result}</td>'
+            f'<td class="datacolBox">Top 25</td></tr>'
+            for statistic, player, team, result in rows
+        )
+        tables.append(
+            f'<table class="boxed"><tr><td class="header" colspan="5"><h2>{year} {league}</h2>'
+            f'<p>{league} {year} {stat_title}</p></td></tr>'
+            '<tr><td class="banner">Statistic</td><td class="banner">Name(s)</td><td class="banner">Team(s)</td>'
+            f'<td class="banner">#</td><td class="banner">Top 25</td></tr>{body}</table>'
+        )
+    return ('<html><head><meta charset="utf-8"><title>Year in Review</title></head><body>'
+            + filler[:len(filler) // 2] + ''.join(tables) + filler[len(filler) // 2:] + '</body></html>')
+
+
+def year_menu_html(year_links):
+    """
+    yearmenu.shtml in the site's markup: one header and link sub-table per league.
+
+    Args:
+        year_links (dict): League name -> list of (year, relative href).
+    """
+    rows = ''.join(
+        f'<tr><td class="header">{league}</td></tr><tr><td class="datacolBox"><table class="ba-sub"><tr>'
+        + ''.join(f'<td><a href="{href}">{year}</a></td>' for year, href in links)
+        + '</tr></table></td></tr>'
+        for league, links in year_links.items()
+    )
+    return f'<html><body><table class="boxed">{rows}</table></body></html>'
+
+
+def synthesize_corpus(corpus_dir, seasons=500, first_year=None, rows_per_statistic=1, filler_bytes=40000, seed=0):
+    """
+    Generate a corpus in the site's markup from benchmarks.synthetic_data tables.
+
+    Args:
+        corpus_dir (str): Directory to write into.
+        seasons (int): Number of seasons (two pages each, American and National League).
+        first_year (int): First season. Defaults to seasons ending in 2025.
+        rows_per_statistic (int): Leaders listed per statistic (ties on the site).
+        filler_bytes (int): Non-table markup per page, to match the real page weight.
+        seed (int): Random seed.
+
+    Returns:
+        dict: The manifest written to the corpus.
+    """
+    first_year = first_year if first_year is not None else 2026 - seasons
+    tables = generate_tables(years=seasons, leagues=2, statistics_per_title=10,
+                             rows_per_statistic=rows_per_statistic, players=max(100, seasons * 10),
+                             first_year=first_year, missing_share=0.01, seed=seed)
+
+    facts = (tables['last_5_ys_yearly_stats']
+             .merge(tables['statistics'], on='statistic_id')
+             .merge(tables['stat_titles'], on='stat_title_id')
+             .merge(tables['players'], on='player_id')
+             .merge(tables['teams'], on='team_id')
+             .merge(tables['years'], on='year_id')
+             .merge(tables['leagues'], on='league_id'))
+
+    pages = []
+    year_links = {league: [] for league in LEAGUE_CODES}
+    for (year, league), page in facts.groupby(['year', 'league'], sort=True):
+        stat_tables = [
+            (stat_title, [
+                (row.statistic, row.player_name, row.team_name, '--' if pd.isna(row.no) else row.no)
+                for row in page[page['stat_title'] == stat_title].itertuples()
+            ])
+            for stat_title in ('Hitting Statistics', 'Pitching Statistics')
+        ]
+        path = f"yearly/yr{year}{LEAGUE_CODES[league]}.shtml"
+        body = year_page_html(year, league, stat_tables, filler_bytes).encode('utf-8')
+        pages.append(write_page(corpus_dir, path, body))
+        year_links[league].append((year, path))
+
+    pages.insert(0, write_page(corpus_dir, MENU_PATH, year_menu_html(year_links).encode('utf-8')))
+    write_manifest(corpus_dir, 'synthetic', pages)
+    return {'source': 'synthetic', 'pages': pages}
+
+
+if __name__ == "__main__":
+    # Record the live site once (politely rate limited):
+    #   python -m benchmarks.page_corpus
+    #   CORPUS_YEARS=2015-2024 python -m benchmarks.page_corpus
+    from scrape_backfill import parse_year_range
+
+    corpus_dir = os.environ.get('CORPUS_DIR', CORPUS_DIR)
+    years_spec = os.environ.get('CORPUS_YEARS', '')
+    years = None
+    if years_spec:
+        years = parse_year_range(years_spec, range(1871, 2100))
+    record_corpus(corpus_dir, os.environ.get('CORPUS_BASE_URL', SITE_URL), years)
@@ -0,0 +1,171 @@
+import gzip
+import hashlib
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.page_corpus import CORPUS_DIR
+
+# ---------------------------------------------------------- #
+# Local replay server for a page corpus
+# ---------------------------------------------------------- #
+# Serves a corpus directory over HTTP/1.1 keep-alive like the real site:
+# gzip when the client accepts it, ETag / If-None-Match revalidation, plus a
+# configurable response latency and injected errors, so the scraper's
+# pooling, retries and cache can be exercised without touching the site.
+#   REPLAY_CORPUS=benchmarks/corpus REPLAY_LATENCY_MS=50 python -m benchmarks.replay_server
+REPLAY_PORT = int(os.environ.get('REPLAY_PORT', 8765))
+REPLAY_LATENCY_MS = float(os.environ.get('REPLAY_LATENCY_MS', 0))
+REPLAY_JITTER_MS = float(os.environ.get('REPLAY_JITTER_MS', 0))
+# Share of requests answered with REPLAY_ERROR_STATUS instead of the page
+REPLAY_ERROR_RATE = float(os.environ.get('REPLAY_ERROR_RATE', 0))
+REPLAY_ERROR_STATUS = int(os.environ.get('REPLAY_ERROR_STATUS', 503))
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    HTTP server over a corpus directory; one handler thread per connection.
+    """
+    daemon_threads = True
+
+    def __init__(self, corpus_dir, port=0, latency_ms=0, jitter_ms=0, error_rate=0, error_status=503, seed=None):
+        """
+        Args:
+            corpus_dir (str): Corpus directory (see benchmarks.page_corpus).
+            port (int): Port on 127.0.0.1; 0 picks a free one.
+            latency_ms (float): Delay before every response.
+            jitter_ms (float): Extra random delay, uniform in [0, jitter_ms].
+            error_rate (float): Share of requests answered with error_status.
+            error_status (int): Status code of injected errors (503 is retried by the scraper).
+            seed (int): Seed of the latency and error draws.
+        """
+        super().__init__(('127.0.0.1', port), ReplayHandler)
+        self.corpus_dir = os.path.abspath(corpus_dir)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.bodies = {}
+        self.counters = {'requests': 0, 'pages': 0, 'not_modified': 0, 'not_found': 0, 'injected_errors': 0, 'bytes': 0}
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def count(self, counter, value=1):
+        with self.lock:
+            self.counters[counter] += value
+
+    def draw(self):
+        # (delay in seconds, inject an error?) for one request
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            return delay, self.random.random() < self.error_rate
+
+    def page(self, path):
+        """
+        (raw body, gzipped body, ETag) of a corpus file, or None; read once and kept in memory.
+        """
+        with self.lock:
+            if path in self.bodies:
+                return self.bodies[path]
+
+        file_path = os.path.abspath(os.path.join(self.corpus_dir, *path.lstrip('/').split('/')))
+        if not file_path.startswith(self.corpus_dir + os.sep) or not os.path.isfile(file_path):
+            return None
+        with open(file_path, 'rb') as f:
+            body = f.read()
+        page = (body, gzip.compress(body, compresslevel=6), f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+        with self.lock:
+            self.bodies[path] = page
+        return page
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.count('requests')
+        delay, inject_error = server.draw()
+        if delay:
+            time.sleep(delay)
+
+        if inject_error:
+            server.count('injected_errors')
+            self.send_body(server.error_status, b'injected error')
+            return
+
+        page = server.page(self.path.split('?')[0])
+        if page is None:
+            server.count('not_found')
+            self.send_body(404, b'not found')
+            return
+
+        body, gzipped, etag = page
+        if self.headers.get('If-None-Match') == etag:
+            server.count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        use_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        server.count('pages')
+        server.count('bytes', len(gzipped if use_gzip else body))
+        self.send_body(200, gzipped if use_gzip else body, etag=etag, gzipped=use_gzip)
+
+    def send_body(self, status, body, etag=None, gzipped=False):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # One line per request would dominate a benchmark's output
+        pass
+
+
+def start_replay_server(corpus_dir, **kwargs):
+    """
+    Start a ReplayServer in a background thread.
+
+    Args:
+        corpus_dir (str): Corpus directory.
+        **kwargs: Passed through to ReplayServer.
+
+    Returns:
+        ReplayServer: Running server; call shutdown() and server_close() to stop it.
+    """
+    server = ReplayServer(corpus_dir, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    server = ReplayServer(
+        os.environ.get('REPLAY_CORPUS', CORPUS_DIR),
+        port=REPLAY_PORT,
+        latency_ms=REPLAY_LATENCY_MS,
+        jitter_ms=REPLAY_JITTER_MS,
+        error_rate=REPLAY_ERROR_RATE,
+        error_status=REPLAY_ERROR_STATUS)
+    print(f"Replaying {server.corpus_dir} at {server.base_url} (SCRAPER_BASE_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {server.counters}")
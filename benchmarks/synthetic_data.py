@@ -0,0 +1,122 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------- #
+# Synthetic datasets in the shape of csv/
+# ---------------------------------------------------------- #
+# Same tables, columns and id conventions as the scraper's normalized output
+# (ids start at 0, one players row per player + team, '--' results as NaN),
+# so every generated dataset goes through step_2, stats_queries and the
+# dashboard unchanged.
+HITTING_STATISTICS = [
+    "Base on Balls", "Batting Average", "Doubles", "Hits", "Home Runs", "On Base Percentage",
+    "RBI", "Runs", "Slugging Average", "Stolen Bases", "Total Bases", "Triples"
+]
+PITCHING_STATISTICS = [
+    "Complete Games", "ERA", "Games", "Saves", "Shutouts", "Strikeouts", "Winning Percentage", "Wins"
+]
+LEAGUES = ["American League", "National League"]
+
+# Named sizes: seasons, leagues, statistics per group, rows per statistic and page, players
+# ('current' matches the size of the scraped csv/: 200 fact rows)
+SCALES = {
+    'current': dict(years=5, leagues=2, statistics_per_title=10, rows_per_statistic=1, players=100),
+    'small': dict(years=25, leagues=2, statistics_per_title=10, rows_per_statistic=25, players=2000),
+    'medium': dict(years=100, leagues=2, statistics_per_title=10, rows_per_statistic=100, players=20000),
+    'large': dict(years=150, leagues=4, statistics_per_title=20, rows_per_statistic=100, players=100000),
+}
+
+
+def statistic_names(stat_title_id, count):
+    # The real statistic names first, then numbered extra statistics
+    base = HITTING_STATISTICS if stat_title_id == 0 else PITCHING_STATISTICS
+    group = 'Hitting' if stat_title_id == 0 else 'Pitching'
+    return (base + [f"{group} Statistic {i}" for i in range(len(base) + 1, count + 1)])[:count]
+
+
+def generate_tables(years=5, leagues=2, statistics_per_title=10, rows_per_statistic=1, players=100,
+                    teams=30, first_year=2021, missing_share=0.01, seed=0):
+    """
+    Generate a normalized dataset with the columns of csv/.
+
+    Args:
+        years (int): Number of seasons, ending with first_year + years - 1.
+        leagues (int): Number of leagues (the first two are the real ones).
+        statistics_per_title (int): Statistics per group (hitting and pitching).
+        rows_per_statistic (int): Fact rows per statistic, season and league.
+        players (int): Number of distinct players.
+        teams (int): Number of teams, including '--' and 'To Be Determined'.
+        first_year (int): First season.
+        missing_share (float): Share of results left empty ('--' on the site).
+        seed (int): Random seed; the same arguments always give the same tables.
+
+    Returns:
+        dict: Table name -> DataFrame, fact table rows =
+        years * leagues * 2 * statistics_per_title * rows_per_statistic.
+    """
+    rng = np.random.default_rng(seed)
+
+    stat_titles = pd.DataFrame({'stat_title_id': [0, 1], 'stat_title': ['Hitting Statistics', 'Pitching Statistics']})
+
+    statistic_rows = [
+        (name, stat_title_id)
+        for stat_title_id in (0, 1)
+        for name in statistic_names(stat_title_id, statistics_per_title)
+    ]
+    statistics = pd.DataFrame(statistic_rows, columns=['statistic', 'stat_title_id'])
+    statistics = statistics.sort_values('statistic', ignore_index=True)
+    statistics.insert(0, 'statistic_id', np.arange(len(statistics)))
+
+    team_names = ['--', 'To Be Determined'] + [f"Team {i:03d}" for i in range(1, max(teams, 3) - 1)]
+    teams_df = pd.DataFrame({'team_id': np.arange(len(team_names)), 'team_name': team_names})
+
+    players_df = pd.DataFrame({
+        'player_id': np.arange(players),
+        'player_name': [f"Player {i:06d}" for i in range(players)],
+        'team_id': rng.integers(0, len(team_names), players),
+    })
+
+    years_df = pd.DataFrame({'year_id': np.arange(years), 'year': np.arange(first_year, first_year + years)})
+    league_names = (LEAGUES + [f"League {i}" for i in range(3, leagues + 1)])[:leagues]
+    leagues_df = pd.DataFrame({'league_id': np.arange(leagues), 'league': league_names})
+
+    # One block of rows per (season, league, statistic)
+    year_ids, league_ids, statistic_ids = np.meshgrid(
+        years_df['year_id'], leagues_df['league_id'], statistics['statistic_id'], indexing='ij')
+    year_ids = np.repeat(year_ids.ravel(), rows_per_statistic)
+    league_ids = np.repeat(league_ids.ravel(), rows_per_statistic)
+    statistic_ids = np.repeat(statistic_ids.ravel(), rows_per_statistic)
+    row_count = len(year_ids)
+
+    results = np.round(rng.gamma(2.0, 20.0, row_count), 3)
+    results[rng.random(row_count) < missing_share] = np.nan
+
+    facts = pd.DataFrame({
+        'no': results,
+        'top_25': 'Top 25',
+        'statistic_id': statistic_ids,
+        'player_id': rng.integers(0, players, row_count),
+        'year_id': year_ids,
+        'league_id': league_ids,
+    })
+
+    return {
+        'stat_titles': stat_titles,
+        'statistics': statistics,
+        'players': players_df,
+        'teams': teams_df,
+        'years': years_df,
+        'leagues': leagues_df,
+        'last_5_ys_yearly_stats': facts,
+    }
+
+
+def write_csvs(tables, folder_path):
+    """
+    Write generated tables like step_1 does (one <table>.csv per table, no index).
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    for name, df in tables.items():
+        df.to_csv(os.path.join(folder_path, f"{name}.csv"), index=False)
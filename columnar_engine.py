@@ -0,0 +1,162 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from db_connection import DB_PATH, db_version, get_engine
+from db_loader import UNDECIDED_TEAM
+
+# ---------------------------------------------------------- #
+# In-memory columnar engine for the dashboard
+# ---------------------------------------------------------- #
+# The fact table is held as one NumPy array per column (integer ids plus the
+# result), and every lookup table as an array of names indexed by id. Filters
+# are boolean masks over the id arrays, so a dashboard interaction runs no SQL.
+
+
+def names_by_id(df, id_col, value_col):
+    """
+    Array with the value of every lookup row at the index of its id.
+    """
+    ids = df[id_col].to_numpy(dtype=np.int64)
+    names = np.empty(ids.max() + 1 if len(ids) else 0, dtype=object)
+    names[ids] = df[value_col].to_numpy()
+    return names
+
+
+class ColumnarStats:
+    """
+    The fact and lookup tables of one database version, as columnar arrays.
+
+    Every query method returns a DataFrame with the same columns as the
+    dashboard's SQL query it replaces.
+    """
+
+    def __init__(self, tables):
+        """
+        Args:
+            tables (dict): Table name -> DataFrame for the lookup tables and last_5_ys_yearly_stats.
+        """
+        facts = tables['last_5_ys_yearly_stats']
+        self.statistic_ids = facts['statistic_id'].to_numpy(dtype=np.int32)
+        self.player_ids = facts['player_id'].to_numpy(dtype=np.int32)
+        self.year_ids = facts['year_id'].to_numpy(dtype=np.int32)
+        self.league_ids = facts['league_id'].to_numpy(dtype=np.int32)
+        self.results = pd.to_numeric(facts['no'], errors='coerce').to_numpy(dtype=np.float64)
+
+        # id -> name arrays
+        self.leagues = names_by_id(tables['leagues'], 'league_id', 'league')
+        self.years = names_by_id(tables['years'], 'year_id', 'year')
+        self.stat_titles = names_by_id(tables['stat_titles'], 'stat_title_id', 'stat_title')
+        self.teams = names_by_id(tables['teams'], 'team_id', 'team_name')
+        statistics = tables['statistics'].merge(tables['stat_titles'], on='stat_title_id', how='left')
+        self.statistics = names_by_id(statistics, 'statistic_id', 'statistic')
+        self.statistic_titles = names_by_id(statistics, 'statistic_id', 'stat_title')
+        players = tables['players'].merge(tables['teams'], on='team_id', how='left')
+        self.players = names_by_id(players, 'player_id', 'player_name')
+        self.player_teams = names_by_id(players, 'player_id', 'team_name')
+
+        self.lookup_values = {
+            'league': self.leagues,
+            'year': self.years,
+            'stat_title': self.stat_titles,
+            'team_name': self.teams,
+        }
+
+        # Top-25 appearances per player (same rules as player_top25_counts)
+        counted = (self.player_teams[self.player_ids] != UNDECIDED_TEAM) & ~np.isnan(self.results)
+        self.appearances = np.bincount(self.player_ids[counted], minlength=len(self.players))
+
+    @classmethod
+    def from_engine(cls, engine):
+        tables = {
+            table: pd.read_sql(f"SELECT * FROM {table}", engine)
+            for table in ['stat_titles', 'statistics', 'teams', 'players', 'years', 'leagues',
+                          'last_5_ys_yearly_stats']
+        }
+        return cls(tables)
+
+    # ----- masks ----- #
+    def statistic_mask(self, stat_title, statistic):
+        codes = np.flatnonzero((self.statistics == statistic) & (self.statistic_titles == stat_title))
+        return np.isin(self.statistic_ids, codes)
+
+    def league_mask(self, league):
+        return np.isin(self.league_ids, np.flatnonzero(self.leagues == league))
+
+    def rows(self, index, columns):
+        """
+        Labelled result rows for an array of fact row positions.
+        """
+        player_ids = self.player_ids[index]
+        values = {
+            'League': lambda: self.leagues[self.league_ids[index]],
+            'Statistic': lambda: self.statistics[self.statistic_ids[index]],
+            'Results': lambda: self.results[index],
+            'Player Name': lambda: self.players[player_ids],
+            'Team Name': lambda: self.player_teams[player_ids],
+            'Year': lambda: self.years[self.year_ids[index]].astype(np.int64),
+        }
+        # Only the requested columns are materialized
+        return pd.DataFrame({column: values[column]() for column in columns})
+
+    # ----- dashboard queries ----- #
+    def distinct_values(self, column):
+        values = self.lookup_values[column]
+        return sorted(value for value in values if value is not None)
+
+    def statistics_by_title(self, stat_title):
+        return sorted(set(self.statistics[self.statistic_titles == stat_title]) - {None})
+
+    def yearly_results(self, league, stat_title, statistic):
+        mask = self.league_mask(league) & self.statistic_mask(stat_title, statistic)
+        return self.rows(np.flatnonzero(mask), ['Statistic', 'Results', 'Player Name', 'Team Name', 'Year'])
+
+    def league_results(self, stat_title, statistic):
+        return self.rows(np.flatnonzero(self.statistic_mask(stat_title, statistic)), ['League', 'Year', 'Results'])
+
+    def ranked_results(self, league, stat_title, statistic):
+        mask = self.league_mask(league) & self.statistic_mask(stat_title, statistic)
+        index = np.flatnonzero(mask)
+        # Same order as STATISTIC_RANKING_SQL: highest result first, empty results last
+        # (like ORDER BY no DESC in SQLite), ties by player name, then year
+        results = np.nan_to_num(-self.results[index], nan=np.inf)
+        player_names = self.players[self.player_ids[index]].astype(str)
+        years = self.years[self.year_ids[index]].astype(np.int64)
+        index = index[np.lexsort((years, player_names, results))]
+        return self.rows(index, ['Player Name', 'Team Name', 'Results', 'Statistic', 'Year'])
+
+    def max_appearances(self):
+        return int(self.appearances.max()) if len(self.appearances) else 0
+
+    def player_counts(self, min_count=1):
+        player_ids = np.flatnonzero(self.appearances >= max(min_count, 1))
+        df = pd.DataFrame({
+            'Team Name': self.player_teams[player_ids],
+            'Player Name': self.players[player_ids],
+            'Count': self.appearances[player_ids],
+        })
+        return df.sort_values(['Team Name', 'Player Name'], ignore_index=True)
+
+
+# db_path -> (database version, ColumnarStats)
+loaded_stats = {}
+loaded_stats_lock = threading.Lock()
+
+
+def get_columnar_stats(db_path=DB_PATH):
+    """
+    Return the columnar tables of db_path, loading them once per database file version.
+
+    Returns:
+        ColumnarStats: Arrays of the database file currently at db_path.
+    """
+    version = db_version(db_path)
+    with loaded_stats_lock:
+        cached = loaded_stats.get(db_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        stats = ColumnarStats.from_engine(get_engine(db_path))
+        loaded_stats[db_path] = (version, stats)
+        return stats
@@ -45,3 +45,75 @@ CREATE TABLE IF NOT EXISTS last_5_ys_yearly_stats (
     FOREIGN KEY (year_id) REFERENCES years(year_id),
     FOREIGN KEY (league_id) REFERENCES leagues(league_id)
 );
+
+-- Denormalized read model: one row per last_5_ys_yearly_stats row with every label resolved.
+-- Rebuilt by the importer (and per page by the streaming scraper); the dashboard and CLI read it
+-- instead of joining six tables on every request.
+CREATE TABLE IF NOT EXISTS yearly_stats_wide (
+    statistic_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    year_id INTEGER NOT NULL,
+    league_id INTEGER NOT NULL,
+    league TEXT NOT NULL,
+    stat_title TEXT NOT NULL,
+    statistic TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    no REAL,
+    top_25 TEXT,
+    player_name TEXT NOT NULL,
+    team_name TEXT NOT NULL
+);
+
+-- Rollups of yearly_stats_wide, refreshed with it; the sunburst and the per-team counts
+-- read these small tables instead of aggregating every fact row.
+-- Top-25 appearances per player (without "To Be Determined" teams and empty results)
+CREATE TABLE IF NOT EXISTS player_top25_counts (
+    player_id INTEGER PRIMARY KEY,
+    team_name TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    appearances INTEGER NOT NULL
+);
+
+-- Distinct top-25 players per team
+CREATE TABLE IF NOT EXISTS team_top25_counts (
+    team_name TEXT PRIMARY KEY,
+    league TEXT NOT NULL,
+    top_25_players INTEGER NOT NULL
+);
+
+-- Indexes for the dashboard / CLI access paths
+-- Fact rows by statistic and league (yearly results, rankings, league comparison);
+-- year, result and player are included so the joins are answered from the index
+CREATE INDEX IF NOT EXISTS idx_yearly_stats_statistic_league
+    ON last_5_ys_yearly_stats (statistic_id, league_id, year_id, no, player_id);
+
+-- Fact rows of one league and year (one year statistics)
+CREATE INDEX IF NOT EXISTS idx_yearly_stats_league_year
+    ON last_5_ys_yearly_stats (league_id, year_id, statistic_id);
+
+-- Fact rows per player (players per team, best players counts)
+CREATE INDEX IF NOT EXISTS idx_yearly_stats_player
+    ON last_5_ys_yearly_stats (player_id);
+
+-- Lookup natural keys (stat_title, team_name, year and league are already UNIQUE)
+CREATE INDEX IF NOT EXISTS idx_statistics_stat_title_statistic
+    ON statistics (stat_title_id, statistic);
+
+CREATE INDEX IF NOT EXISTS idx_players_team_player
+    ON players (team_id, player_name);
+
+-- Read model lookups: yearly results / rankings, league comparison, one year statistics
+CREATE INDEX IF NOT EXISTS idx_wide_league_title_statistic
+    ON yearly_stats_wide (league, stat_title, statistic, no);
+
+CREATE INDEX IF NOT EXISTS idx_wide_title_statistic
+    ON yearly_stats_wide (stat_title, statistic, year);
+
+CREATE INDEX IF NOT EXISTS idx_wide_league_year_title
+    ON yearly_stats_wide (league, year, stat_title);
+
+CREATE INDEX IF NOT EXISTS idx_wide_page
+    ON yearly_stats_wide (year_id, league_id);
+
+CREATE INDEX IF NOT EXISTS idx_player_counts_appearances
+    ON player_top25_counts (appearances);
@@ -0,0 +1,54 @@
+import os
+import threading
+
+from sqlalchemy import create_engine
+
+# ---------------------------------------------------------- #
+# Database connection shared by the dashboard
+# ---------------------------------------------------------- #
+# Database the dashboard and step_3_db_query.py read; STATS_DB_PATH=db/baseball_history.db
+# points them at the seasons loaded by the scraper's backfill mode
+DB_PATH = os.environ.get('STATS_DB_PATH', os.path.join('db', 'baseball_stats.db'))
+
+# db_path -> (database version, engine)
+engines = {}
+engines_lock = threading.Lock()
+
+
+def db_version(db_path=DB_PATH):
+    """
+    Identify the database file currently at db_path.
+
+    step_2_db_import.py swaps in a new file on every import, which changes
+    both the inode and the modification time.
+
+    Returns:
+        tuple: (inode, mtime in ns), or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+def get_engine(db_path=DB_PATH):
+    """
+    Return an engine for db_path, reopening it when a new database file was swapped in.
+
+    Returns:
+        sqlalchemy.Engine: Engine connected to the current database file.
+    """
+    version = db_version(db_path)
+    with engines_lock:
+        cached = engines.get(db_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if cached is not None:
+            # Connections still open on the old file are closed when they are returned
+            cached[1].dispose()
+
+        engine = create_engine(f"sqlite:///{db_path}")
+        engines[db_path] = (version, engine)
+        return engine
@@ -0,0 +1,409 @@
+import os
+import sqlite3
+
+# ---------------------------------------------------------- #
+# Bulk transactional loader for the SQLite database
+# ---------------------------------------------------------- #
+# Parents before children: tables are filled in this order and emptied in reverse
+TABLE_LOAD_ORDER = ['stat_titles', 'statistics', 'teams', 'players', 'years', 'leagues', 'last_5_ys_yearly_stats']
+
+# Load-time settings: no fsync while loading, bigger page cache, temp b-trees in memory
+LOAD_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'OFF',
+    'cache_size': -65536,  # negative = KiB, i.e. 64 MB
+    'temp_store': 'MEMORY',
+}
+# Settings restored once the load is committed
+RUN_PRAGMAS = {
+    'synchronous': 'NORMAL',
+}
+
+
+def set_pragmas(conn, pragmas):
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def declared_table_sql(schema_sql):
+    """
+    CREATE TABLE statements of a schema script, as SQLite stores them in sqlite_master.
+
+    Returns:
+        dict: Table name -> normalized CREATE TABLE sql.
+    """
+    mem_conn = sqlite3.connect(':memory:')
+    try:
+        mem_conn.executescript(schema_sql)
+        return {
+            name: ' '.join(sql.split())
+            for name, sql in mem_conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'")
+        }
+    finally:
+        mem_conn.close()
+
+
+def ensure_schema(conn, schema_sql):
+    """
+    Create the declared schema, replacing tables whose definition differs from it
+    (e.g. tables pandas.to_sql recreated with inferred types and no keys).
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+        schema_sql (str): Schema script (CREATE TABLE IF NOT EXISTS ...).
+
+    Returns:
+        list: Names of the tables that were replaced.
+    """
+    declared = declared_table_sql(schema_sql)
+    actual = {
+        name: ' '.join(sql.split())
+        for name, sql in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'")
+    }
+
+    replaced = [name for name, sql in declared.items() if name in actual and actual[name] != sql]
+    with conn:
+        for name in replaced:
+            conn.execute(f"DROP TABLE {name}")
+    conn.executescript(schema_sql)
+    return replaced
+
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def bulk_load_tables(conn, dfs, table_order=TABLE_LOAD_ORDER):
+    """
+    Replace the contents of the given tables in one transaction.
+
+    Every table is emptied (children first) and refilled with executemany
+    (parents first); nothing is visible to readers until the commit, and a
+    failure rolls the whole load back.
+
+    Args:
+        conn (sqlite3.Connection): Database connection with the declared schema.
+        dfs (dict): Table name -> DataFrame. Only columns declared in the table are inserted.
+        table_order (list): Load order of the tables.
+
+    Returns:
+        dict: Table name -> number of rows inserted.
+    """
+    tables = [table for table in table_order if table in dfs]
+    row_counts = {}
+
+    set_pragmas(conn, LOAD_PRAGMAS)
+    try:
+        with conn:
+            for table in reversed(tables):
+                conn.execute(f"DELETE FROM {table}")
+
+            for table in tables:
+                df = dfs[table]
+                columns = [col for col in table_columns(conn, table) if col in df.columns]
+                placeholders = ', '.join('?' for _ in columns)
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                    df[columns].itertuples(index=False, name=None))
+                row_counts[table] = len(df)
+    finally:
+        set_pragmas(conn, RUN_PRAGMAS)
+
+    return row_counts
+
+
+# ---------------------------------------------------------- #
+# Denormalized read model
+# ---------------------------------------------------------- #
+READ_MODEL_TABLE = 'yearly_stats_wide'
+
+READ_MODEL_SELECT = """
+    SELECT
+        ls.statistic_id, ls.player_id, ls.year_id, ls.league_id,
+        l.league, st.stat_title, s.statistic, y.year,
+        ls.no, ls.top_25, p.player_name, t.team_name
+    FROM last_5_ys_yearly_stats AS ls
+    JOIN statistics AS s ON ls.statistic_id = s.statistic_id
+    JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
+    JOIN players AS p ON ls.player_id = p.player_id
+    JOIN teams AS t ON p.team_id = t.team_id
+    JOIN years AS y ON ls.year_id = y.year_id
+    JOIN leagues AS l ON ls.league_id = l.league_id
+"""
+
+
+def refresh_read_model(conn, year_id=None, league_id=None):
+    """
+    Rebuild yearly_stats_wide from the normalized tables, fully or for one (year, league) page.
+
+    Runs in the caller's transaction; the caller commits.
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+        year_id (int): With league_id, refresh only this page's rows.
+        league_id (int): See year_id.
+
+    Returns:
+        int: Number of rows in the refreshed part of the read model.
+    """
+    if year_id is None or league_id is None:
+        conn.execute(f"DELETE FROM {READ_MODEL_TABLE}")
+        cursor = conn.execute(f"INSERT INTO {READ_MODEL_TABLE} {READ_MODEL_SELECT}")
+    else:
+        params = (year_id, league_id)
+        conn.execute(f"DELETE FROM {READ_MODEL_TABLE} WHERE year_id = ? AND league_id = ?", params)
+        cursor = conn.execute(
+            f"INSERT INTO {READ_MODEL_TABLE} {READ_MODEL_SELECT} WHERE ls.year_id = ? AND ls.league_id = ?",
+            params)
+    return cursor.rowcount
+
+
+# ---------------------------------------------------------- #
+# Rollup tables
+# ---------------------------------------------------------- #
+# Team placeholder of not yet decided leaders, left out of the per-player counts
+UNDECIDED_TEAM = 'To Be Determined'
+
+PLAYER_COUNTS_SELECT = f"""
+    SELECT player_id, team_name, player_name, COUNT(*)
+    FROM {READ_MODEL_TABLE}
+    WHERE team_name != '{UNDECIDED_TEAM}' AND no IS NOT NULL
+"""
+
+TEAM_COUNTS_SELECT = f"""
+    SELECT team_name, MIN(league), COUNT(DISTINCT player_id)
+    FROM {READ_MODEL_TABLE}
+"""
+
+
+def refresh_rollups(conn, player_ids=None):
+    """
+    Rebuild player_top25_counts and team_top25_counts from yearly_stats_wide.
+
+    Runs in the caller's transaction, after the read model was refreshed.
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+        player_ids (iterable): Refresh only these players and their teams. None rebuilds everything.
+    """
+    if player_ids is None:
+        conn.execute("DELETE FROM player_top25_counts")
+        conn.execute(f"INSERT INTO player_top25_counts {PLAYER_COUNTS_SELECT} GROUP BY player_id")
+        conn.execute("DELETE FROM team_top25_counts")
+        conn.execute(f"INSERT INTO team_top25_counts {TEAM_COUNTS_SELECT} GROUP BY team_name")
+        return
+
+    player_ids = list(player_ids)
+    if not player_ids:
+        return
+    placeholders = ', '.join('?' for _ in player_ids)
+    team_names = [
+        name for (name,) in conn.execute(
+            f"SELECT DISTINCT t.team_name FROM players AS p JOIN teams AS t ON p.team_id = t.team_id "
+            f"WHERE p.player_id IN ({placeholders})", player_ids)
+    ]
+
+    conn.execute(f"DELETE FROM player_top25_counts WHERE player_id IN ({placeholders})", player_ids)
+    conn.execute(
+        f"INSERT INTO player_top25_counts {PLAYER_COUNTS_SELECT} "
+        f"AND player_id IN ({placeholders}) GROUP BY player_id", player_ids)
+
+    team_placeholders = ', '.join('?' for _ in team_names) or 'NULL'
+    conn.execute(f"DELETE FROM team_top25_counts WHERE team_name IN ({team_placeholders})", team_names)
+    conn.execute(
+        f"INSERT INTO team_top25_counts {TEAM_COUNTS_SELECT} "
+        f"WHERE team_name IN ({team_placeholders}) GROUP BY team_name", team_names)
+
+
+# ---------------------------------------------------------- #
+# Shadow database build and atomic swap
+# ---------------------------------------------------------- #
+def shadow_path(db_path):
+    return f"{db_path}.building"
+
+
+def remove_db_sidecars(db_path):
+    # The WAL/shared-memory/journal files SQLite keeps next to a database file
+    for suffix in ('-wal', '-shm', '-journal'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+def remove_db_files(db_path):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    remove_db_sidecars(db_path)
+
+
+def replace_database(new_path, db_path):
+    """
+    Rename a finished database file over the live one.
+
+    The live file's -wal/-shm/-journal files belong to the old file; left next to
+    the new one, SQLite would apply them to it, so they are removed first.
+
+    Raises:
+        PermissionError: If the live file cannot be replaced, e.g. on Windows while
+            another program holds it open. new_path is kept.
+    """
+    try:
+        remove_db_sidecars(db_path)
+        os.replace(new_path, db_path)
+    except PermissionError as e:
+        raise PermissionError(
+            f"Could not replace {db_path}, it is probably open in another program (e.g. the dashboard). "
+            f"The new database was kept in {new_path}. ({e})") from e
+
+
+def validate_database(conn, expected_row_counts):
+    """
+    Check a freshly loaded database before it goes live.
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+        expected_row_counts (dict): Table name -> number of rows that should be in it.
+
+    Returns:
+        list: Problems found (empty if the database is fine).
+    """
+    problems = []
+    for table, expected in expected_row_counts.items():
+        actual = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        if actual != expected:
+            problems.append(f"{table}: {actual} rows, expected {expected}")
+
+    for table, rowid, parent, _ in conn.execute("PRAGMA foreign_key_check"):
+        problems.append(f"{table}: row {rowid} references a missing {parent} row")
+
+    integrity = conn.execute("PRAGMA quick_check").fetchone()[0]
+    if integrity != 'ok':
+        problems.append(f"quick_check: {integrity}")
+
+    return problems
+
+
+def start_shadow_database(db_path, resume=False):
+    """
+    Prepare shadow_path(db_path) for a build that changes the live database in place
+    (e.g. the stream pipeline): a copy of the live database, or a new empty file.
+
+    Args:
+        db_path (str): Live database file.
+        resume (bool): Keep a shadow file left by an interrupted build instead of starting over.
+
+    Returns:
+        str: Path of the shadow database.
+    """
+    new_path = shadow_path(db_path)
+    if resume and os.path.exists(new_path):
+        return new_path
+
+    remove_db_files(new_path)
+    if os.path.exists(db_path):
+        source = sqlite3.connect(db_path)
+        target = sqlite3.connect(new_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+    return new_path
+
+
+def finish_database(conn, expected_row_counts=None):
+    """
+    Rebuild the read model and rollups of a loaded database, refresh the planner
+    statistics and validate it.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the new database.
+        expected_row_counts (dict): Table name -> number of rows that should be in it.
+
+    Returns:
+        dict: expected_row_counts plus the read model, which must hold every fact row.
+
+    Raises:
+        ValueError: If the database fails validation.
+    """
+    row_counts = dict(expected_row_counts or {})
+    with conn:
+        # Every fact row must show up in the read model (the joins are inner joins)
+        row_counts[READ_MODEL_TABLE] = row_counts.get(
+            'last_5_ys_yearly_stats',
+            conn.execute("SELECT COUNT(*) FROM last_5_ys_yearly_stats").fetchone()[0])
+        refresh_read_model(conn)
+        refresh_rollups(conn)
+    # Fresh statistics for the query planner, so it picks the covering indexes
+    conn.execute("ANALYZE")
+
+    problems = validate_database(conn, row_counts)
+    if problems:
+        raise ValueError("New database failed validation: " + "; ".join(problems))
+
+    # Fold the WAL back into the file and leave WAL mode, so the swapped-in
+    # database is a single self-contained file
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("PRAGMA journal_mode = DELETE")
+    return row_counts
+
+
+def swap_in_database(new_path, db_path, expected_row_counts=None):
+    """
+    Finish the database built in new_path (see finish_database()) and rename it over db_path.
+
+    A failed validation removes new_path and leaves the live file untouched.
+
+    Returns:
+        dict: Table name -> number of rows validated.
+
+    Raises:
+        ValueError: If the new database fails validation.
+        PermissionError: If the live file cannot be replaced (see replace_database()).
+    """
+    conn = sqlite3.connect(new_path)
+    try:
+        row_counts = finish_database(conn, expected_row_counts)
+    except Exception:
+        conn.close()
+        remove_db_files(new_path)
+        raise
+    conn.close()
+
+    replace_database(new_path, db_path)
+    return row_counts
+
+
+def build_and_swap_database(db_path, schema_sql, dfs):
+    """
+    Build a complete new database next to the live one, validate it and rename it into place.
+
+    Readers keep using the old file until the rename, then see the whole new
+    database at once; a failed build or validation leaves the live file untouched.
+
+    Args:
+        db_path (str): Live database file.
+        schema_sql (str): Schema script.
+        dfs (dict): Table name -> DataFrame to load (see bulk_load_tables()).
+
+    Returns:
+        dict: Table name -> number of rows loaded.
+
+    Raises:
+        ValueError: If the new database fails validation.
+        PermissionError: If the live file cannot be replaced (see replace_database()).
+    """
+    new_path = shadow_path(db_path)
+    remove_db_files(new_path)
+
+    conn = sqlite3.connect(new_path)
+    try:
+        ensure_schema(conn, schema_sql)
+        row_counts = finish_database(conn, bulk_load_tables(conn, dfs))
+    except Exception:
+        conn.close()
+        remove_db_files(new_path)
+        raise
+    conn.close()
+
+    replace_database(new_path, db_path)
+    return row_counts
@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from db_connection import db_version
+
+# ---------------------------------------------------------- #
+# Plotly figure cache shared by the dashboard's sessions
+# ---------------------------------------------------------- #
+# Figures are kept as their JSON spec per chart, filter parameters, database
+# file and file version; an import that swaps in a new file makes every old
+# entry unreachable. Least recently used specs are dropped once their total
+# size exceeds the budget.
+FIGURE_CACHE_MB = float(os.environ.get('FIGURE_CACHE_MB', 64))
+
+# (chart, db_path, version, params) -> (spec, size in bytes), least recently used first
+figure_cache = OrderedDict()
+figure_cache_lock = threading.Lock()
+figure_cache_bytes = 0
+
+
+def cached_figure(engine, chart, params, build):
+    """
+    Return a chart's figure from the cache, building and storing it on a miss.
+
+    Args:
+        engine (sqlalchemy.Engine): Engine of the database the chart is drawn from.
+        chart (str): Chart name, e.g. 'player_sunburst'.
+        params (dict): Filter values the figure depends on.
+        build (callable): Builds the go.Figure (queries included) on a miss.
+
+    Returns:
+        go.Figure: A new figure object the caller may modify.
+    """
+    global figure_cache_bytes
+
+    db_path = engine.url.database
+    key = (chart, db_path, db_version(db_path), tuple(sorted(params.items())))
+
+    with figure_cache_lock:
+        entry = figure_cache.get(key)
+        if entry is not None:
+            figure_cache.move_to_end(key)
+
+    if entry is not None:
+        # The spec came from a validated figure, so skip Plotly's validation,
+        # by far the most expensive part of building a figure from a dict
+        return go.Figure(json.loads(entry[0]), _validate=False)
+
+    fig = build()
+    spec = pio.to_json(fig, validate=False)
+    size = sys.getsizeof(spec)
+    budget = FIGURE_CACHE_MB * 1024 * 1024
+    if size > budget:
+        return fig
+
+    with figure_cache_lock:
+        if key in figure_cache:
+            figure_cache_bytes -= figure_cache.pop(key)[1]
+        figure_cache[key] = (spec, size)
+        figure_cache_bytes += size
+        while figure_cache_bytes > budget:
+            figure_cache_bytes -= figure_cache.popitem(last=False)[1][1]
+    return fig
+
+
+def clear_figure_cache():
+    global figure_cache_bytes
+
+    with figure_cache_lock:
+        figure_cache.clear()
+        figure_cache_bytes = 0
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+
+import pandas as pd
+
+# ---------------------------------------------------------- #
+# Persistent surrogate-key registry
+# ---------------------------------------------------------- #
+# Sidecar SQLite file mapping natural keys to permanent ids. Ids are only
+# ever appended: a name keeps its id for good, across full and incremental
+# runs, so ids can be used to cache and upsert data between refreshes.
+KEY_REGISTRY_PATH = os.path.join('db', 'key_registry.db')
+
+# Lookup table -> (id column, natural key columns)
+REGISTRY_KEYS = {
+    'stat_titles': ('stat_title_id', ['stat_title']),
+    'statistics': ('statistic_id', ['statistic', 'stat_title']),
+    'teams': ('team_id', ['team_name']),
+    'players': ('player_id', ['player_name', 'team_name']),
+    'years': ('year_id', ['year']),
+    'leagues': ('league_id', ['league']),
+}
+
+
+def registry_table_sql(table):
+    id_col, key_cols = REGISTRY_KEYS[table]
+    key_defs = ', '.join(f"{col} TEXT NOT NULL" for col in key_cols)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table} ("
+        f"{id_col} INTEGER PRIMARY KEY, {key_defs}, UNIQUE ({', '.join(key_cols)}))"
+    )
+
+
+def load_registry(path=KEY_REGISTRY_PATH):
+    """
+    Read the key registry.
+
+    Args:
+        path (str): Registry file.
+
+    Returns:
+        dict: Lookup table name -> DataFrame (id column + natural key columns, keys as text).
+        Empty dict if there is no registry yet.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    conn = sqlite3.connect(path)
+    try:
+        registry = {}
+        for table, (id_col, key_cols) in REGISTRY_KEYS.items():
+            conn.execute(registry_table_sql(table))
+            registry[table] = pd.read_sql(
+                f"SELECT {id_col}, {', '.join(key_cols)} FROM {table} ORDER BY {id_col}", conn)
+        return registry
+    finally:
+        conn.close()
+
+
+def save_registry(registry, path=KEY_REGISTRY_PATH):
+    """
+    Append new keys to the registry. Keys already registered keep their id.
+
+    Args:
+        registry (dict): Lookup table name -> DataFrame (id column + natural key columns).
+        path (str): Registry file.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            for table, (id_col, key_cols) in REGISTRY_KEYS.items():
+                conn.execute(registry_table_sql(table))
+                df = registry.get(table)
+                if df is None or df.empty:
+                    continue
+
+                rows = zip(
+                    df[id_col].astype(int).tolist(),
+                    *[df[col].astype(str).str.strip().tolist() for col in key_cols])
+                placeholders = ', '.join('?' for _ in range(len(key_cols) + 1))
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {table} ({id_col}, {', '.join(key_cols)}) VALUES ({placeholders})",
+                    rows)
+    finally:
+        conn.close()
+
+
+def registry_from_tables(tables):
+    """
+    Turn normalized tables (as written to csv/ or the database) into registry lookups.
+
+    Args:
+        tables (dict): Table name -> DataFrame for stat_titles, statistics, players, teams, years, leagues.
+
+    Returns:
+        dict: Lookup table name -> DataFrame with natural key columns instead of foreign key ids.
+    """
+    statistics = tables['statistics'].merge(tables['stat_titles'], on='stat_title_id', how='left')
+    players = tables['players'].merge(tables['teams'], on='team_id', how='left')
+
+    registry = {
+        'stat_titles': tables['stat_titles'],
+        'statistics': statistics,
+        'teams': tables['teams'],
+        'players': players,
+        'years': tables['years'],
+        'leagues': tables['leagues'],
+    }
+    return {
+        table: df[[REGISTRY_KEYS[table][0]] + REGISTRY_KEYS[table][1]]
+        for table, df in registry.items()
+    }
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------- #
+# Vectorized normalization of last_5_ys_yearly_stats
+# ---------------------------------------------------------- #
+# Every lookup table is built by factorizing its natural key columns once;
+# the factor codes are the foreign keys, so the fact table never has to be
+# merged with (and copied for) each lookup table.
+
+
+def factorize_lookup(df, cols, id_col_name, known_keys=None):
+    """
+    Build a lookup table for one natural key and the id of every row of df.
+
+    Args:
+        df (pd.DataFrame): DataFrame holding the key columns.
+        cols (list): Key column names (one column or a composite key).
+        id_col_name (str): Name of the ID column to be created.
+        known_keys (pd.DataFrame): Ids already given out (id_col_name + cols), e.g. from the
+            key registry. Known keys keep their id, new keys get ids after the current max id.
+
+    Returns:
+        tuple: (lookup DataFrame with id_col_name + cols for the keys present in df, sorted by id;
+        np.ndarray of ids aligned with df rows)
+    """
+    # Factorize each column with sorted uniques, so combined codes sort like sort_values(by=cols)
+    col_codes = []
+    col_uniques = []
+    for col in cols:
+        codes, uniques = pd.factorize(df[col].astype(str).str.strip(), sort=True)
+        col_codes.append(codes.astype(np.int64))
+        col_uniques.append(np.asarray(uniques, dtype=object))
+
+    # Composite key: mix the per-column codes into one int64 key and factorize that
+    combined = col_codes[0]
+    for codes, uniques in zip(col_codes[1:], col_uniques[1:]):
+        combined = combined * len(uniques) + codes
+    row_codes, key_codes = pd.factorize(combined, sort=True)
+
+    # Decode each unique combined key back into its column values
+    lookup_df = pd.DataFrame(index=range(len(key_codes)))
+    remainder = np.asarray(key_codes, dtype=np.int64)
+    for col, uniques in reversed(list(zip(cols, col_uniques))):
+        lookup_df[col] = uniques[remainder % len(uniques)]
+        remainder = remainder // len(uniques)
+    lookup_df = lookup_df[list(cols)]
+
+    if known_keys is None or known_keys.empty:
+        ids = np.arange(len(lookup_df), dtype=np.int64)
+        lookup_df.insert(0, id_col_name, ids)
+        return lookup_df, ids[row_codes]
+
+    known_df = known_keys[[id_col_name] + list(cols)].copy()
+    for col in cols:
+        known_df[col] = known_df[col].astype(str).str.strip()
+
+    # Match the (small) table of unique keys against the previous ids
+    key_ids = lookup_df.merge(known_df, on=list(cols), how='left')[id_col_name]
+    is_new = key_ids.isna().to_numpy()
+    next_id = int(known_df[id_col_name].max()) + 1
+    key_ids = key_ids.to_numpy(copy=True)
+    key_ids[is_new] = np.arange(next_id, next_id + is_new.sum())
+    key_ids = key_ids.astype(np.int64)
+
+    lookup_df.insert(0, id_col_name, key_ids)
+    lookup_df = lookup_df.sort_values(id_col_name).reset_index(drop=True)
+
+    return lookup_df, key_ids[row_codes]
+
+
+def normalize_stats(stats, registry=None):
+    """
+    Split the cleaned last_5_ys_yearly_stats df into lookup tables and an integer-coded fact table.
+
+    Args:
+        stats (pd.DataFrame): Cleaned scraping results with statistic, player_name, team_name,
+            no, top_25, year, league and stat_title columns.
+        registry (dict): Known ids per lookup table, with natural key columns
+            (see key_registry.load_registry()). None assigns fresh ids.
+
+    Returns:
+        dict: Table name -> DataFrame for stat_titles, statistics, players, teams,
+        years, leagues and last_5_ys_yearly_stats.
+    """
+    registry = registry or {}
+
+    # Step 1: lookups keyed directly on the fact table
+    statistics, statistic_ids = factorize_lookup(
+        stats, ['statistic', 'stat_title'], 'statistic_id', registry.get('statistics'))
+    players, player_ids = factorize_lookup(
+        stats, ['player_name', 'team_name'], 'player_id', registry.get('players'))
+    years, year_ids = factorize_lookup(
+        stats, ['year'], 'year_id', registry.get('years'))
+    leagues, league_ids = factorize_lookup(
+        stats, ['league'], 'league_id', registry.get('leagues'))
+
+    # Step 2: lookups keyed on the step 1 lookups
+    stat_titles, stat_title_ids = factorize_lookup(
+        statistics, ['stat_title'], 'stat_title_id', registry.get('stat_titles'))
+    teams, team_ids = factorize_lookup(
+        players, ['team_name'], 'team_id', registry.get('teams'))
+
+    statistics = statistics[['statistic_id', 'statistic']].assign(stat_title_id=stat_title_ids)
+    players = players[['player_id', 'player_name']].assign(team_id=team_ids)
+
+    last_5_ys_yearly_stats = pd.DataFrame({
+        'no': stats['no'].to_numpy(),
+        'top_25': stats['top_25'].to_numpy(),
+        'statistic_id': statistic_ids,
+        'player_id': player_ids,
+        'year_id': year_ids,
+        'league_id': league_ids,
+    })
+
+    return {
+        'stat_titles': stat_titles,
+        'statistics': statistics,
+        'players': players,
+        'teams': teams,
+        'years': years,
+        'leagues': leagues,
+        'last_5_ys_yearly_stats': last_5_ys_yearly_stats,
+    }
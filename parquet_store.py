@@ -0,0 +1,98 @@
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# ---------------------------------------------------------- #
+# Parquet snapshots of the normalized tables
+# ---------------------------------------------------------- #
+# Typed alternative to the CSVs: every lookup table is one Parquet file, the
+# fact table a dataset partitioned by year and league
+# (last_5_ys_yearly_stats/year_id=0/league_id=1/...). Types match db/schema.sql.
+PARQUET_DIR = 'parquet'
+PARQUET_COMPRESSION = 'zstd'
+
+FACT_TABLE = 'last_5_ys_yearly_stats'
+FACT_PARTITION_COLS = ['year_id', 'league_id']
+
+TABLE_SCHEMAS = {
+    'stat_titles': pa.schema([
+        ('stat_title_id', pa.int32()), ('stat_title', pa.string())]),
+    'statistics': pa.schema([
+        ('statistic_id', pa.int32()), ('statistic', pa.string()), ('stat_title_id', pa.int32())]),
+    'players': pa.schema([
+        ('player_id', pa.int32()), ('player_name', pa.string()), ('team_id', pa.int32())]),
+    'teams': pa.schema([
+        ('team_id', pa.int32()), ('team_name', pa.string())]),
+    'years': pa.schema([
+        ('year_id', pa.int32()), ('year', pa.int32())]),
+    'leagues': pa.schema([
+        ('league_id', pa.int32()), ('league', pa.string())]),
+    FACT_TABLE: pa.schema([
+        ('no', pa.float64()), ('top_25', pa.string()), ('statistic_id', pa.int32()),
+        ('player_id', pa.int32()), ('year_id', pa.int32()), ('league_id', pa.int32())]),
+}
+
+
+def table_path(folder_path, name):
+    # The fact table is a directory of partitions, lookups are single files
+    return os.path.join(folder_path, name if name == FACT_TABLE else f"{name}.parquet")
+
+
+def save_dfs_to_parquet(df_dict, folder_path=PARQUET_DIR, compression=PARQUET_COMPRESSION):
+    """
+    Save the normalized tables as typed, compressed Parquet.
+
+    Args:
+        df_dict (dict): Table name -> DataFrame (see TABLE_SCHEMAS).
+        folder_path (str): Directory to save the snapshot in. Existing tables are replaced.
+        compression (str): Parquet compression codec.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+
+    for name, df in df_dict.items():
+        schema = TABLE_SCHEMAS[name]
+        # Cast to the declared types (the scraper keeps e.g. year as text)
+        table = pa.Table.from_pandas(df[schema.names], preserve_index=False).cast(schema)
+        path = table_path(folder_path, name)
+
+        if name == FACT_TABLE:
+            # Start from an empty directory so partitions of dropped seasons do not linger
+            shutil.rmtree(path, ignore_errors=True)
+            pq.write_to_dataset(table, path, partition_cols=FACT_PARTITION_COLS, compression=compression)
+        else:
+            pq.write_table(table, path, compression=compression)
+        print(f"Saved: {path}")
+
+
+def read_parquet_tables(folder_path=PARQUET_DIR):
+    """
+    Read a Parquet snapshot written by save_dfs_to_parquet().
+
+    Numeric columns are handed to pandas without copying where Arrow allows it.
+
+    Args:
+        folder_path (str): Snapshot directory.
+
+    Returns:
+        dict: Table name -> DataFrame for the tables present in the snapshot.
+    """
+    dfs = {}
+    for name, schema in TABLE_SCHEMAS.items():
+        path = table_path(folder_path, name)
+        if not os.path.exists(path):
+            print(f"WARNING: {path} not found!")
+            continue
+
+        if name == FACT_TABLE:
+            partitioning = ds.partitioning(
+                pa.schema([schema.field(col) for col in FACT_PARTITION_COLS]), flavor='hive')
+            table = ds.dataset(path, format='parquet', partitioning=partitioning).to_table()
+            table = table.select(schema.names)
+        else:
+            table = pq.read_table(path)
+
+        dfs[name] = table.to_pandas(split_blocks=True, self_destruct=True)
+    return dfs
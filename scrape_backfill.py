@@ -0,0 +1,71 @@
+import os
+import sqlite3
+
+# ---------------------------------------------------------- #
+# Historical backfill helpers
+# ---------------------------------------------------------- #
+# Older seasons go into their own database with the same schema, so the live
+# database (and every dashboard query) stays limited to the recent window.
+# The history database is written in committed chunks of pages; a page is
+# only ever committed complete, so the pages it holds are the checkpoint a
+# rerun resumes from.
+HISTORY_DB_PATH = os.path.join('db', 'baseball_history.db')
+
+
+def parse_year_range(spec, available_years):
+    """
+    Turn a year range spec into the set of seasons to backfill.
+
+    Args:
+        spec (str): 'all', a season ('1995'), a range ('1990-2000') or an open range ('1990-', '-1950').
+        available_years (iterable): Seasons listed on yearmenu.shtml.
+
+    Returns:
+        set: Requested seasons that are available.
+
+    Raises:
+        ValueError: If the spec cannot be parsed.
+    """
+    available_years = {int(year) for year in available_years}
+    spec = spec.strip().lower()
+    if spec in ('', 'all'):
+        return available_years
+
+    start, sep, end = spec.partition('-')
+    try:
+        first = int(start) if start else min(available_years)
+        last = (int(end) if end else max(available_years)) if sep else first
+    except ValueError:
+        raise ValueError(f"Invalid year range '{spec}', expected e.g. 'all', '1995' or '1990-2000'")
+
+    return {year for year in available_years if first <= year <= last}
+
+
+def backfilled_pages(db_path=HISTORY_DB_PATH):
+    """
+    (year, league) pages already committed to the history database.
+    """
+    if not os.path.exists(db_path):
+        return set()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        return set(conn.execute("""
+            SELECT DISTINCT y.year, l.league
+            FROM last_5_ys_yearly_stats AS ls
+            JOIN years AS y ON ls.year_id = y.year_id
+            JOIN leagues AS l ON ls.league_id = l.league_id
+        """))
+    except sqlite3.OperationalError:
+        # No schema yet
+        return set()
+    finally:
+        conn.close()
+
+
+def chunked(items, size):
+    """
+    Split a list into consecutive chunks of at most size items.
+    """
+    size = max(int(size), 1)
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,129 @@
+import os
+import sqlite3
+
+import pandas as pd
+
+# ---------------------------------------------------------- #
+# Incremental scrape helpers
+# ---------------------------------------------------------- #
+# Tables written by save_dfs_to_csvs() / imported by step_2_db_import.py
+TABLE_NAMES = ['stat_titles', 'statistics', 'players', 'teams', 'years', 'leagues', 'last_5_ys_yearly_stats']
+
+# Columns of the cleaned (not yet normalized) last_5_ys_yearly_stats df
+STAT_COLUMNS = ['statistic', 'player_name', 'team_name', 'no', 'top_25', 'year', 'league', 'stat_title']
+
+
+def read_existing_tables(csv_dir='csv', db_path=None):
+    """
+    Read the normalized tables of a previous run, from csv_dir or, if any csv is missing, from the database.
+
+    Args:
+        csv_dir (str): Folder with the CSVs written by save_dfs_to_csvs(). None reads the database only.
+        db_path (str): SQLite database written by step_2_db_import.py (fallback).
+
+    Returns:
+        dict: Table name -> DataFrame, or None if no previous run was found.
+    """
+    if csv_dir:
+        csv_paths = {name: os.path.join(csv_dir, f"{name}.csv") for name in TABLE_NAMES}
+        if all(os.path.exists(path) for path in csv_paths.values()):
+            return {name: pd.read_csv(path) for name, path in csv_paths.items()}
+
+    if db_path and os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            return {name: pd.read_sql(f"SELECT * FROM {name}", conn) for name in TABLE_NAMES}
+        except Exception as e:
+            print(f"Could not read existing tables from {db_path}: {e}")
+        finally:
+            conn.close()
+
+    return None
+
+
+def denormalize_existing_tables(tables):
+    """
+    Turn the normalized tables of a previous run back into text-keyed DataFrames.
+
+    Args:
+        tables (dict): Output of read_existing_tables().
+
+    Returns:
+        dict with:
+            'stats': last_5_ys_yearly_stats with STAT_COLUMNS (same shape as a fresh scrape)
+            'statistics': statistic_id, statistic, stat_title
+            'players': player_id, player_name, team_name
+            'stat_titles', 'teams', 'years', 'leagues': unchanged lookup tables
+    """
+    statistics = tables['statistics'].merge(tables['stat_titles'], on='stat_title_id', how='left')
+    statistics = statistics[['statistic_id', 'statistic', 'stat_title']]
+
+    players = tables['players'].merge(tables['teams'], on='team_id', how='left')
+    players = players[['player_id', 'player_name', 'team_name']]
+
+    stats = (
+        tables['last_5_ys_yearly_stats']
+        .merge(statistics, on='statistic_id', how='left')
+        .merge(players, on='player_id', how='left')
+        .merge(tables['years'], on='year_id', how='left')
+        .merge(tables['leagues'], on='league_id', how='left')
+    )
+    stats = stats[STAT_COLUMNS].copy()
+    stats['year'] = stats['year'].astype(int)
+
+    return {
+        'stats': stats,
+        'statistics': statistics,
+        'players': players,
+        'stat_titles': tables['stat_titles'],
+        'teams': tables['teams'],
+        'years': tables['years'],
+        'leagues': tables['leagues'],
+    }
+
+
+def scraped_pages(stats):
+    """
+    Set of (year, league) pages present in a text-keyed last_5_ys_yearly_stats df.
+    """
+    return set(zip(stats['year'].astype(int), stats['league'].astype(str)))
+
+
+def select_links_to_scrape(year_links, existing_pages, current_year):
+    """
+    Keep the year links whose page is missing from a previous run, plus the current season.
+
+    Args:
+        year_links (list): Dicts with 'year', 'league_name' and 'year_href' (see link_list()).
+        existing_pages (set): (year, league) pairs already scraped.
+        current_year (int): The season still in progress, always refreshed.
+
+    Returns:
+        list: The year links to scrape, in their original order.
+    """
+    return [
+        year_link for year_link in year_links
+        if int(year_link['year']) == current_year
+        or (int(year_link['year']), year_link['league_name']) not in existing_pages
+    ]
+
+
+def merge_stats(existing_stats, new_stats, refreshed_pages, years_window):
+    """
+    Replace refreshed pages in the existing rows with newly scraped ones.
+
+    Args:
+        existing_stats (pd.DataFrame): Text-keyed rows of the previous run.
+        new_stats (pd.DataFrame): Text-keyed rows scraped in this run.
+        refreshed_pages (set): (year, league) pairs scraped in this run.
+        years_window (set): Years to keep; older seasons fall out of the window.
+
+    Returns:
+        pd.DataFrame: Combined rows with STAT_COLUMNS.
+    """
+    existing_keys = pd.Series(list(zip(existing_stats['year'].astype(int), existing_stats['league'])), dtype=object)
+    keep = ~existing_keys.isin(refreshed_pages).to_numpy() & existing_stats['year'].astype(int).isin(years_window).to_numpy()
+
+    merged = pd.concat([existing_stats[keep], new_stats[STAT_COLUMNS]], ignore_index=True)
+    merged['year'] = merged['year'].astype(int)
+    return merged
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+# ---------------------------------------------------------- #
+# Per-page scrape journal
+# ---------------------------------------------------------- #
+# Sidecar SQLite file with one row per page and run: fetch/parse status,
+# content hash, row count and the last error. Every record is committed
+# immediately, so after a crash or an interrupted run the journal says which
+# pages were completed and which still have to be (re)tried.
+SCRAPE_JOURNAL_PATH = os.path.join('db', 'scrape_journal.db')
+
+# Page statuses, in the order a page goes through them
+FETCHED = 'fetched'
+DONE = 'done'
+FETCH_FAILED = 'fetch_failed'
+PARSE_FAILED = 'parse_failed'
+FAILED_STATUSES = (FETCH_FAILED, PARSE_FAILED)
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    target TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS pages (
+    run_id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    year INTEGER,
+    league TEXT,
+    status TEXT NOT NULL,
+    content_hash TEXT,
+    row_count INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, url),
+    FOREIGN KEY (run_id) REFERENCES runs(run_id)
+);
+"""
+
+
+def content_hash(html):
+    return hashlib.sha256(html if isinstance(html, bytes) else html.encode('utf-8')).hexdigest()
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class ScrapeJournal:
+    """
+    Journal of one scrape run into a target (csv/, the live or the history database).
+
+    A run that did not finish is resumed by the next run into the same target:
+    its completed pages are known via completed_urls(), failed pages are
+    retried with their attempt count kept.
+    """
+
+    def __init__(self, target, path=SCRAPE_JOURNAL_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(JOURNAL_SCHEMA)
+        self.target = target
+
+        unfinished = self.conn.execute(
+            "SELECT run_id FROM runs WHERE target = ? AND status = 'running' ORDER BY run_id DESC LIMIT 1",
+            (target,)).fetchone()
+        self.resumed = unfinished is not None
+        if self.resumed:
+            self.run_id = unfinished[0]
+        else:
+            with self.conn:
+                self.run_id = self.conn.execute(
+                    "INSERT INTO runs (target, status, started_at) VALUES (?, 'running', ?)",
+                    (target, now())).lastrowid
+
+    def record(self, url, status, year=None, league=None, html=None, row_count=None, error=None):
+        """
+        Record the latest status of a page (committed at once).
+
+        Args:
+            url (str): Page url.
+            status (str): FETCHED, DONE, FETCH_FAILED or PARSE_FAILED.
+            year (int): Season of the page.
+            league (str): League of the page.
+            html (bytes): Page body, stored as its sha256 hash.
+            row_count (int): Rows parsed from the page.
+            error (str): Error message of a failure.
+        """
+        # Every download (successful or not) counts as an attempt
+        attempt = 1 if status in (FETCHED, FETCH_FAILED) else 0
+        with self.conn:
+            self.conn.execute("""
+                INSERT INTO pages (run_id, url, year, league, status, content_hash, row_count, attempts, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, url) DO UPDATE SET
+                    year = COALESCE(excluded.year, year),
+                    league = COALESCE(excluded.league, league),
+                    status = excluded.status,
+                    content_hash = COALESCE(excluded.content_hash, content_hash),
+                    row_count = COALESCE(excluded.row_count, row_count),
+                    attempts = attempts + excluded.attempts,
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+            """, (self.run_id, url, year, league, status,
+                  content_hash(html) if html is not None else None,
+                  row_count, attempt, error, now()))
+
+    def completed_urls(self):
+        """
+        Urls of the pages this run already completed (also before a resume).
+        """
+        return {url for (url,) in self.conn.execute(
+            "SELECT url FROM pages WHERE run_id = ? AND status = ?", (self.run_id, DONE))}
+
+    def failed_pages(self):
+        """
+        Pages of this run whose last attempt failed.
+
+        Returns:
+            list: (url, status, attempts, error) tuples.
+        """
+        placeholders = ', '.join('?' for _ in FAILED_STATUSES)
+        return self.conn.execute(
+            f"SELECT url, status, attempts, error FROM pages WHERE run_id = ? AND status IN ({placeholders}) "
+            "ORDER BY url", (self.run_id, *FAILED_STATUSES)).fetchall()
+
+    def status_counts(self):
+        return dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM pages WHERE run_id = ? GROUP BY status", (self.run_id,)))
+
+    def finish(self):
+        """
+        Mark the run complete; the next run into the target starts from scratch.
+        """
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET status = 'complete', finished_at = ? WHERE run_id = ?", (now(), self.run_id))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+# ---------------------------------------------------------- #
+# Scrape run instrumentation
+# ---------------------------------------------------------- #
+# Stage timers and counters collected during one run of step_1, written as a
+# JSON run report and, optionally, in Prometheus text format (e.g. for the
+# node_exporter textfile collector). Safe to use from the fetch worker threads.
+METRICS_PREFIX = 'scraper'
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+
+def stage_timer(metrics, stage):
+    """
+    metrics.timer(stage), or a no-op context if metrics is None.
+    """
+    return metrics.timer(stage) if metrics is not None else nullcontext()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class RunMetrics:
+    """
+    Timers (one duration sample per timed block), counters and run metadata of one scrape run.
+    """
+
+    def __init__(self, labels=None):
+        """
+        Args:
+            labels (dict): Run settings recorded with the report (backend, mode, pipeline, ...).
+        """
+        self.labels = dict(labels or {})
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.durations = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        Time a block as one sample of a stage; the sample is kept even if the block raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def increment(self, counter, value=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def report(self):
+        """
+        Machine-readable summary of the run so far.
+
+        Returns:
+            dict: Run metadata, per-stage timing statistics and counters.
+        """
+        with self.lock:
+            durations = {stage: sorted(samples) for stage, samples in self.durations.items()}
+            counters = dict(self.counters)
+
+        stages = {}
+        for stage, samples in durations.items():
+            total = sum(samples)
+            stages[stage] = {
+                'count': len(samples),
+                'total_seconds': round(total, 6),
+                'mean_seconds': round(total / len(samples), 6),
+                'min_seconds': round(samples[0], 6),
+                'p50_seconds': round(percentile(samples, 0.5), 6),
+                'p95_seconds': round(percentile(samples, 0.95), 6),
+                'max_seconds': round(samples[-1], 6),
+            }
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration_seconds': round(time.perf_counter() - self.start, 6),
+            'labels': self.labels,
+            'stages': stages,
+            'counters': counters,
+        }
+
+    def prometheus_text(self):
+        """
+        The run's metrics in Prometheus text exposition format.
+        """
+        with self.lock:
+            durations = {stage: list(samples) for stage, samples in self.durations.items()}
+            counters = dict(self.counters)
+
+        name = f"{METRICS_PREFIX}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each scrape pipeline stage.",
+            f"# TYPE {name} histogram",
+        ]
+        for stage in sorted(durations):
+            samples = durations[stage]
+            for bound in DURATION_BUCKETS:
+                count = sum(1 for sample in samples if sample <= bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {len(samples)}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {sum(samples):.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {len(samples)}')
+
+        for counter in sorted(counters):
+            counter_name = f"{METRICS_PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {counter_name} counter")
+            lines.append(f"{counter_name} {counters[counter]}")
+
+        run_name = f"{METRICS_PREFIX}_run_duration_seconds"
+        lines.append(f"# TYPE {run_name} gauge")
+        lines.append(f"{run_name} {time.perf_counter() - self.start:.6f}")
+        return '\n'.join(lines) + '\n'
+
+    def write_reports(self, json_path=None, prometheus_path=None):
+        """
+        Write the JSON run report and/or the Prometheus text file (each None skips it).
+        """
+        for path, content in (
+            (json_path, lambda: json.dumps(self.report(), indent=2) + '\n'),
+            (prometheus_path, self.prometheus_text),
+        ):
+            if not path:
+                continue
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            # Written next to the target and renamed, so collectors never read half a file
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(content())
+            os.replace(tmp_path, path)
+            print(f"Saved: {path}")
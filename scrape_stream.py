@@ -0,0 +1,256 @@
+import sqlite3
+
+import pandas as pd
+
+from db_loader import ensure_schema, refresh_read_model, refresh_rollups, READ_MODEL_TABLE
+from key_registry import load_registry, save_registry
+from scraper_parse import ROW_FIELDS
+
+# ---------------------------------------------------------- #
+# Streaming scrape-to-database writer
+# ---------------------------------------------------------- #
+# Lookup table -> (id column, natural key columns)
+LOOKUP_TABLES = {
+    'stat_titles': ('stat_title_id', ['stat_title']),
+    'statistics': ('statistic_id', ['statistic', 'stat_title_id']),
+    'teams': ('team_id', ['team_name']),
+    'players': ('player_id', ['player_name', 'team_id']),
+    'years': ('year_id', ['year']),
+    'leagues': ('league_id', ['league']),
+}
+
+FACT_TABLE = 'last_5_ys_yearly_stats'
+
+
+def to_float(value):
+    # '--' (no result yet) and empty cells become NULL
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class StatsDbWriter:
+    """
+    Write scraped rows straight into the SQLite database, page by page.
+
+    Foreign keys are resolved on the fly from in-memory dicts seeded with the
+    ids in the key registry and in the database: known names keep their id,
+    new names are inserted with the next id no database or registry has used.
+    The registry is shared by the live and the history database, so its ids
+    win; a database id that disagrees with it raises ValueError. Pages are
+    committed in batches of about batch_size fact rows, so a run never holds
+    more than one batch in memory.
+
+    With incremental_refresh, yearly_stats_wide and the rollups follow every
+    page. Without it they are left alone and the caller rebuilds them once,
+    e.g. db_loader.swap_in_database() on a shadow copy of the live database.
+    """
+
+    def __init__(self, db_path, schema_path=None, batch_size=1000, registry_path=None, incremental_refresh=True):
+        self.conn = sqlite3.connect(db_path)
+        if schema_path:
+            with open(schema_path, 'r') as f:
+                ensure_schema(self.conn, f.read())
+
+        self.incremental_refresh = incremental_refresh
+        self.batch_size = batch_size
+        self.pending_rows = 0
+        self.rows_written = 0
+
+        # table -> {natural key tuple: id}, table -> keys present in the database, table -> next free id
+        self.ids = {table: {} for table in LOOKUP_TABLES}
+        self.in_db = {}
+        self.next_id = {}
+
+        # Registry ids first, then the database's ids, which must agree with them
+        self.registry_path = registry_path
+        registry = load_registry(registry_path) if registry_path else {}
+        self.seed_from_registry(registry)
+        for table, (id_col, key_cols) in LOOKUP_TABLES.items():
+            query = f"SELECT {id_col}, {', '.join(key_cols)} FROM {table}"
+            db_ids = {tuple(key): row_id for row_id, *key in self.conn.execute(query)}
+            self.add_db_ids(table, db_ids)
+            self.in_db[table] = set(db_ids)
+
+        for table, (id_col, _) in LOOKUP_TABLES.items():
+            # Ids the registry gave out are never reused, even for keys it could not translate
+            registered = registry[table][id_col] if registry else []
+            self.next_id[table] = max(max(self.ids[table].values(), default=-1),
+                                      max(registered, default=-1)) + 1
+
+    def seed_from_registry(self, registry):
+        """
+        Add registry ids (natural text keys) to the id dicts, translated to the database's key columns.
+        """
+        if not registry:
+            return
+
+        def add(table, key, row_id):
+            self.ids[table][key] = int(row_id)
+
+        for row in registry['stat_titles'].itertuples(index=False):
+            add('stat_titles', (row.stat_title,), row.stat_title_id)
+        for row in registry['teams'].itertuples(index=False):
+            add('teams', (row.team_name,), row.team_id)
+        for row in registry['years'].itertuples(index=False):
+            add('years', (int(row.year),), row.year_id)
+        for row in registry['leagues'].itertuples(index=False):
+            add('leagues', (row.league,), row.league_id)
+
+        stat_title_ids = {key[0]: row_id for key, row_id in self.ids['stat_titles'].items()}
+        for row in registry['statistics'].itertuples(index=False):
+            if row.stat_title in stat_title_ids:
+                add('statistics', (row.statistic, stat_title_ids[row.stat_title]), row.statistic_id)
+
+        team_ids = {key[0]: row_id for key, row_id in self.ids['teams'].items()}
+        for row in registry['players'].itertuples(index=False):
+            if row.team_name in team_ids:
+                add('players', (row.player_name, team_ids[row.team_name]), row.player_id)
+
+    def add_db_ids(self, table, db_ids):
+        """
+        Add the ids already in the database to the id dicts.
+
+        Raises:
+            ValueError: If the database and the key registry give a key different ids,
+                or give one id to different keys.
+        """
+        known_ids = self.ids[table]
+        keys_by_id = {row_id: key for key, row_id in known_ids.items()}
+        for key, row_id in db_ids.items():
+            registered_id = known_ids.get(key, row_id)
+            registered_key = keys_by_id.get(row_id, key)
+            if registered_id != row_id or registered_key != key:
+                raise ValueError(
+                    f"{table}: {key} has id {row_id} in the database, which conflicts with the key registry "
+                    f"({key} -> {known_ids.get(key)}, {row_id} -> {keys_by_id.get(row_id)})")
+            known_ids[key] = row_id
+            keys_by_id[row_id] = key
+
+    def registry_lookups(self):
+        """
+        The id dicts as registry lookups (natural text keys), see key_registry.save_registry().
+        """
+        stat_titles = {row_id: key[0] for key, row_id in self.ids['stat_titles'].items()}
+        teams = {row_id: key[0] for key, row_id in self.ids['teams'].items()}
+
+        def lookup(columns, rows):
+            return pd.DataFrame(list(rows), columns=columns)
+
+        return {
+            'stat_titles': lookup(['stat_title_id', 'stat_title'],
+                ((row_id, title) for row_id, title in stat_titles.items())),
+            'teams': lookup(['team_id', 'team_name'],
+                ((row_id, name) for row_id, name in teams.items())),
+            'years': lookup(['year_id', 'year'],
+                ((row_id, str(key[0])) for key, row_id in self.ids['years'].items())),
+            'leagues': lookup(['league_id', 'league'],
+                ((row_id, key[0]) for key, row_id in self.ids['leagues'].items())),
+            'statistics': lookup(['statistic_id', 'statistic', 'stat_title'],
+                ((row_id, key[0], stat_titles.get(key[1])) for key, row_id in self.ids['statistics'].items())),
+            'players': lookup(['player_id', 'player_name', 'team_name'],
+                ((row_id, key[0], teams.get(key[1])) for key, row_id in self.ids['players'].items())),
+        }
+
+    def resolve_id(self, table, *key):
+        """
+        Return the id of a natural key in a lookup table, inserting it if it is new.
+        """
+        known_ids = self.ids[table]
+        if key not in self.in_db[table]:
+            # Registry ids are reused, brand new keys get the next free id
+            if key not in known_ids:
+                known_ids[key] = self.next_id[table]
+                self.next_id[table] += 1
+
+            id_col, key_cols = LOOKUP_TABLES[table]
+            placeholders = ', '.join('?' for _ in range(len(key_cols) + 1))
+            self.conn.execute(
+                f"INSERT INTO {table} ({id_col}, {', '.join(key_cols)}) VALUES ({placeholders})",
+                (known_ids[key], *key))
+            self.in_db[table].add(key)
+        return known_ids[key]
+
+    def write_page(self, year, league, rows):
+        """
+        Replace one (year, league) page's facts with freshly scraped rows.
+
+        Args:
+            year (int): Season of the page.
+            league (str): League of the page.
+            rows (iterable): Dicts yielded by scraper_parse.iter_page_stats().
+
+        Returns:
+            int: Number of fact rows written.
+        """
+        year_id = self.resolve_id('years', int(year))
+        league_id = self.resolve_id('leagues', league.strip())
+        # Players on the page before the rescrape; their counts change too
+        player_ids = {
+            player_id for (player_id,) in self.conn.execute(
+                f"SELECT DISTINCT player_id FROM {FACT_TABLE} WHERE year_id = ? AND league_id = ?",
+                (year_id, league_id))
+        }
+        self.conn.execute(
+            f"DELETE FROM {FACT_TABLE} WHERE year_id = ? AND league_id = ?",
+            (year_id, league_id))
+
+        facts = []
+        for row in rows:
+            statistic, player_name, team_name, no, top_25 = [str(row[field]).strip() for field in ROW_FIELDS]
+
+            stat_title_id = self.resolve_id('stat_titles', str(row['stat_title']).strip())
+            statistic_id = self.resolve_id('statistics', statistic, stat_title_id)
+            team_id = self.resolve_id('teams', team_name)
+            player_id = self.resolve_id('players', player_name, team_id)
+
+            facts.append((to_float(no), top_25, statistic_id, player_id, year_id, league_id))
+            player_ids.add(player_id)
+
+        self.conn.executemany(
+            f"INSERT INTO {FACT_TABLE} (no, top_25, statistic_id, player_id, year_id, league_id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            facts)
+        if self.incremental_refresh:
+            # Keep the denormalized read model and its rollups in step with this page
+            refresh_read_model(self.conn, year_id, league_id)
+            refresh_rollups(self.conn, player_ids)
+
+        self.rows_written += len(facts)
+        self.pending_rows += len(facts)
+        if self.pending_rows >= self.batch_size:
+            self.commit()
+        return len(facts)
+
+    def prune_years(self, keep_years):
+        """
+        Delete facts of seasons that fell out of the scraped window.
+        """
+        keep_ids = [year_id for (year,), year_id in self.ids['years'].items() if int(year) in keep_years]
+        placeholders = ', '.join('?' for _ in keep_ids) or 'NULL'
+        for table in (FACT_TABLE, READ_MODEL_TABLE):
+            self.conn.execute(f"DELETE FROM {table} WHERE year_id NOT IN ({placeholders})", keep_ids)
+        if self.incremental_refresh:
+            refresh_rollups(self.conn)
+
+    def commit(self):
+        self.conn.commit()
+        self.pending_rows = 0
+
+    def checkpoint(self):
+        """
+        Commit and record the ids given out so far in the key registry, so an
+        interrupted run never leaves committed ids the registry does not know.
+        """
+        self.commit()
+        if self.registry_path:
+            save_registry(self.registry_lookups(), self.registry_path)
+
+    def close(self):
+        self.commit()
+        # Refresh query planner statistics for the indexes if the data changed a lot
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
+        if self.registry_path:
+            save_registry(self.registry_lookups(), self.registry_path)
@@ -0,0 +1,283 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scrape_metrics import stage_timer
+
+# ---------------------------------------------------------- #
+# HTTP fetch backend for the scraper
+# ---------------------------------------------------------- #
+# baseball-almanac.com serves static tables, so a plain pooled
+# HTTP session returns the same html a headless browser would.
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) ctd-python-101-capstone-project scraper",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(pool_size=10, retries=3, backoff_factor=0.5):
+    """
+    Create a pooled requests.Session with keep-alive, gzip and retry/backoff.
+
+    Args:
+        pool_size (int): Number of connections kept open per host.
+        retries (int): How many times a failed request is retried.
+        backoff_factor (float): Base delay (seconds) for exponential backoff between retries.
+
+    Returns:
+        requests.Session: Session ready to be shared by all page fetches.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# ---------------------------------------------------------- #
+# On-disk response cache
+# ---------------------------------------------------------- #
+# <cache_dir>/index/<sha256 of url>.json   -> url, ETag, Last-Modified, content hash
+# <cache_dir>/blobs/<sha256 of body>.html  -> raw html, shared by identical pages
+class CacheMissError(requests.RequestException):
+    """Raised in offline mode when a page is not in the cache."""
+
+
+def url_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def write_file_atomic(path, data):
+    # Write to a temp file and rename, so parallel workers never see half a file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def cache_read(cache_dir, url):
+    """
+    Look up a cached page.
+
+    Args:
+        cache_dir (str): Cache directory.
+        url (str): Page url.
+
+    Returns:
+        tuple: (metadata dict, raw html bytes), or (None, None) if the page is not cached.
+    """
+    index_path = Path(cache_dir) / "index" / f"{url_key(url)}.json"
+    try:
+        meta = json.loads(index_path.read_text(encoding="utf-8"))
+        body = (Path(cache_dir) / "blobs" / f"{meta['content_sha256']}.html").read_bytes()
+    except (OSError, ValueError, KeyError):
+        return None, None
+    return meta, body
+
+
+def cache_write(cache_dir, url, body, headers):
+    """
+    Store a downloaded page with its ETag/Last-Modified validators.
+
+    Args:
+        cache_dir (str): Cache directory.
+        url (str): Page url.
+        body (bytes): Raw html.
+        headers (Mapping): Response headers.
+
+    Returns:
+        dict: The metadata written to the index.
+    """
+    content_sha256 = hashlib.sha256(body).hexdigest()
+    blob_path = Path(cache_dir) / "blobs" / f"{content_sha256}.html"
+    if not blob_path.exists():
+        write_file_atomic(blob_path, body)
+
+    meta = {
+        "url": url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "content_sha256": content_sha256,
+        "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    index_path = Path(cache_dir) / "index" / f"{url_key(url)}.json"
+    write_file_atomic(index_path, json.dumps(meta, indent=2).encode("utf-8"))
+    return meta
+
+
+def fetch_page(session, url, timeout=10, cache_dir=None, revalidate=True, offline=False):
+    """
+    Download one page and return its raw body, going through the disk cache if one is given.
+
+    Args:
+        session (requests.Session): Session created by create_session().
+        url (str): Page url.
+        timeout (float): Connect/read timeout in seconds.
+        cache_dir (str): Cache directory. None disables caching.
+        revalidate (bool): If False, a cached copy is returned without any request
+            (completed seasons never change). If True, the cached copy is revalidated
+            with If-None-Match / If-Modified-Since.
+        offline (bool): Never touch the network; serve from cache_dir only.
+
+    Returns:
+        bytes: Raw (already decompressed) html. BeautifulSoup detects the
+        encoding from the <meta charset> itself.
+
+    Raises:
+        requests.RequestException: If the page can not be fetched after retries,
+        or CacheMissError if it is missing from the cache in offline mode.
+    """
+    meta, cached_body = (None, None)
+    if cache_dir:
+        meta, cached_body = cache_read(cache_dir, url)
+        if cached_body is not None and (offline or not revalidate):
+            return cached_body
+
+    if offline:
+        raise CacheMissError(f"{url} is not in cache {cache_dir}")
+
+    conditional_headers = {}
+    if cached_body is not None:
+        if meta.get("etag"):
+            conditional_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = session.get(url, timeout=timeout, headers=conditional_headers)
+    if response.status_code == 304 and cached_body is not None:
+        return cached_body
+
+    response.raise_for_status()
+    if cache_dir:
+        cache_write(cache_dir, url, response.content, response.headers)
+    return response.content
+
+
+# ---------------------------------------------------------- #
+# Concurrent fetching with a bounded worker pool
+# ---------------------------------------------------------- #
+class HostRateLimiter:
+    """
+    Spread requests to the same host at least 1 / requests_per_second apart.
+
+    Shared by all worker threads; each call to wait() reserves the next free
+    slot for the url's host and sleeps until that slot is reached.
+    """
+
+    def __init__(self, requests_per_second=None):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_slot = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.min_interval:
+            return
+
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot[host])
+            self.next_slot[host] = slot + self.min_interval
+
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def iter_fetch_pages(session, urls, max_workers=4, requests_per_second=None, revalidate_urls=None, metrics=None,
+                     **fetch_kwargs):
+    """
+    Download many pages in parallel and yield them as soon as they are ready, in the order of the input urls.
+
+    Args:
+        session (requests.Session): Session created by create_session().
+        urls (list): Page urls.
+        max_workers (int): Maximum number of pages downloaded at the same time.
+        requests_per_second (float): Per-host rate limit. None disables it.
+        revalidate_urls (set): Urls whose cached copy must be revalidated.
+            None revalidates every url. Only used together with cache_dir.
+        metrics (scrape_metrics.RunMetrics): Records rate limit waits, fetch times,
+            cache hits, failures and html bytes. None disables it.
+        **fetch_kwargs: Passed through to fetch_page().
+
+    Yields:
+        bytes: Raw html per url, in the same order as urls.
+        A page that failed after retries is yielded as None.
+    """
+    limiter = HostRateLimiter(requests_per_second)
+
+    def fetch_one(url):
+        revalidate = revalidate_urls is None or url in revalidate_urls
+        try:
+            # Pages served straight from the cache do not need a rate limit slot
+            cache_only = fetch_kwargs.get("cache_dir") and (fetch_kwargs.get("offline") or not revalidate)
+            cache_hit = bool(cache_only and cache_read(fetch_kwargs["cache_dir"], url)[1] is not None)
+            if not cache_hit:
+                with stage_timer(metrics, "rate_limit_wait"):
+                    limiter.wait(url)
+            with stage_timer(metrics, "fetch"):
+                body = fetch_page(session, url, revalidate=revalidate, **fetch_kwargs)
+        except requests.RequestException as e:
+            print(f"\n ERROR in: fetch_pages: {url}")
+            print(f"{e}")
+            if metrics is not None:
+                metrics.increment("pages_fetch_failed")
+            return None
+
+        if metrics is not None:
+            metrics.increment("pages_from_cache" if cache_hit else "pages_requested")
+            metrics.increment("html_bytes", len(body))
+        return body
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        # executor.map yields results in input order, whatever order they finish in
+        yield from executor.map(fetch_one, urls)
+
+
+def fetch_pages(session, urls, max_workers=4, requests_per_second=None, revalidate_urls=None, **fetch_kwargs):
+    """
+    Download many pages in parallel, keeping the order of the input urls.
+
+    Same arguments as iter_fetch_pages().
+
+    Returns:
+        list: Raw html (bytes) per url, in the same order as urls.
+        A page that failed after retries is returned as None.
+    """
+    return list(iter_fetch_pages(
+        session,
+        urls,
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        revalidate_urls=revalidate_urls,
+        **fetch_kwargs))
@@ -0,0 +1,202 @@
+import re
+from urllib.parse import urljoin
+
+import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+# ---------------------------------------------------------- #
+# HTML parsing engine for the scraper
+# ---------------------------------------------------------- #
+# Use lxml when it is installed (several times faster), html.parser otherwise
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Every table we read (year menu and yearly leaders) is a table.boxed,
+# so the rest of the page is never turned into tags
+BOXED_TABLES = SoupStrainer('table', class_='boxed')
+
+YEAR_RE = re.compile(r"^(\d{4})")
+LEAGUE_RE = re.compile(r"^\d{4}\s+(\w+\s+\w+)")
+STAT_TITLE_RE = re.compile(r".*\d{4}\s+(\w+\s+\w+)")
+
+# Data cells of a stats table row, by position (banners: Statistic, Name(s), Team(s), #, Top 25).
+# Rows are keyed by these rather than by banner text, which may repeat or be empty
+ROW_FIELDS = ['statistic', 'player_name', 'team_name', 'no', 'top_25']
+
+
+def parse_html(html, parser=None):
+    """
+    Parse only the table.boxed elements of a page.
+
+    Args:
+        html (str | bytes): Page html.
+        parser (str): BeautifulSoup parser name. Defaults to HTML_PARSER.
+
+    Returns:
+        BeautifulSoup: Soup holding the boxed tables only.
+    """
+    return BeautifulSoup(html, parser or HTML_PARSER, parse_only=BOXED_TABLES)
+
+
+# Create stat list
+# - tr: td.header: h2: year -> column (name + data)
+# - tr: td.header: h2: league -> column (name + data)
+# - tr: td.header: p: stats title/type -> column (name + data)
+# - tr: td.banner: column names -> column names / first row
+# - tr: td.datacolBlue + tr.datacolBox: row name (td.datacolBlue) + data (datacolBox) -> rows
+def iter_stats_table(table):
+    """
+    Yield the data rows of one yearly stats table, one dict per row.
+
+    Args:
+        table (bs4.Tag): A table.boxed from a year page.
+
+    Yields:
+        dict: ROW_FIELDS -> cell text for each data row, plus 'year', 'league' and 'stat_title'
+        taken from the table header.
+    """
+    # Declare all necessary lists and variables
+    first_row = []
+    y_stat_year = None
+    y_stat_league = None
+    y_stat_title = None
+
+    # Scrape a table
+    # Find all table rows and iterate through them
+    for tr in table.find_all('tr'):
+        header = None
+        banners = []
+        row_name = None
+        row_data = []
+
+        # Walk the row's cells once and sort them by class
+        for td in tr.find_all('td'):
+            if row_name is not None:
+                # Everything after td.datacolBlue is row data
+                row_data.append(td.get_text(strip=True))
+                continue
+
+            classes = td.get('class') or ()
+            if 'datacolBlue' in classes:
+                row_name = td.text.strip()
+            elif 'header' in classes:
+                if header is None:
+                    header = td
+            elif 'banner' in classes:
+                banners.append(td)
+
+        # Step 1: Header info (only once)
+        if header is not None and not y_stat_year:
+            # Get year and league name
+            h2 = header.find('h2')
+            if h2:
+                h2_text = h2.get_text(strip=True)
+                year_match = YEAR_RE.search(h2_text)
+                league_match = LEAGUE_RE.search(h2_text)
+                if year_match:
+                    y_stat_year = year_match.group(1)
+                if league_match:
+                    y_stat_league = league_match.group(1)
+
+            # Get statistic name
+            p = header.find('p')
+            if p:
+                stat_match = STAT_TITLE_RE.search(p.get_text(strip=True))
+                if stat_match:
+                    y_stat_title = stat_match.group(1)
+
+        # Step 2: Banners — first row
+        if not first_row and banners:
+            first_row = [banner.get_text(strip=True) for banner in banners]
+
+        # Step 3: Data rows
+        if row_name is not None:
+            full_row = [row_name] + row_data
+
+            # Only yield if it matches banner length
+            if len(full_row) == len(first_row):
+                row = dict(zip(ROW_FIELDS, full_row))
+                row['year'] = y_stat_year
+                row['league'] = y_stat_league
+                row['stat_title'] = y_stat_title
+                yield row
+
+
+def scrape_stats_table(table):
+    """
+    Scrape one yearly stats table into a DataFrame (ROW_FIELDS + year, league, stat_title).
+    """
+    rows = list(iter_stats_table(table))
+
+    # Assemble DataFrame
+    columns = ROW_FIELDS + ['year', 'league', 'stat_title']
+    if rows:
+        df = pd.DataFrame(rows, columns=columns)
+    else:
+        df = pd.DataFrame(columns=columns)
+
+    return df
+
+
+def iter_page_stats(soup):
+    """
+    Yield the data rows of a year page's hitting and pitching tables (see iter_stats_table()).
+    """
+    # Only 2 tables: hitting stats and pitching stats
+    for table in soup.find_all('table', class_='boxed')[:2]:
+        yield from iter_stats_table(table)
+
+
+# Derive year links from year table - function
+def link_list(header, base_url):
+    """
+    Collect the year page links listed under one league header of yearmenu.shtml.
+
+    Args:
+        header (bs4.Tag): td.header of a league in the year menu table.
+        base_url (str): Site root the relative links are joined with.
+
+    Returns:
+        list: {'year_href', 'year', 'league_name'} dicts, or None if the menu could not be read.
+    """
+    try:
+        # Find parent of t_headers
+        header_tr = header.find_parent('tr')
+
+        # Loop over following siblings to find the one that have table.ba_sub
+        for sibling in header_tr.find_next_siblings('tr'):
+            td = sibling.find('td', class_='datacolBox')
+            if td and td.find('table', class_='ba-sub'):
+                sub_table = td.find('table', class_='ba-sub')
+                break
+
+        # Declare link_list
+        year_link_list = []
+
+        # Loop through the subtable and pull all years and links
+        year_links = sub_table.find_all('a')
+        for year_link in year_links:
+            year_href = urljoin(base_url, year_link['href'])
+            year_text = year_link.text
+            if len(year_href) >= 7: # char right before '.shtml'
+                if year_href[-7] == "a":
+                    league_name = "American League"
+                elif year_href[-7] == "n":
+                    league_name = "National League"
+                else:
+                    continue
+            # Append dicts to year_link_list
+            year_link_list.append({
+                'year_href': year_href,
+                'year': year_text,
+                'league_name':league_name
+            })
+
+        return year_link_list
+
+    except Exception as e:
+        print(f"\n ERROR in: Derive year links function")
+        print(f"{e}")
@@ -0,0 +1,317 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from sqlalchemy import text
+
+from columnar_engine import get_columnar_stats
+from db_connection import db_version
+
+# ---------------------------------------------------------- #
+# Shared data access for the CLI (step_3) and the dashboard (step_4)
+# ---------------------------------------------------------- #
+# 'sql' reads SQLite; 'memory' answers the queries ColumnarStats implements from
+# NumPy arrays (the CLI-only listings always read SQLite)
+QUERY_ENGINE = os.environ.get('QUERY_ENGINE', 'sql').lower()
+
+# Results are cached per database file, file version, query and parameters;
+# an import that swaps in a new file makes every old entry unreachable. Least
+# recently used results are dropped beyond QUERY_CACHE_ENTRIES results or
+# QUERY_CACHE_MB megabytes of DataFrames
+QUERY_CACHE_ENTRIES = int(os.environ.get('QUERY_CACHE_ENTRIES', 512))
+QUERY_CACHE_MB = float(os.environ.get('QUERY_CACHE_MB', 128))
+
+# Threads for the independent reads of one dashboard page (see submit())
+QUERY_WORKERS = int(os.environ.get('QUERY_WORKERS', 4))
+
+# Columns the one-year listing can be sorted by
+SORT_COLUMNS = ['no', 'player_name', 'team_name', 'statistic']
+
+STATISTICS_BY_TITLE_SQL = """
+    SELECT s.statistic
+    FROM statistics AS s
+    JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
+    WHERE st.stat_title = :stat_title
+    ORDER BY s.statistic
+"""
+
+STATS_BY_LEAGUE_YEAR_TITLE_SQL = """
+    SELECT
+        statistic AS "Statistic",
+        no AS "Results",
+        player_name AS "Player Name",
+        team_name AS "Team Name"
+    FROM yearly_stats_wide
+    WHERE league = :league AND year = :year AND stat_title = :stat_title
+    ORDER BY {sort_column} {sort_order}
+"""
+
+STATISTIC_RESULTS_SQL = """
+    SELECT
+        statistic AS "Statistic",
+        no AS "Results",
+        player_name AS "Player Name",
+        team_name AS "Team Name",
+        year AS "Year"
+    FROM yearly_stats_wide
+    WHERE league = :league AND stat_title = :stat_title AND statistic = :statistic
+"""
+
+STATISTIC_RANKING_SQL = """
+    SELECT
+        player_name AS "Player Name",
+        team_name AS "Team Name",
+        no AS "Results",
+        statistic AS "Statistic",
+        year AS "Year"
+    FROM yearly_stats_wide
+    WHERE league = :league AND stat_title = :stat_title AND statistic = :statistic
+    ORDER BY no DESC, player_name, year
+"""
+
+LEAGUE_COMPARISON_SQL = """
+    SELECT
+        league AS "League",
+        year AS "Year",
+        no AS "Results"
+    FROM yearly_stats_wide
+    WHERE stat_title = :stat_title AND statistic = :statistic
+"""
+
+TOP_25_PLAYERS_SQL = """
+    SELECT
+        league AS "League",
+        team_name AS "Team Name",
+        player_name AS "Player Name"
+    FROM yearly_stats_wide
+    GROUP BY team_name, player_name
+    ORDER BY team_name, player_name DESC
+"""
+
+PLAYERS_PER_TEAM_SQL = """
+    SELECT
+        league AS "League",
+        team_name AS "Team Name",
+        top_25_players AS "Number of Top 25 Players"
+    FROM team_top25_counts
+    ORDER BY "Number of Top 25 Players" DESC
+"""
+
+MAX_PLAYER_APPEARANCES_SQL = "SELECT MAX(appearances) AS max_count FROM player_top25_counts"
+
+PLAYER_APPEARANCES_SQL = """
+    SELECT
+        team_name AS "Team Name",
+        player_name AS "Player Name",
+        appearances AS "Count"
+    FROM player_top25_counts
+    WHERE appearances >= :min_count
+    ORDER BY team_name, player_name
+"""
+
+# (db_path, version, query, params) -> (DataFrame, size in bytes), least recently used first
+query_cache = OrderedDict()
+query_cache_lock = threading.Lock()
+query_cache_bytes = 0
+
+
+def read_query(engine, query, params=None):
+    """
+    Run a parameterized query through the result cache.
+
+    Args:
+        engine (sqlalchemy.Engine): Engine from db_connection.get_engine().
+        query (str): SQL with :name parameters.
+        params (dict): Parameter values.
+
+    Returns:
+        pd.DataFrame: Query result (a copy the caller may modify).
+    """
+    global query_cache_bytes
+
+    params = params or {}
+    db_path = engine.url.database
+    key = (db_path, db_version(db_path), query, tuple(sorted(params.items())))
+
+    with query_cache_lock:
+        if key in query_cache:
+            query_cache.move_to_end(key)
+            return query_cache[key][0].copy()
+
+    df = pd.read_sql(text(query), engine, params=params)
+    size = int(df.memory_usage(index=True, deep=True).sum())
+    budget = QUERY_CACHE_MB * 1024 * 1024
+    if size > budget:
+        return df
+
+    with query_cache_lock:
+        if key in query_cache:
+            query_cache_bytes -= query_cache.pop(key)[1]
+        query_cache[key] = (df, size)
+        query_cache_bytes += size
+        while len(query_cache) > QUERY_CACHE_ENTRIES or query_cache_bytes > budget:
+            query_cache_bytes -= query_cache.popitem(last=False)[1][1]
+    return df.copy()
+
+
+def clear_query_cache():
+    global query_cache_bytes
+
+    with query_cache_lock:
+        query_cache.clear()
+        query_cache_bytes = 0
+
+
+# Shared by every session; pages hand their independent reads to it and render as results arrive
+query_executor = ThreadPoolExecutor(max_workers=max(QUERY_WORKERS, 1), thread_name_prefix='stats_queries')
+
+
+def submit(fn, *args, **kwargs):
+    """
+    Run a query function (or a function built on them) in the shared worker pool.
+
+    Each running query checks out its own pooled SQLite connection from the engine,
+    so the reads of one page do not wait for each other.
+
+    Returns:
+        concurrent.futures.Future: Future of fn(*args, **kwargs).
+    """
+    return query_executor.submit(fn, *args, **kwargs)
+
+
+def columnar_stats(engine):
+    # ColumnarStats of the engine's database file in 'memory' mode, else None
+    return get_columnar_stats(engine.url.database) if QUERY_ENGINE == 'memory' else None
+
+
+# ---------------------------------------------------------- #
+# Queries
+# ---------------------------------------------------------- #
+def distinct_values(engine, table, column, order_by=None):
+    """
+    Sorted distinct values of a lookup table column, as strings.
+    """
+    stats = columnar_stats(engine)
+    if stats is not None:
+        return [str(value) for value in stats.distinct_values(column)]
+    df = read_query(engine, f"SELECT DISTINCT {column} FROM {table} ORDER BY {order_by or column}")
+    return df[column].astype(str).tolist()
+
+
+def statistics_by_title(engine, stat_title):
+    """
+    Names of the statistics of one statistic group, sorted.
+    """
+    stats = columnar_stats(engine)
+    if stats is not None:
+        return [str(value) for value in stats.statistics_by_title(stat_title)]
+    df = read_query(engine, STATISTICS_BY_TITLE_SQL, {'stat_title': stat_title})
+    return df['statistic'].astype(str).tolist()
+
+
+def stats_by_league_year_title(engine, league, year, stat_title, sort_column='statistic', sort_order='desc'):
+    """
+    All results of one statistic group in one league and season.
+
+    Args:
+        engine (sqlalchemy.Engine): Database engine.
+        league (str): League name.
+        year (int): Season.
+        stat_title (str): Statistic group.
+        sort_column (str): One of SORT_COLUMNS.
+        sort_order (str): 'asc' or 'desc'.
+
+    Returns:
+        pd.DataFrame: Statistic, Results, Player Name, Team Name.
+
+    Raises:
+        ValueError: On an unknown sort column or order.
+    """
+    if sort_column not in SORT_COLUMNS or sort_order.lower() not in ('asc', 'desc'):
+        raise ValueError(f"Cannot sort by {sort_column} {sort_order}")
+    query = STATS_BY_LEAGUE_YEAR_TITLE_SQL.format(sort_column=sort_column, sort_order=sort_order.upper())
+    return read_query(engine, query, {'league': league, 'year': int(year), 'stat_title': stat_title})
+
+
+def statistic_results(engine, league, stat_title, statistic):
+    """
+    One statistic's results in one league over all seasons.
+
+    Returns:
+        pd.DataFrame: Statistic, Results, Player Name, Team Name, Year.
+    """
+    stats = columnar_stats(engine)
+    if stats is not None:
+        return stats.yearly_results(league, stat_title, statistic)
+    return read_query(engine, STATISTIC_RESULTS_SQL,
+                      {'league': league, 'stat_title': stat_title, 'statistic': statistic})
+
+
+def statistic_ranking(engine, league, stat_title, statistic):
+    """
+    One statistic's results in one league over all seasons, best first.
+
+    Returns:
+        pd.DataFrame: Player Name, Team Name, Results, Statistic, Year.
+    """
+    stats = columnar_stats(engine)
+    if stats is not None:
+        return stats.ranked_results(league, stat_title, statistic)
+    return read_query(engine, STATISTIC_RANKING_SQL,
+                      {'league': league, 'stat_title': stat_title, 'statistic': statistic})
+
+
+def league_comparison(engine, stat_title, statistic):
+    """
+    One statistic's results in both leagues over all seasons.
+
+    Returns:
+        pd.DataFrame: League, Year, Results.
+    """
+    stats = columnar_stats(engine)
+    if stats is not None:
+        return stats.league_results(stat_title, statistic)
+    return read_query(engine, LEAGUE_COMPARISON_SQL, {'stat_title': stat_title, 'statistic': statistic})
+
+
+def top_25_players(engine):
+    """
+    Every player with a top-25 result, per team.
+
+    Returns:
+        pd.DataFrame: League, Team Name, Player Name.
+    """
+    return read_query(engine, TOP_25_PLAYERS_SQL)
+
+
+def players_per_team(engine):
+    """
+    Number of distinct top-25 players per team, most first.
+
+    Returns:
+        pd.DataFrame: League, Team Name, Number of Top 25 Players.
+    """
+    return read_query(engine, PLAYERS_PER_TEAM_SQL)
+
+
+def max_player_appearances(engine):
+    stats = columnar_stats(engine)
+    if stats is not None:
+        return stats.max_appearances()
+    max_count = read_query(engine, MAX_PLAYER_APPEARANCES_SQL)['max_count'].iloc[0]
+    return 0 if pd.isna(max_count) else int(max_count)
+
+
+def player_appearances(engine, min_count=1):
+    """
+    Top-25 appearances per player, for players with at least min_count of them.
+
+    Returns:
+        pd.DataFrame: Team Name, Player Name, Count.
+    """
+    stats = columnar_stats(engine)
+    if stats is not None:
+        return stats.player_counts(min_count)
+    return read_query(engine, PLAYER_APPEARANCES_SQL, {'min_count': min_count})
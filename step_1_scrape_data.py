@@ -12,6 +12,7 @@ from selenium.common.exceptions import NoSuchElementException
 import re
 import csv
 import os
+import sys
 from bs4 import BeautifulSoup, NavigableString, Tag
 from urllib.parse import urljoin
 from urllib.parse import urlparse
@@ -20,75 +21,189 @@ from urllib.parse import urljoin
 from pathlib import Path
 import numpy as np
 import os
+from scraper_http import create_session, iter_fetch_pages
+from scraper_parse import parse_html, scrape_stats_table, iter_page_stats, link_list
+from scrape_stream import StatsDbWriter
+from db_loader import shadow_path, start_shadow_database, swap_in_database
+from normalization import normalize_stats
+from key_registry import KEY_REGISTRY_PATH, load_registry, save_registry, registry_from_tables
+from parquet_store import save_dfs_to_parquet, PARQUET_DIR
+from scrape_backfill import HISTORY_DB_PATH, parse_year_range, backfilled_pages, chunked
+from scrape_journal import ScrapeJournal, FETCHED, DONE, FETCH_FAILED, PARSE_FAILED
+from scrape_metrics import RunMetrics
+from scrape_incremental import read_existing_tables, denormalize_existing_tables, scraped_pages, select_links_to_scrape, merge_stats, STAT_COLUMNS
 
 # ---------------------------------------------------------- #
-# Driver settings
+# Fetch backend settings
 # ---------------------------------------------------------- #
-opt = webdriver.ChromeOptions()
-opt.add_argument("--headless=new")              # Chrome >= 118
-opt.add_argument("--disable-gpu")
-opt.add_argument("--blink-settings=imagesEnabled=false")
-opt.add_argument("--disable-plugins-discovery")
-opt.add_argument("--disable-extensions")
-opt.add_argument("--disable-javascript")        # if tables are static
-prefs = {
-    "profile.managed_default_content_settings.images": 2,
-    "profile.managed_default_content_settings.stylesheets": 1,  # keep CSS =1 or block =2
-    "profile.managed_default_content_settings.fonts": 2,
-    "profile.managed_default_content_settings.video": 2,
-}
-opt.add_experimental_option("prefs", prefs)
-
-driver = webdriver.Chrome(
-    service=ChromeService(ChromeDriverManager().install()),
-    options=opt
-)
-driver.set_page_load_timeout(10) # fail fast if site hangs
+# 'http'     - pooled requests.Session (default, tables are static html)
+# 'selenium' - headless Chrome, opt-in fallback (SCRAPER_BACKEND=selenium)
+FETCH_BACKEND = os.environ.get('SCRAPER_BACKEND', 'http').strip().lower()
+PAGE_TIMEOUT = 10 # fail fast if site hangs
+# http backend only: pages downloaded at the same time, and max requests per second to one host
+SCRAPER_CONCURRENCY = int(os.environ.get('SCRAPER_CONCURRENCY', 4))
+SCRAPER_RATE_LIMIT = float(os.environ.get('SCRAPER_RATE_LIMIT', 4)) or None
+# http backend only: on-disk page cache ('' disables it) and offline mode (serve from cache only)
+SCRAPER_CACHE_DIR = os.environ.get('SCRAPER_CACHE_DIR', 'cache') or None
+SCRAPER_OFFLINE = os.environ.get('SCRAPER_OFFLINE', '0') == '1'
+
+# 'full'        - scrape every page of the window and rebuild all tables
+# 'incremental' - scrape only pages missing from csv/ (or the db) plus the current season,
+#                 merge them into the existing rows (SCRAPER_MODE=incremental)
+# 'backfill'    - scrape the seasons of SCRAPER_YEARS into db/baseball_history.db in committed
+#                 chunks; a rerun skips the pages already loaded (SCRAPER_MODE=backfill)
+SCRAPER_MODE = os.environ.get('SCRAPER_MODE', 'full').strip().lower()
+# backfill mode only: seasons ('all', '1995', '1990-2000', '1990-') and pages per committed chunk
+SCRAPER_YEARS = os.environ.get('SCRAPER_YEARS', 'all')
+SCRAPER_CHUNK_SIZE = int(os.environ.get('SCRAPER_CHUNK_SIZE', 20))
+# 'csv'    - collect all pages, normalize in pandas and write csv/ for step_2_db_import.py
+# 'stream' - write each parsed page straight into db/baseball_stats.db (SCRAPER_PIPELINE=stream)
+SCRAPER_PIPELINE = os.environ.get('SCRAPER_PIPELINE', 'csv').strip().lower()
+CSV_DIR = 'csv'
+# csv pipeline only: also write the tables as a Parquet snapshot to parquet/ (SCRAPER_PARQUET=1)
+SCRAPER_PARQUET = os.environ.get('SCRAPER_PARQUET', '0') == '1'
+# csv pipeline only: write csv/ even if some pages failed (by default the previous csv/ is kept
+# and the next run retries only the failed pages)
+SCRAPER_ALLOW_PARTIAL = os.environ.get('SCRAPER_ALLOW_PARTIAL', '0') == '1'
+DB_PATH = os.path.join('db', 'baseball_stats.db')
+SCHEMA_PATH = os.path.join('db', 'schema.sql')
+# Run report: per-stage timings and counters as JSON ('' disables it), and optionally
+# the same metrics in Prometheus text format (e.g. for the node_exporter textfile collector)
+SCRAPER_METRICS_PATH = os.environ.get('SCRAPER_METRICS_PATH', os.path.join('db', 'scrape_metrics.json')) or None
+SCRAPER_PROMETHEUS_PATH = os.environ.get('SCRAPER_PROMETHEUS_PATH') or None
+
+session = None
+driver = None
+journal = None
+metrics = RunMetrics(labels={
+    'backend': FETCH_BACKEND,
+    'mode': SCRAPER_MODE,
+    'pipeline': SCRAPER_PIPELINE,
+    'concurrency': SCRAPER_CONCURRENCY,
+    'rate_limit': SCRAPER_RATE_LIMIT,
+    'offline': SCRAPER_OFFLINE,
+})
+# ---------------------------------------------------------- #
+
+# ---------------------------------------------------------- #
+# Driver settings (selenium backend only)
+# ---------------------------------------------------------- #
+def create_driver():
+    opt = webdriver.ChromeOptions()
+    opt.add_argument("--headless=new")              # Chrome >= 118
+    opt.add_argument("--disable-gpu")
+    opt.add_argument("--blink-settings=imagesEnabled=false")
+    opt.add_argument("--disable-plugins-discovery")
+    opt.add_argument("--disable-extensions")
+    opt.add_argument("--disable-javascript")        # if tables are static
+    prefs = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 1,  # keep CSS =1 or block =2
+        "profile.managed_default_content_settings.fonts": 2,
+        "profile.managed_default_content_settings.video": 2,
+    }
+    opt.add_experimental_option("prefs", prefs)
+
+    chrome_driver = webdriver.Chrome(
+        service=ChromeService(ChromeDriverManager().install()),
+        options=opt
+    )
+    chrome_driver.set_page_load_timeout(PAGE_TIMEOUT)
+    return chrome_driver
+
+if FETCH_BACKEND == 'selenium':
+    with metrics.timer('browser_startup'):
+        driver = create_driver()
+else:
+    if FETCH_BACKEND != 'http':
+        print(f"Unknown SCRAPER_BACKEND '{FETCH_BACKEND}'. Defaulting to 'http'.")
+        FETCH_BACKEND = 'http'
+        metrics.labels['backend'] = FETCH_BACKEND
+    session = create_session()
 # ---------------------------------------------------------- #
 
 # ---------------------------------------------------------- #
 # Helper variables
 # ---------------------------------------------------------- #
 # Keep base url to join with extracted later
-base_url = 'https://www.baseball-almanac.com/'
+# (SCRAPER_BASE_URL points the scraper at a mirror, e.g. benchmarks/replay_server.py)
+base_url = os.environ.get('SCRAPER_BASE_URL', 'https://www.baseball-almanac.com/')
 
-url = 'https://www.baseball-almanac.com/yearmenu.shtml'
+url = urljoin(base_url, 'yearmenu.shtml')
 # ---------------------------------------------------------- #
 
 # ---------------------------------------------------------- #
 # Web Scraping
 # ---------------------------------------------------------- #
 try:
-    # Common scraping activity using selenium and BeautifulSoup
-    def scraping_page(url):
+    # Selenium fallback: load the page in Chrome and pull the html back
+    def scraping_page_selenium(url):
         try:
             # Load the web page
-            driver.get(url)
+            with metrics.timer('page_load'):
+                driver.get(url)
 
             # Grab the surviving window handle (always the newest)
             driver.switch_to.window(driver.window_handles[-1])
 
             # Wait for the table to be loaded 
-            get_html = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, 'body'))
-            )
-        except TimeoutException:
-            print("Timed-out waiting for the year list table.")
-        
-        try:
+            with metrics.timer('wait_for_body'):
+                get_html = WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.TAG_NAME, 'body'))
+                )
+
             # Get HTML 
             html = get_html.get_attribute('outerHTML')
-            # print(div_container_html) 
-
-        # Parse scraped html using beautiful soup 
-            soup = BeautifulSoup(html, 'html.parser')
-            # print(soup)
-            return soup
-
+        except TimeoutException:
+            print("Timed-out waiting for the year list table.")
+            metrics.increment('pages_fetch_failed')
+            return None
         except Exception as e:
-                print(f"\n ERROR in: Common scraping page activity: getting html")
-                print(f"\n ERROR in: Common scraping page activity: retrning soup")
-                print(f"{e}") 
+            print(f"\n ERROR in: Selenium page load: getting html from {url}")
+            print(f"{e}")
+            metrics.increment('pages_fetch_failed')
+            return None
+
+        metrics.increment('pages_requested')
+        metrics.increment('html_bytes', len(html.encode('utf-8')))
+        return html
+
+    # Common scraping activity: fetch many pages (http or selenium) and yield them parsed
+    # with BeautifulSoup as they arrive, keeping the order of urls
+    # Cached pages not listed in revalidate_urls are served without a network hit
+    # Every download is recorded in the journal (status, content hash) if one is given
+    def scraping_pages(urls, revalidate_urls=None, journal=None):
+        if FETCH_BACKEND == 'selenium':
+            # One browser can only load one page at a time
+            pages = (scraping_page_selenium(url) for url in urls)
+            fetch_error = "page could not be loaded"
+        else:
+            pages = iter_fetch_pages(
+                session, 
+                urls, 
+                max_workers=SCRAPER_CONCURRENCY, 
+                requests_per_second=SCRAPER_RATE_LIMIT, 
+                revalidate_urls=revalidate_urls,
+                metrics=metrics,
+                timeout=PAGE_TIMEOUT,
+                cache_dir=SCRAPER_CACHE_DIR,
+                offline=SCRAPER_OFFLINE)
+            fetch_error = "download failed after retries"
+
+        for url, html in zip(urls, pages):
+            if journal is not None:
+                if html is None:
+                    journal.record(url, FETCH_FAILED, error=fetch_error)
+                else:
+                    journal.record(url, FETCHED, html=html)
+
+            if html is None:
+                yield None
+            else:
+                # Parse scraped html using beautiful soup (boxed tables only, fastest available parser)
+                with metrics.timer('parse_html'):
+                    soup = parse_html(html)
+                yield soup
     # ---------------------------------------------------------- #
 
 
@@ -98,10 +213,24 @@ try:
     # ---------------------------------------------------------- #
     # 1.1. Get years and links from 'Year to Year' page
     # ---------------------------------------------------------- #
+    # Per-page journal of this run; an interrupted run into the same target is resumed
+    if SCRAPER_MODE == 'backfill':
+        journal_target = HISTORY_DB_PATH
+    elif SCRAPER_PIPELINE == 'stream':
+        journal_target = DB_PATH
+    else:
+        journal_target = CSV_DIR
+    journal = ScrapeJournal(journal_target)
+
+    # Without the year menu there is nothing to scrape
+    year_link_list_full = []
+    last_5_years_links = []
+    soup = None
 
     # Find table with class boxed
     try:  
-        soup = scraping_page(url)
+        # Fetched like the year pages (journal, metrics), always revalidated against the site
+        soup = next(scraping_pages([url], revalidate_urls={url}, journal=journal))
         years_table = soup.find('table', class_='boxed')
 
 
@@ -119,54 +248,10 @@ try:
             print(f"\n ERROR in: Find first 2 headers")
             print(f"{e}") 
 
-    # Derive year links from year table - function
-    def link_list(header):
-        try:
-            # Find parent of t_headers
-            header_tr = header.find_parent('tr')
-
-            # Loop over following siblings to find the one that have table.ba_sub
-            for sibling in header_tr.find_next_siblings('tr'):
-                td = sibling.find('td', class_='datacolBox')
-                if td and td.find('table', class_='ba-sub'):
-                    # print("Found <tr> with <td> containing a <table class='ba_sub'> inside:")
-                    # print(sibling)
-                    sub_table = td.find('table', class_='ba-sub')
-                    break
-            
-            # Declare link_list
-            year_link_list = []
-
-            # Loop through the subtable and pull all years and links
-            year_links = sub_table.find_all('a')
-            # print(year_links)
-            for year_link in year_links:
-                year_href = urljoin(base_url, year_link['href'])
-                year_text = year_link.text
-                if len(year_href) >= 7: # char right before '.shtml'
-                    if year_href[-7] == "a":
-                        league_name = "American League"
-                    elif year_href[-7] == "n":
-                        league_name = "National League"
-                    else:
-                        continue
-                # Append dicts to year_link_list
-                year_link_list.append({
-                    'year_href': year_href,
-                    'year': year_text,
-                    'league_name':league_name
-                })
-            
-            return year_link_list
-    
-        except Exception as e:
-            print(f"\n ERROR in: Derive year links function")
-            print(f"{e}") 
-
     # Create link lists ussing link_list function, and merge them the lists
     try:
-        year_link_list1 = link_list(header1)
-        year_link_list2 = link_list(header2)
+        year_link_list1 = link_list(header1, base_url)
+        year_link_list2 = link_list(header2, base_url)
 
         year_link_list_full = year_link_list1 + year_link_list2
     except Exception as e:
@@ -202,6 +287,14 @@ try:
         print(f"\n ERROR in: Finding 5 last years only")
         print(f"{e}") 
 
+    if not last_5_years_links:
+        print(f"\n ERROR: No year links found on {url}, nothing to scrape")
+        if soup is not None:
+            # A failed download is already journaled as such
+            journal.record(url, PARSE_FAILED, error="no year links found")
+        sys.exit(1)
+    journal.record(url, DONE, row_count=len(year_link_list_full))
+
     # Create year link df out of 5 last years links list
     try:
         last_5_years_links_df = pd.DataFrame(last_5_years_links)
@@ -211,544 +304,448 @@ try:
     except Exception as e:
             print(f"\n ERROR in: Creating link lists")
             print(f"{e}") 
-    # ---------------------------------------------------------- #
-
-
-    # ---------------------------------------------------------- #
-    # 1.2. Scrape each year page of the last 5 years
-    # ---------------------------------------------------------- #       
-    try:
-        # Declare lists for each table sscraping results
-        last_5_ys_yearly_stats_1_list = []
-        last_5_ys_yearly_stats_2_list = []
-        
-        # Loop through year links
-        for year_link in last_5_years_links:
-            year = year_link['year']
-            league_name = year_link['league_name']
-            year_href = year_link['year_href']
-
-            print(f"Scraping {year} - {league_name} from {year_href}")
-
-            # Get necessary html code from one page for further parsing
-            y_l_soup = scraping_page(year_href)
-
-            # Parse collected html
-            try:
-                # Find all tabls with class boxed
-                y_stat_tables = y_l_soup.find_all("table", class_="boxed")
-                # print(y_stat_tables)
-
-                # Get only 2 tables: hitting stats and pitching stats
-                # Assign tables to variables
-                scrape_y_stat_table1 = y_stat_tables[0]
-                scrape_y_stat_table2 = y_stat_tables[1]
-            except Exception as e:
-                print("ERROR: Find tabls with class boxed")
-                print(f"{e}") 
-
-            # Create stat list
-            # - tr: td.header: h2: year -> column (name + data)
-            # - tr: td.header: h2: league -> column (name + data)
-            # - tr: td.header: p: stats title/type -> column (name + data)
-            # - tr: td.banner: column names -> column names / first row
-            # - tr: td.datacolBlue + tr.datacolBox: row name (td.datacolBlue) + data (datacolBox) -> rows
-
-            def scrape_stats_table(table):
-                # Declare all necessary lists and variables
-                rows = []
-                first_row = []
-                y_stat_year = None
-                y_stat_league = None
-                y_stat_title = None
-
-                # Scrape a table
-                # Find all table rows and iterate through them
-                trs = table.find_all('tr')
-
-                for tr in trs:
-                    # Step 1: Header info (only once)
-                    header = tr.find('td', class_='header')
-                    if header and not y_stat_year:
-                        # Get year and league name
-                        h2 = header.find('h2')
-                        if h2:
-                            h2_text = h2.get_text(strip=True)
-                            year_match = re.search(r"^(\d{4})", h2_text)
-                            league_match = re.search(r"^\d{4}\s+(\w+\s+\w+)", h2_text)
-                            if year_match:
-                                y_stat_year = year_match.group(1)
-                            if league_match:
-                                y_stat_league = league_match.group(1)
-
-                        # Get statistic name
-                        p = header.find('p')
-                        if p:
-                            p_text = p.get_text(strip=True)
-                            stat_match = re.search(r".*\d{4}\s+(\w+\s+\w+)", p_text)
-                            if stat_match:
-                                y_stat_title = stat_match.group(1)
-
-                    # Step 2: Banners — first row
-                    if not first_row:
-                        banners = tr.find_all('td', class_='banner')
-                        if banners:
-                            for banner in banners:
-                                banner_text = banner.get_text(strip=True)
-                                first_row.append(banner_text)
-
-                    # Step 3: Data rows
-                    datacol_blue = tr.find('td', class_='datacolBlue')
-                    if datacol_blue:
-                        row_name = datacol_blue.text.strip()
-
-                        # Get *all* <td> elements in the row
-                        tds = tr.find_all('td')
-
-                        # Skip the first td (it's datacol_blue), and parse the rest
-                        row_data = []
-                        skip = True
-                        for td in tds:
-                            if skip:
-                                if td == datacol_blue:
-                                    skip = False
-                                continue
-
-                            text = td.get_text(strip=True)
-                            row_data.append(text)
-
-                        full_row = [row_name] + row_data
-
-                        # Only append if it matches banner length
-                        if len(full_row) == len(first_row):
-                            rows.append(full_row)
-
-                # Step 4: Assemble DataFrame
-                if rows:
-                    df = pd.DataFrame(rows, columns=first_row)  # Trim header if needed
-                else:
-                    df = pd.DataFrame()
-
-                df['year'] = y_stat_year
-                df['league'] = y_stat_league
-                df['stat_title'] = y_stat_title
-
-                return df
-
-            try:
-                # print(f"\n scrape_y_stat_table1 results:")
-                y_stat_df_1 = scrape_stats_table(scrape_y_stat_table1)
-                # print(y_stat_df_1)
-                last_5_ys_yearly_stats_1_list.append(y_stat_df_1)
-
-                # print(f"\n scrape_y_stat_table2 results:")
-                y_stat_df_2 = scrape_stats_table(scrape_y_stat_table2)
-                # print(y_stat_df_2)
-                last_5_ys_yearly_stats_2_list.append(y_stat_df_2)
-
-            except Exception as e:
-                print(f"{e}") 
-        
-        # Combine scraping results from all year pages into one list per each teble scraped
-        try:
-            last_5_ys_yearly_stats_1_df = pd.concat(last_5_ys_yearly_stats_1_list, ignore_index=True)
-            # print(last_5_ys_yearly_stats_1_df)
-            # last_5_ys_yearly_stats_1_df.info()
 
-            last_5_ys_yearly_stats_2_df = pd.concat(last_5_ys_yearly_stats_2_list, ignore_index=True)
-            # print(last_5_ys_yearly_stats_2_df)
-            # last_5_ys_yearly_stats_2_df.info()
-
-        except Exception as e:
-            print("ERROR: Combine scraping results from all year")
-            print(f"{e}")
-
-        # Concat dfs
+    # Incremental mode: skip pages already scraped by a previous run
+    existing = None
+    links_to_scrape = last_5_years_links
+    if SCRAPER_MODE == 'incremental':
         try:
-            last_5_ys_yearly_stats = pd.concat([last_5_ys_yearly_stats_1_df,  last_5_ys_yearly_stats_2_df], ignore_index=True)
+            # The stream pipeline only writes the database, so compare against it
+            existing_csv_dir = CSV_DIR if SCRAPER_PIPELINE != 'stream' else None
+            existing_tables = read_existing_tables(existing_csv_dir, DB_PATH)
+            if existing_tables is None:
+                print("No previous run found in csv/ or db/: scraping all pages")
+            else:
+                existing = denormalize_existing_tables(existing_tables)
+                links_to_scrape = select_links_to_scrape(
+                    last_5_years_links, 
+                    scraped_pages(existing['stats']), 
+                    last_year)
+                print(f"Incremental mode: {len(links_to_scrape)} of {len(last_5_years_links)} pages to scrape")
 
         except Exception as e:
-            print(f"{e}")
+            print(f"\n ERROR in: Reading previous run, scraping all pages")
+            print(f"{e}") 
+            existing = None
+            links_to_scrape = last_5_years_links
 
-        # Clean dfs
+    # Backfill mode: requested seasons not yet in the history database
+    if SCRAPER_MODE == 'backfill':
         try:
-            # Step 1: Rename columns
-            last_5_ys_yearly_stats.columns = ['statistic', 'player_name', 'team_name', 'no', 'top_25', 'year', 'league', 'stat_title']
-
-            # Step 2: Convert values type
-            # 2.1. year column to integer
-            last_5_ys_yearly_stats['year'] = last_5_ys_yearly_stats['year'].astype(int)
-            
-            # 2.1. no column to float
-
-            last_5_ys_yearly_stats['no'] = last_5_ys_yearly_stats['no'].replace("--", np.nan).astype(float)
-
-            print(last_5_ys_yearly_stats)
-            last_5_ys_yearly_stats.info()
+            backfill_years = parse_year_range(SCRAPER_YEARS, int_years)
+            done_pages = backfilled_pages(HISTORY_DB_PATH)
+            # Oldest season first, both leagues of a season in the same chunk;
+            # the current season is reloaded on every run
+            links_to_scrape = sorted(
+                (
+                    year_link for year_link in year_link_list_full
+                    if int(year_link['year']) in backfill_years
+                    and (int(year_link['year']) == last_year
+                         or (int(year_link['year']), year_link['league_name']) not in done_pages)
+                ),
+                key=lambda year_link: int(year_link['year']))
+            print(f"Backfill mode: {len(links_to_scrape)} pages to scrape for {len(backfill_years)} seasons, "
+                  f"{len(done_pages)} pages already in {HISTORY_DB_PATH}")
 
         except Exception as e:
-            print(f"{e}")
-
-    except Exception as e:
-            print(f"{e}")
-
+            print(f"\n ERROR in: Selecting backfill pages")
+            print(f"{e}") 
+            links_to_scrape = []
     # ---------------------------------------------------------- #
-    # 1.3. Normalize last_5_ys_yearly_stats 
-    # ---------------------------------------------------------- #   
-
-    """full db schema draft:
-    - statistics and stat_titles step1:
-    - df: statistics:
-        col: statistics.statistic -> data form last_5_ys_yearly_stats.statistics
-        cole: statistics.stat_title -> data from last_5_ys_yearly_stats.stat_title
-        col: statistics.statistic_id pk -> last_5_ys_yearly_stats.statistic_id fk
-
-                - statistics and stat_titles step2:
-                - df: stat_titles:
-                    col: stat_titles.stat_title -> data from statistics.stat_title
-                    col: stat_titles.stat_title_id pk -> statistics.stat_title_id fk
-
-                - df: statistics:
-                    col: statistics.statistic (nothing canges) -> data
-                    col: statistics.statistic_id pk (nothing canges) -> last_5_ys_yearly_stats.statistic_id fk
-                    col: statistics.stat_title_id fk -> stat_title.stat_title_id pk 
-
-    - players and teams step1:
-    - df: players:
-        col: players.player_name -> data from last_5_ys_yearly_stats.player_name
-        col: players.team_name -> data from last_5_ys_yearly_stats.team_name
-        col: players.player_id pk -> last_5_ys_yearly_stats.player_id fk 
-
-            - players and teams step2:
-                - df: teams:
-                    col: teams.team_name -> data from players.team_name
-                    col: teams.team_id pk -> players.team_id fk
-
-                - df: players:
-                    col: players.player_name (nothing canges) -> data from last_5_ys_yearly_stats.player_name
-                    col: players.player_id pk -> players.player_id fk 
-                    col: players.player_id fk -> teams.player_id pk
-                                    
-    - years:
-        col: years.year -> data from last_5_ys_yearly_stats.year (is this needed)
-        col: years.year_id pk -> last_5_ys_yearly_stats.year_id fk
-
-    - leagues:
-        col: leagues.league_name -> data from last_5_ys_yearly_stats.league
-        col: leagues.league_id pk -> last_5_ys_yearly_stats.league_id fk
-
-    - last_5_ys_yearly_stats:
-        col: last_5_ys_yearly_stats.statistic_id fk -> statistics.statistic_id pk
-        col: last_5_ys_yearly_stats.player_id (old: last_5_ys_yearly_stats.player_name) -> players.player_id pk
-        col: last_5_ys_yearly_stats.team_id (old: last_5_ys_yearly_stats.team_name) -> players join teams on plaier_id, teams.team_id pk
-        col: last_5_ys_yearly_stats.no (nothing changes) -> data
-        col: last_5_ys_yearly_stats.top_25 (nothing_changes) -> data
-        col: last_5_ys_yearly_stats.year_id fk (old: last_5_ys_yearly_stats.year) -> years.year_id pk
-        col: last_5_ys_yearly_stats.league_id fk (old: last_5_ys_yearly_stats.league) -> leagues.league_id pk
-        col: last_5_ys_yearly_stats.stat_title_id fk (old: last_5_ys_yearly_stats.stat_title) -> statistics join stat_titles on statistic_id, stat_titles.stat_title_id
-    """
-
-    # 1.3.0: normalization function:
-    def create_lookup_df(
-            df, 
-            *cols, 
-            id_col_name='id'):
-        """
-        Create a normalized lookup DataFrame with a primary key column.
 
-        Args:
-            df: Original DataFrame
-            *cols: Column names to include in the lookup table
-            id_col_name: Name of the ID column to be created
 
-        Returns:
-            A new DataFrame with a unique ID column and unique trimmed combinations of input columns.
-        """
+    # ---------------------------------------------------------- #
+    # 1.2. Scrape each year page of the last 5 years
+    # ---------------------------------------------------------- #       
+    # The stream pipeline's completed pages live in the shadow database until it is swapped in,
+    # so they are only skipped if the interrupted run's shadow file is still there
+    resume_completed = journal.resumed and journal_target != CSV_DIR and (
+        journal_target != DB_PATH or os.path.exists(shadow_path(DB_PATH)))
+    if resume_completed:
+        # Pages already written by the interrupted run are not scraped again
+        # (the current season is always refreshed)
+        completed_urls = journal.completed_urls()
+        links_to_resume = [
+            year_link for year_link in links_to_scrape 
+            if year_link['year_href'] not in completed_urls or int(year_link['year']) == last_year
+        ]
+        print(f"Resuming interrupted run into {journal_target}: "
+              f"{len(links_to_scrape) - len(links_to_resume)} pages already done")
+        links_to_scrape = links_to_resume
+
+    if SCRAPER_MODE == 'backfill':
+        # Same streaming writer, into the history database, committed chunk by chunk
         try:
-            for col in cols:
-                df[col] = df[col].astype(str).str.strip()
-
-            lookup_df = (
-                df[list(cols)]
-                .drop_duplicates()
-                .sort_values(by=list(cols))
-                .reset_index(drop=True)
-                .reset_index()  # create ID column
-                .rename(columns={"index": id_col_name})
-            )
-        except Exception as e:
-            print(f"Error in create_lookup_df for columns {cols}: {e}")
-
-        return lookup_df
-
-    # 1.3.1: Step1: normalization 1:
-    print(f"\n Step 1 normalization: \n")
-    try:
-        # statistics
-        statistics = create_lookup_df(
-            last_5_ys_yearly_stats, 
-            'statistic', 'stat_title', 
-            id_col_name='statistic_id')
-
-        # print(f"\n statistics df: \n")
-        # print(statistics)
-        # statistics.info()
-
-        # players
-        players = create_lookup_df(
-            last_5_ys_yearly_stats, 
-            'player_name', 'team_name', 
-            id_col_name='player_id')
-
-        # print(f"\n players df: \n")
-        # print(players)
-        # players.info()
-
-        # years
-        years = create_lookup_df(
-            last_5_ys_yearly_stats, 
-            'year', 
-            id_col_name='year_id')
-
-        # print(f"\n years df: \n")
-        # print(years)
-        # years.info()
-
-        # leagues
-        leagues = create_lookup_df(
-            last_5_ys_yearly_stats, 
-            'league', 
-            id_col_name='league_id')
-
-        # print(f"\n leagues df: \n")
-        # print(leagues)
-        # leagues.info()
-
-    except Exception as e:
-            print(f"{e}")
-            print("df creation error")
+            os.makedirs(os.path.dirname(HISTORY_DB_PATH), exist_ok=True)
+            writer = StatsDbWriter(HISTORY_DB_PATH, SCHEMA_PATH, registry_path=KEY_REGISTRY_PATH)
+
+            chunks = chunked(links_to_scrape, SCRAPER_CHUNK_SIZE)
+            for chunk_no, chunk in enumerate(chunks, start=1):
+                year_hrefs = [year_link['year_href'] for year_link in chunk]
+                current_season_hrefs = {
+                    year_link['year_href'] 
+                    for year_link in chunk 
+                    if int(year_link['year']) == last_year
+                }
+
+                pages = scraping_pages(year_hrefs, revalidate_urls=current_season_hrefs, journal=journal)
+                chunk_done = []
+                for year_link, y_l_soup in zip(chunk, pages):
+                    year = year_link['year']
+                    league_name = year_link['league_name']
+
+                    if y_l_soup is None:
+                        print(f"ERROR: No html for {year} - {league_name}, page skipped")
+                        continue
 
-    # 1.3.2: Step 2: normalization 2:
-    print(f"\n Step 2 normalization: \n")
-    try:
-        # stat_titles
-        stat_titles = create_lookup_df(
-            statistics, 
-            'stat_title', 
-            id_col_name='stat_title_id')
-
-        # print(f"\n stat_titles df: \n")
-        # print(stat_titles)
-        # stat_titles.info()
-
-        # teams
-        teams = create_lookup_df(
-            players, 
-            'team_name', 
-            id_col_name='team_id')
-
-        # print(f"\n teams df: \n")
-        # print(teams)
-        # teams.info()
+                    try:
+                        # Rows are extracted lazily, so this covers table extraction and the inserts
+                        with metrics.timer('write_page'):
+                            rows_written = writer.write_page(year, league_name, iter_page_stats(y_l_soup))
+                        metrics.increment('rows_written', rows_written)
+                        print(f"Wrote {rows_written} rows for {year} - {league_name}")
+                        chunk_done.append((year_link, rows_written))
+                    except Exception as e:
+                        print(f"ERROR: Could not load {year} - {league_name}, page skipped")
+                        print(f"{e}")
+                        metrics.increment('pages_parse_failed')
+                        journal.record(year_link['year_href'], PARSE_FAILED, int(year), league_name, error=str(e))
+
+                # Everything up to here survives an interrupted run; pages are journaled
+                # as done only once they are committed
+                with metrics.timer('commit'):
+                    writer.checkpoint()
+                for year_link, rows_written in chunk_done:
+                    journal.record(year_link['year_href'], DONE, int(year_link['year']), 
+                        year_link['league_name'], row_count=rows_written)
+                print(f"Committed chunk {chunk_no}/{len(chunks)} ({chunk[0]['year']}-{chunk[-1]['year']})")
+
+            writer.close()
+            print(f"Backfilled {writer.rows_written} rows into {HISTORY_DB_PATH}")
+            if not journal.failed_pages():
+                journal.finish()
 
-    except Exception as e:
+        except Exception as e:
+            print(f"\n ERROR in: Backfilling pages into the history database")
             print(f"{e}")
-            print("df creation error")
 
-    # ---------------------------------------------------------- #
-    # 1.4: switching text columns to ids: adding fk
-
-    # 1.4.0: switching text columns to ids: merge id columnn to main df function:
-    def add_simple_foreign_key(
-            main_df, 
-            lookup_df, 
-            on_column, 
-            fk_column):
-        
-        """ add_simplpe_foreign_key explinatio:
-        Merge a lookup table into the main DataFrame to replace a text column with a foreign key.
-
-        Args:
-            main_df (pd.DataFrame): The main DataFrame containing a text column (e.g., 'stat_title').
-            lookup_df (pd.DataFrame): The lookup DataFrame with 'on_column' and ID column (e.g., 'stat_title_id').
-            on_column (str): The column name to join on (must exist in both DataFrames).
-            fk_column (str): The name of the ID column in df_lookup to add to df_main.
-
-        Returns:
-            pd.DataFrame: The updated DataFrame with the foreign key column added.
-        """
+    elif SCRAPER_PIPELINE == 'stream':
+        # Parse each page into rows and write them straight into SQLite,
+        # no intermediate DataFrames or csv files. Pages go into a shadow copy of the
+        # live database, which is validated and swapped in once all pages are written
         try:
-            main_df = main_df.merge(lookup_df[[on_column, fk_column]], on=on_column, how='left')
-        except Exception as e:
-            print(f"Error merging on {on_column}: {e}")
-
-        return main_df
-
-    def add_combined_foreign_key(
-            main_df, 
-            lookup_df, 
-            on_columns, 
-            fk_column):
-        
-        """ add_combined_foreign_key explinatio:
-        Merge a lookup table into the main DataFrame to replace a text column with a foreign key.
-
-        Args:
-            main_df (pd.DataFrame): The main DataFrame containing a text column (e.g., 'stat_title').
-            lookup_df (pd.DataFrame): The lookup DataFrame with 'on_columns' and ID column (e.g., 'stat_title_id').
-            on_columns (str): The column names to join on (must exist in both DataFrames).
-            fk_column (str): The name of the ID column in df_lookup to add to df_main.
+            os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+            building_path = start_shadow_database(DB_PATH, resume=resume_completed)
+            writer = StatsDbWriter(building_path, SCHEMA_PATH, registry_path=KEY_REGISTRY_PATH, 
+                incremental_refresh=False)
+
+            year_hrefs = [year_link['year_href'] for year_link in links_to_scrape]
+            # Completed seasons never change: only the current season is revalidated against the site
+            current_season_hrefs = {
+                year_link['year_href'] 
+                for year_link in links_to_scrape 
+                if int(year_link['year']) == last_year
+            }
+            print(f"Streaming {len(year_hrefs)} year pages into {DB_PATH} ({FETCH_BACKEND} backend)")
+
+            pages = scraping_pages(year_hrefs, revalidate_urls=current_season_hrefs, journal=journal)
+            for year_link, y_l_soup in zip(links_to_scrape, pages):
+                year = year_link['year']
+                league_name = year_link['league_name']
+
+                if y_l_soup is None:
+                    print(f"ERROR: No html for {year} - {league_name}, page skipped")
+                    continue
+
+                try:
+                    # Rows are extracted lazily, so this covers table extraction and the inserts
+                    with metrics.timer('write_page'):
+                        rows_written = writer.write_page(year, league_name, iter_page_stats(y_l_soup))
+                    # Committed per page (into the shadow file), so the journal can mark it done
+                    with metrics.timer('commit'):
+                        writer.commit()
+                    metrics.increment('rows_written', rows_written)
+                    print(f"Wrote {rows_written} rows for {year} - {league_name}")
+                    journal.record(year_link['year_href'], DONE, int(year), league_name, row_count=rows_written)
+                except Exception as e:
+                    print(f"ERROR: Could not load {year} - {league_name}, page skipped")
+                    print(f"{e}")
+                    metrics.increment('pages_parse_failed')
+                    journal.record(year_link['year_href'], PARSE_FAILED, int(year), league_name, error=str(e))
+
+            # Seasons that fell out of the window are dropped, like in a full rebuild
+            with metrics.timer('prune_years'):
+                writer.prune_years(last_5_years)
+            with metrics.timer('commit'):
+                writer.close()
+            # Read model and rollups are rebuilt once, then the whole database goes live at once
+            with metrics.timer('swap'):
+                swap_in_database(building_path, DB_PATH)
+            print(f"Streamed {writer.rows_written} rows into {DB_PATH}")
+            if not journal.failed_pages():
+                journal.finish()
 
-        Returns:
-            pd.DataFrame: The updated DataFrame with the foreign key column added.
-        """
-
-        try:
-            main_df = main_df.merge(lookup_df[on_columns + [fk_column]], on=on_columns, how='left')
         except Exception as e:
-                print(f"Error merging on {on_columns}: {e}")
-        return main_df
+            print(f"\n ERROR in: Streaming pages into the database")
+            print(f"{e}")
 
-    # 1.4.1: switching text columns to ids: adding fk
-    print(f"\n Step 3 switching text columns to ids: adding fk:  \n")
-    try:
-        # statistics: stat_title_id
-        statistics = add_simple_foreign_key(
-            statistics, 
-            stat_titles, 
-            'stat_title', 
-            'stat_title_id', )
-
-        # print(f"\n statistics df with stat_title_id: \n")
-        # print(statistics)
-        # statistics.info()
-
-        # players: team_id
-        players = add_simple_foreign_key(
-            players, 
-            teams, 
-            'team_name', 
-            'team_id')
-        
-        # print(f"\n players df with team_id: \n")
-        # print(players)
-        # players.info()
+    else:
+        try:
+            # Declare lists for each table sscraping results
+            last_5_ys_yearly_stats_1_list = []
+            last_5_ys_yearly_stats_2_list = []
+
+            # Fetch all year pages first (in parallel for the http backend)
+            year_hrefs = [year_link['year_href'] for year_link in links_to_scrape]
+            # Completed seasons never change: only the current season is revalidated against the site
+            current_season_hrefs = {
+                year_link['year_href'] 
+                for year_link in links_to_scrape 
+                if int(year_link['year']) == last_year
+            }
+            print(f"Scraping {len(year_hrefs)} year pages ({FETCH_BACKEND} backend)")
+            y_l_soups = scraping_pages(year_hrefs, revalidate_urls=current_season_hrefs, journal=journal)
+
+            # Loop through year links and their pages (same order as links_to_scrape)
+            for year_link, y_l_soup in zip(links_to_scrape, y_l_soups):
+                year = year_link['year']
+                league_name = year_link['league_name']
+                year_href = year_link['year_href']
+
+                print(f"Parsing {year} - {league_name} from {year_href}")
+
+                if y_l_soup is None:
+                    print(f"ERROR: No html for {year} - {league_name}, page skipped")
+                    continue
+
+                # Parse collected html
+                try:
+                    # Find all tabls with class boxed
+                    y_stat_tables = y_l_soup.find_all("table", class_="boxed")
+                    # print(y_stat_tables)
+
+                    # Get only 2 tables: hitting stats and pitching stats
+                    # Assign tables to variables
+                    scrape_y_stat_table1 = y_stat_tables[0]
+                    scrape_y_stat_table2 = y_stat_tables[1]
+                except Exception as e:
+                    print("ERROR: Find tabls with class boxed")
+                    print(f"{e}") 
+                    metrics.increment('pages_parse_failed')
+                    journal.record(year_href, PARSE_FAILED, int(year), league_name, error=f"boxed tables: {e}")
+                    continue
+
+                try:
+                    with metrics.timer('scrape_stats_table'):
+                        # print(f"\n scrape_y_stat_table1 results:")
+                        y_stat_df_1 = scrape_stats_table(scrape_y_stat_table1)
+                        # print(y_stat_df_1)
+
+                        # print(f"\n scrape_y_stat_table2 results:")
+                        y_stat_df_2 = scrape_stats_table(scrape_y_stat_table2)
+                        # print(y_stat_df_2)
+
+                    # Keep a page only if both of its tables parsed
+                    last_5_ys_yearly_stats_1_list.append(y_stat_df_1)
+                    last_5_ys_yearly_stats_2_list.append(y_stat_df_2)
+                    journal.record(year_href, DONE, int(year), league_name, 
+                        row_count=len(y_stat_df_1) + len(y_stat_df_2))
+                    metrics.increment('rows_parsed', len(y_stat_df_1) + len(y_stat_df_2))
+
+                except Exception as e:
+                    print(f"{e}") 
+                    metrics.increment('pages_parse_failed')
+                    journal.record(year_href, PARSE_FAILED, int(year), league_name, error=str(e))
         
-        # last_5_ys_yearly_stats: statistic_id:
-        last_5_ys_yearly_stats = add_combined_foreign_key(
-            last_5_ys_yearly_stats, 
-            statistics, 
-            ['statistic', 'stat_title'],
-            'statistic_id')
-
-        # print(f"\n last_5_ys_yearly_stats df with statistic_id: \n")
-        # print(last_5_ys_yearly_stats)
-        # last_5_ys_yearly_stats.info()
-
-        # last_5_ys_yearly_stats: player_id: 
-        last_5_ys_yearly_stats = add_combined_foreign_key(
-            last_5_ys_yearly_stats, 
-            players, 
-            ['player_name', 'team_name'],
-            'player_id')
-
-        # print(f"\n last_5_ys_yearly_stats df with statistic_id, player_id: \n")
-        # print(last_5_ys_yearly_stats)
-        # last_5_ys_yearly_stats.info()
-
-        # last_5_ys_yearly_stats: year_id: 
-        last_5_ys_yearly_stats = add_simple_foreign_key(
-            last_5_ys_yearly_stats, 
-            years, 
-            'year',
-            'year_id')
-
-        # print(f"\n last_5_ys_yearly_stats df with statistic_id, player_id, year_id: \n")
-        # print(last_5_ys_yearly_stats)
-        # last_5_ys_yearly_stats.info()
-
-        # last_5_ys_yearly_stats: league_id: 
-        last_5_ys_yearly_stats = add_simple_foreign_key(
-            last_5_ys_yearly_stats, 
-            leagues, 
-            'league',
-            'league_id')
-
-        # print(f"\n last_5_ys_yearly_stats df with statistic_id, player_id, year_id, league_id: \n")
-        # print(last_5_ys_yearly_stats)
-        # last_5_ys_yearly_stats.info()
+            # Combine, clean and merge the page tables (timed as one 'combine' stage)
+            combine_start = time.perf_counter()
+
+            # Combine scraping results from all year pages into one list per each teble scraped
+            # (in incremental mode there may be nothing new to scrape)
+            if not last_5_ys_yearly_stats_1_list and not last_5_ys_yearly_stats_2_list:
+                last_5_ys_yearly_stats_1_list = [pd.DataFrame(columns=range(len(STAT_COLUMNS)))]
+                last_5_ys_yearly_stats_2_list = [pd.DataFrame(columns=range(len(STAT_COLUMNS)))]
+            try:
+                last_5_ys_yearly_stats_1_df = pd.concat(last_5_ys_yearly_stats_1_list, ignore_index=True)
+                # print(last_5_ys_yearly_stats_1_df)
+                # last_5_ys_yearly_stats_1_df.info()
 
-    except Exception as e:
-            print(f"{e}")
+                last_5_ys_yearly_stats_2_df = pd.concat(last_5_ys_yearly_stats_2_list, ignore_index=True)
+                # print(last_5_ys_yearly_stats_2_df)
+                # last_5_ys_yearly_stats_2_df.info()
 
-    # 1.4.2: switching text columns to ids: dropping text columnns
+            except Exception as e:
+                print("ERROR: Combine scraping results from all year")
+                print(f"{e}")
 
-    def drop_columns(df, *cols):
-        """
-        Drop one or more columns from a DataFrame.
+            # Concat dfs
+            try:
+                last_5_ys_yearly_stats = pd.concat([last_5_ys_yearly_stats_1_df,  last_5_ys_yearly_stats_2_df], ignore_index=True)
 
-        Args:
-            df (pd.DataFrame): The DataFrame to modify.
-            *cols (str): Column names to drop.
+            except Exception as e:
+                print(f"{e}")
 
-        Returns:
-            pd.DataFrame: A copy of the DataFrame with specified columns dropped.
-        """
-        try:
-            df = df.drop(columns=list(cols), errors='ignore')
+            # Clean dfs
+            try:
+                # Step 1: Rename columns
+                last_5_ys_yearly_stats.columns = ['statistic', 'player_name', 'team_name', 'no', 'top_25', 'year', 'league', 'stat_title']
 
-        except TimeoutException:
-            print("link not found")
+                # Step 2: Convert values type
+                # 2.1. year column to integer
+                last_5_ys_yearly_stats['year'] = last_5_ys_yearly_stats['year'].astype(int)
             
-        return df
+                # 2.1. no column to float
 
-    print(f"\n Step 3 switching text columns to ids: adding dropping text columnns:  \n")
-    try:
-        # statistics: drop stat_title
-        statistics = drop_columns(statistics, 'stat_title')
-
-        print(f"\n statistics df: stat_title dropped \n")
-        print(statistics)
-        statistics.info()
+                last_5_ys_yearly_stats['no'] = last_5_ys_yearly_stats['no'].replace("--", np.nan).astype(float)
 
-        # players: drop team_name
-        players = drop_columns(players, 'team_name')
+                print(last_5_ys_yearly_stats)
+                last_5_ys_yearly_stats.info()
 
-        print(f"\n players df: team_name dropped \n")
-        print(players)
-        players.info()
-
-        # last_5_ys_yearly_stats: drop statistic, player_name, team_name, year, stat_title
-        last_5_ys_yearly_stats = drop_columns(last_5_ys_yearly_stats, 'statistic', 'player_name', 'team_name', 'league', 'year', 'stat_title')
+            except Exception as e:
+                print(f"{e}")
 
-        print(f"\n last_5_ys_yearly_stats df: statistic, player_name, team_name, league, year, and stat_title dropped \n")
-        print(last_5_ys_yearly_stats)
-        last_5_ys_yearly_stats.info()
+            # Incremental mode: replace refreshed pages in the previous run's rows with the new ones
+            if existing is not None:
+                refreshed_pages = {(int(year_link['year']), year_link['league_name']) for year_link in links_to_scrape}
+                last_5_ys_yearly_stats = merge_stats(
+                    existing['stats'], 
+                    last_5_ys_yearly_stats, 
+                    refreshed_pages, 
+                    last_5_years)
+                print(f"Merged with previous run: {len(last_5_ys_yearly_stats)} rows")
 
-    except Exception as e:
-        print(f"{e}")
+            metrics.observe('combine', time.perf_counter() - combine_start)
 
-    def save_dfs_to_csvs(df_dict, folder_path='.'):
+        except Exception as e:
+                print(f"{e}")
+
+        # ---------------------------------------------------------- #
+        # 1.3. Normalize last_5_ys_yearly_stats 
+        # ---------------------------------------------------------- #   
+
+        """full db schema draft:
+        - statistics and stat_titles step1:
+        - df: statistics:
+            col: statistics.statistic -> data form last_5_ys_yearly_stats.statistics
+            cole: statistics.stat_title -> data from last_5_ys_yearly_stats.stat_title
+            col: statistics.statistic_id pk -> last_5_ys_yearly_stats.statistic_id fk
+
+                    - statistics and stat_titles step2:
+                    - df: stat_titles:
+                        col: stat_titles.stat_title -> data from statistics.stat_title
+                        col: stat_titles.stat_title_id pk -> statistics.stat_title_id fk
+
+                    - df: statistics:
+                        col: statistics.statistic (nothing canges) -> data
+                        col: statistics.statistic_id pk (nothing canges) -> last_5_ys_yearly_stats.statistic_id fk
+                        col: statistics.stat_title_id fk -> stat_title.stat_title_id pk 
+
+        - players and teams step1:
+        - df: players:
+            col: players.player_name -> data from last_5_ys_yearly_stats.player_name
+            col: players.team_name -> data from last_5_ys_yearly_stats.team_name
+            col: players.player_id pk -> last_5_ys_yearly_stats.player_id fk 
+
+                - players and teams step2:
+                    - df: teams:
+                        col: teams.team_name -> data from players.team_name
+                        col: teams.team_id pk -> players.team_id fk
+
+                    - df: players:
+                        col: players.player_name (nothing canges) -> data from last_5_ys_yearly_stats.player_name
+                        col: players.player_id pk -> players.player_id fk 
+                        col: players.player_id fk -> teams.player_id pk
+                                    
+        - years:
+            col: years.year -> data from last_5_ys_yearly_stats.year (is this needed)
+            col: years.year_id pk -> last_5_ys_yearly_stats.year_id fk
+
+        - leagues:
+            col: leagues.league_name -> data from last_5_ys_yearly_stats.league
+            col: leagues.league_id pk -> last_5_ys_yearly_stats.league_id fk
+
+        - last_5_ys_yearly_stats:
+            col: last_5_ys_yearly_stats.statistic_id fk -> statistics.statistic_id pk
+            col: last_5_ys_yearly_stats.player_id (old: last_5_ys_yearly_stats.player_name) -> players.player_id pk
+            col: last_5_ys_yearly_stats.team_id (old: last_5_ys_yearly_stats.team_name) -> players join teams on plaier_id, teams.team_id pk
+            col: last_5_ys_yearly_stats.no (nothing changes) -> data
+            col: last_5_ys_yearly_stats.top_25 (nothing_changes) -> data
+            col: last_5_ys_yearly_stats.year_id fk (old: last_5_ys_yearly_stats.year) -> years.year_id pk
+            col: last_5_ys_yearly_stats.league_id fk (old: last_5_ys_yearly_stats.league) -> leagues.league_id pk
+            col: last_5_ys_yearly_stats.stat_title_id fk (old: last_5_ys_yearly_stats.stat_title) -> statistics join stat_titles on statistic_id, stat_titles.stat_title_id
         """
-        Save multiple DataFrames to CSV files.
 
-        Args:
-            df_dict (dict): Dictionary where keys are filenames (without .csv) and values are DataFrames.
-            folder_path (str): Directory to save CSVs in. Defaults to current directory.
-        """
+        # 1.3.1: normalization: factorize every lookup key once, ids come straight from the factor codes
+        # (no merges of the full last_5_ys_yearly_stats table)
+        print(f"\n Normalization: \n")
         try:
-            os.makedirs(folder_path, exist_ok=True)
-
-            for name, df in df_dict.items():
-                file_path = os.path.join(folder_path, f"{name}.csv")
-                df.to_csv(file_path, index=False)
-                print(f"Saved: {file_path}")
+            # Ids come from the key registry, so names keep their id across runs
+            registry = load_registry(KEY_REGISTRY_PATH)
+            if not any(len(keys) for keys in registry.values()):
+                # First run with a registry: adopt the ids of the previous run
+                previous_tables = read_existing_tables(CSV_DIR, DB_PATH)
+                if previous_tables is not None:
+                    registry = registry_from_tables(previous_tables)
+                    # Persist the adopted ids at once, also those of pages missing from this run
+                    save_registry(registry, KEY_REGISTRY_PATH)
+
+            with metrics.timer('normalize'):
+                normalized = normalize_stats(last_5_ys_yearly_stats, registry)
+            save_registry(registry_from_tables(normalized), KEY_REGISTRY_PATH)
+
+            stat_titles = normalized['stat_titles']
+            statistics = normalized['statistics']
+            players = normalized['players']
+            teams = normalized['teams']
+            years = normalized['years']
+            leagues = normalized['leagues']
+            last_5_ys_yearly_stats = normalized['last_5_ys_yearly_stats']
+
+            print(f"\n statistics df: \n")
+            print(statistics)
+            statistics.info()
+
+            print(f"\n players df: \n")
+            print(players)
+            players.info()
+
+            print(f"\n last_5_ys_yearly_stats df: statistic_id, player_id, year_id, league_id \n")
+            print(last_5_ys_yearly_stats)
+            last_5_ys_yearly_stats.info()
 
         except Exception as e:
             print(f"{e}")
+            print("df creation error")
 
-    try:
-        save_dfs_to_csvs({
+        def save_dfs_to_csvs(df_dict, folder_path='.'):
+            """
+            Save multiple DataFrames to CSV files.
+
+            Args:
+                df_dict (dict): Dictionary where keys are filenames (without .csv) and values are DataFrames.
+                folder_path (str): Directory to save CSVs in. Defaults to current directory.
+            """
+            try:
+                os.makedirs(folder_path, exist_ok=True)
+
+                for name, df in df_dict.items():
+                    file_path = os.path.join(folder_path, f"{name}.csv")
+                    df.to_csv(file_path, index=False)
+                    print(f"Saved: {file_path}")
+
+            except Exception as e:
+                print(f"{e}")
+
+        # A run with failed pages would write partial tables: keep the previous csv/ instead,
+        # the next run serves completed pages from the page cache and retries only the failed ones
+        failed_pages = journal.failed_pages()
+        if failed_pages and not SCRAPER_ALLOW_PARTIAL:
+            print(f"\n {len(failed_pages)} pages failed, {CSV_DIR}/ was left unchanged. "
+                  "Run again to retry them (SCRAPER_ALLOW_PARTIAL=1 writes the partial tables):")
+            for failed_url, status, attempts, error in failed_pages:
+                print(f"  {failed_url}: {status} after {attempts} attempt(s): {error}")
+        else:
+            normalized_tables = {
                 'stat_titles': stat_titles,
                 'statistics': statistics,
                 'players': players,
@@ -756,11 +753,35 @@ try:
                 'years': years,
                 'leagues': leagues,
                 'last_5_ys_yearly_stats': last_5_ys_yearly_stats
-            },
-            folder_path='csv'
-        )
-    except Exception as e:
-        print(f"{e}")
+            }
+
+            try:
+                with metrics.timer('write_csv'):
+                    save_dfs_to_csvs(normalized_tables, folder_path='csv')
+            except Exception as e:
+                print(f"{e}")
+
+            if SCRAPER_PARQUET:
+                try:
+                    with metrics.timer('write_parquet'):
+                        save_dfs_to_parquet(normalized_tables, folder_path=PARQUET_DIR)
+                except Exception as e:
+                    print(f"{e}")
+
+            journal.finish()
 
 finally:
-    driver.quit()
+    if journal is not None:
+        print(f"Page journal ({journal_target}): {journal.status_counts()}")
+        journal.close()
+    if driver is not None:
+        driver.quit()
+    if session is not None:
+        session.close()
+
+    # Run report, also for a run that failed half way
+    try:
+        metrics.write_reports(SCRAPER_METRICS_PATH, SCRAPER_PROMETHEUS_PATH)
+    except Exception as e:
+        print(f"\n ERROR in: Writing the run report")
+        print(f"{e}")
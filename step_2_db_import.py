@@ -1,92 +1,46 @@
 import os
+import sys
 import pandas as pd
-from sqlalchemy import create_engine, text
+from db_loader import build_and_swap_database
+from parquet_store import read_parquet_tables, PARQUET_DIR
 
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
 CSV_DIR = 'csv'  # folder with CSVs
+# 'csv' or 'parquet' (snapshot written by step_1 with SCRAPER_PARQUET=1)
+IMPORT_SOURCE = os.environ.get('IMPORT_SOURCE', 'csv').strip().lower()
+IMPORT_SOURCES = ('csv', 'parquet')
 db_folder = 'db'
 db_name = 'baseball_stats.db'
 schema_file = os.path.join(db_folder, 'schema.sql')
 db_path = os.path.join(db_folder, db_name)
 
+# A typo must not silently import from the other source
+if IMPORT_SOURCE not in IMPORT_SOURCES:
+    print(f"ERROR: Unknown IMPORT_SOURCE '{IMPORT_SOURCE}', expected one of: {', '.join(IMPORT_SOURCES)}")
+    sys.exit(1)
+
 # -----------------------------
 # STEP 1: CREATE DB FOLDER
 # -----------------------------
 os.makedirs(db_folder, exist_ok=True)
 
 # -----------------------------
-# STEP 2: DEFINE AND WRITE SCHEMA
-# -----------------------------
-schema_sql = """
-CREATE TABLE IF NOT EXISTS stat_titles (
-    stat_title_id INTEGER PRIMARY KEY,
-    stat_title TEXT NOT NULL UNIQUE
-);
-
-CREATE TABLE IF NOT EXISTS statistics (
-    statistic_id INTEGER PRIMARY KEY,
-    statistic TEXT NOT NULL,
-    stat_title_id INTEGER NOT NULL,
-    FOREIGN KEY (stat_title_id) REFERENCES stat_titles(stat_title_id)
-);
-
-CREATE TABLE IF NOT EXISTS teams (
-    team_id INTEGER PRIMARY KEY,
-    team_name TEXT NOT NULL UNIQUE
-);
-
-CREATE TABLE IF NOT EXISTS players (
-    player_id INTEGER PRIMARY KEY,
-    player_name TEXT NOT NULL,
-    team_id INTEGER NOT NULL,
-    FOREIGN KEY (team_id) REFERENCES teams(team_id)
-);
-
-CREATE TABLE IF NOT EXISTS years (
-    year_id INTEGER PRIMARY KEY,
-    year INTEGER NOT NULL UNIQUE
-);
-
-CREATE TABLE IF NOT EXISTS leagues (
-    league_id INTEGER PRIMARY KEY,
-    league TEXT NOT NULL UNIQUE
-);
-
-CREATE TABLE IF NOT EXISTS last_5_ys_yearly_stats (
-    statistic_id INTEGER NOT NULL,
-    player_id INTEGER NOT NULL,
-    no REAL,
-    top_25 TEXT,
-    year_id INTEGER NOT NULL,
-    league_id INTEGER NOT NULL,
-    FOREIGN KEY (statistic_id) REFERENCES statistics(statistic_id),
-    FOREIGN KEY (player_id) REFERENCES players(player_id),
-    FOREIGN KEY (year_id) REFERENCES years(year_id),
-    FOREIGN KEY (league_id) REFERENCES leagues(league_id)
-);
-"""
-
-with open(schema_file, 'w') as f:
-    f.write(schema_sql)
-
-# -----------------------------
-# STEP 3: EXECUTE SCHEMA
+# STEP 2: READ SCHEMA
 # -----------------------------
-engine = create_engine(f'sqlite:///{db_path}')
-
-raw_conn = engine.raw_connection()
+# db/schema.sql is the only copy of the schema; step_1's stream and backfill
+# pipelines create their tables from it as well
 try:
-    cursor = raw_conn.cursor()
     with open(schema_file, 'r') as f:
-        cursor.executescript(f.read())
-    raw_conn.commit()
-finally:
-    raw_conn.close()
+        schema_sql = f.read()
+except OSError as e:
+    print(f"ERROR: Could not read the schema from {schema_file}")
+    print(f"{e}")
+    sys.exit(1)
 
 # -----------------------------
-# STEP 4: IMPORT CSV FILES TO DB
+# STEP 3: READ CSV (OR PARQUET) FILES
 # -----------------------------
 # Map CSV file names to table names (adjust as needed)
 csv_to_table = {
@@ -99,11 +53,30 @@ csv_to_table = {
     'last_5_ys_yearly_stats.csv': 'last_5_ys_yearly_stats'
 }
 
-for filename, table_name in csv_to_table.items():
-    path = os.path.join(CSV_DIR, filename)
-    if os.path.exists(path):
-        print(f"Importing {filename} into table '{table_name}'...")
-        df = pd.read_csv(path)
-        df.to_sql(table_name, engine, if_exists='replace', index=False)
-    else:
-        print(f"WARNING: {filename} not found in {CSV_DIR}!")
\ No newline at end of file
+dfs = {}
+if IMPORT_SOURCE == 'parquet':
+    print(f"Reading Parquet snapshot from {PARQUET_DIR}...")
+    dfs = read_parquet_tables(PARQUET_DIR)
+else:
+    for filename, table_name in csv_to_table.items():
+        path = os.path.join(CSV_DIR, filename)
+        if os.path.exists(path):
+            print(f"Reading {filename} for table '{table_name}'...")
+            dfs[table_name] = pd.read_csv(path)
+        else:
+            print(f"WARNING: {filename} not found in {CSV_DIR}!")
+
+# -----------------------------
+# STEP 4: BUILD NEW DB AND SWAP IT IN
+# -----------------------------
+# The new database is built next to the live one (schema, bulk load in one
+# transaction, row count / foreign key checks) and renamed over it, so the
+# dashboard never sees half-imported tables
+try:
+    row_counts = build_and_swap_database(db_path, schema_sql, dfs)
+    for table_name, row_count in row_counts.items():
+        print(f"Imported {row_count} rows into table '{table_name}'")
+    print(f"Swapped new database into {db_path}")
+except Exception as e:
+    print(f"ERROR: Import failed, {db_path} was left unchanged")
+    print(f"{e}")
@@ -1,10 +1,21 @@
-import pandas as pd
-from sqlalchemy import create_engine, text
+import sys
+from db_connection import DB_PATH, get_engine
+import stats_queries
+
+def available_years(engine):
+    # Seasons in the database: the recent window, or every backfilled season (STATS_DB_PATH)
+    try:
+        return stats_queries.distinct_values(engine, 'years', 'year', order_by='year')
+    except Exception as e:
+        print(f"{e}")
+        return ['2021', '2022', '2023', '2024', '2025']
 
 def get_statistics_by_league_year_stat_title(engine):
     try:
+        allowed_years = available_years(engine)
+
         # Ask user for inputs
-        year = input("Enter year (choose one from 2021 to 2025): ").strip()
+        year = input(f"Enter year (choose one from {allowed_years[0]} to {allowed_years[-1]}): ").strip()
         league = input("Enter league name ('American League' or 'National League'): ").strip()
         stat_title = input("Enter statistic group ('Hitting Statistics' or 'Pitching Statistics'): ").strip()
         sort_column = input("Sort by column (choose one: 'no', 'player_name', 'team_name', 'statistic'): ").strip()
@@ -20,7 +31,6 @@ def get_statistics_by_league_year_stat_title(engine):
             print(f"Invalid league. Defaulting to '{allowed_leagues[0]}'.")
             league = allowed_leagues[0]
 
-        allowed_years = ['2021', '2022', '2023', '2024', '2025']
         if year not in allowed_years:
             print(f"Invalid year. Defaulting to '{allowed_years[0]}'.")
             year = allowed_years[0]
@@ -35,28 +45,7 @@ def get_statistics_by_league_year_stat_title(engine):
             print(f"Invalid sort column. Defaulting to 'statistic'.")
             sort_column = 'statistic'
 
-        query = text(f"""
-            SELECT 
-                s.statistic AS "Statistic",
-                ls.no AS "Results",
-                p.player_name AS "Player Name",
-                t.team_name AS "Team Name"
-            FROM last_5_ys_yealy_stats AS ls
-            JOIN statistics AS s ON ls.statistic_id = s.statistic_id
-            JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
-            JOIN players AS p ON ls.player_id = p.player_id
-            JOIN teams AS t ON p.team_id = t.team_id
-            JOIN years AS y ON ls.year_id = y.year_id
-            JOIN leagues AS l ON ls.league_id = l.league_id
-            WHERE l.league = :league AND y.year = :year AND st.stat_title = :stat_title
-            ORDER BY {sort_column} {sort_order.upper()};
-        """)
-
-        df = pd.read_sql(query, engine, params={
-            'year': int(year),
-            'league': league,
-            'stat_title': stat_title
-        })
+        df = stats_queries.stats_by_league_year_title(engine, league, int(year), stat_title, sort_column, sort_order)
 
         return df, year, league, stat_title
     
@@ -116,27 +105,7 @@ def top_25_players_ranked(engine):
             else:
                 print("Invalid choice, try again.")
 
-        query = text(f"""
-            SELECT 
-                p.player_name AS "Player Name",
-                ls.no AS "Results",
-                s.statistic AS "Statistic",
-                y.year AS "Year"
-            FROM last_5_ys_yealy_stats AS ls
-            JOIN statistics AS s ON ls.statistic_id = s.statistic_id
-            JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
-            JOIN players AS p ON ls.player_id = p.player_id
-            JOIN years AS y ON ls.year_id = y.year_id
-            JOIN leagues AS l ON ls.league_id = l.league_id
-            WHERE l.league = :league AND st.stat_title = :stat_title AND s.statistic = :statistic
-            ORDER BY ls.no DESC;
-        """)
-
-        df = pd.read_sql(query, engine, params={
-            'league': league,
-            'stat_title': stat_title,
-            'statistic': statistic_name
-        })
+        df = stats_queries.statistic_ranking(engine, league, stat_title, statistic_name)
 
         # Drop rows with NaN in 'Results'
         df = df.dropna(subset=['Results'])
@@ -154,20 +123,7 @@ def top_25_players_ranked(engine):
 
 def all_top_25_players_2021_2025(engine):
     try:
-        query = text(f"""
-            SELECT 
-                l.league AS "League",
-                t.team_name AS "Team Name",
-                p.player_name AS "Player Name"
-            FROM last_5_ys_yealy_stats AS ls
-            JOIN players AS p ON ls.player_id = p.player_id
-            JOIN teams AS t ON p.team_id = t.team_id
-            JOIN leagues AS l ON ls.league_id = l.league_id
-            GROUP BY t.team_name, p.player_name
-            ORDER BY t.team_name, p.player_name DESC
-        """)
-
-        df = pd.read_sql(query, engine)
+        df = stats_queries.top_25_players(engine)
 
         return df
 
@@ -176,20 +132,7 @@ def all_top_25_players_2021_2025(engine):
 
 def top_25_players_per_team_2021_2025(engine):
     try:
-        query = text(f"""
-            SELECT 
-                l.league AS "League",
-                t.team_name AS "Team Name",
-                COUNT(DISTINCT p.player_id) AS "Number of Top 25 Players"
-            FROM last_5_ys_yealy_stats AS ls
-            JOIN players AS p ON ls.player_id = p.player_id
-            JOIN teams AS t ON p.team_id = t.team_id
-            JOIN leagues AS l ON ls.league_id = l.league_id
-            GROUP BY t.team_name
-            ORDER BY "Number of Top 25 Players" DESC
-        """)
-
-        df = pd.read_sql(query, engine)
+        df = stats_queries.players_per_team(engine)
 
         return df
 
@@ -197,14 +140,20 @@ def top_25_players_per_team_2021_2025(engine):
         print(f"{e}")
 
 def main():
-    engine = create_engine('sqlite:///db/baseball_stats.db')
+    engine = get_engine()
+    years = available_years(engine)
+    # An empty database (e.g. a history database before the first backfill) has nothing to query
+    if not years:
+        print(f"ERROR: No seasons found in {DB_PATH}, load data with step_1_scrape_data.py first")
+        sys.exit(1)
+    year_range = f"from {years[0]} to {years[-1]}"
 
     while True:
         print("\nMenu:")
         print("1. One year statistics")
         print("2. Top 25 players ranked")
-        print("3. All top 25 players from 2021 to 2025")
-        print("4. Number of top 25 Players per taem from 2021 to 2025")
+        print(f"3. All top 25 players {year_range}")
+        print(f"4. Number of top 25 Players per taem {year_range}")
         print("5. Exit")
         choice = input("Enter your choice: ").strip()
 
@@ -228,7 +177,7 @@ def main():
             if result:
                 df, league, stat_title, statistic_name = result
                 if not df.empty:
-                    print("\n Top 25 Players from 2021 to 2025 ranked:")
+                    print(f"\n Top 25 Players {year_range} ranked:")
                     print(f"    {statistic_name} in {stat_title}, {league}:\n")
                     print(df)
                 else:
@@ -240,7 +189,7 @@ def main():
             df = all_top_25_players_2021_2025(engine)
             if df is not None:
                 if not df.empty:
-                    print("\n All top 25 Players from 2021 to 2025:")
+                    print(f"\n All top 25 Players {year_range}:")
                     print(df)
                 else:
                     print("\n No results found for the given filters.")
@@ -249,7 +198,7 @@ def main():
             df = top_25_players_per_team_2021_2025(engine)
             if df is not None:
                 if not df.empty:
-                    print("\n Number of top 25 Players per taem from 2021 to 2025:")
+                    print(f"\n Number of top 25 Players per taem {year_range}:")
                     print(df)
                 else:
                     print("\n No results found for the given filters.")
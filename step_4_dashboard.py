@@ -1,26 +1,38 @@
 import streamlit as st  
 import pandas as pd    
 import os
-from sqlalchemy import create_engine, text
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+from concurrent.futures import as_completed
+from db_connection import DB_PATH, db_version, get_engine
+from columnar_engine import get_columnar_stats
+from figure_cache import cached_figure
+import stats_queries
 
 # --- Database connection setup ---
-db_folder = 'db'
-db_name = 'baseball_stats.db'
-db_path = os.path.join(db_folder, db_name)
-os.makedirs(db_folder, exist_ok=True)
-DATABASE_URL = f"sqlite:///{db_path}"
-engine = create_engine(DATABASE_URL)
+# db/baseball_stats.db, or the database STATS_DB_PATH points at (e.g. db/baseball_history.db)
+db_path = DB_PATH
+os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+# --- Cached resources ---
+# The engine (and with QUERY_ENGINE=memory the columnar arrays) is a Streamlit resource shared
+# by every session and keyed by the database file version, so the first rerun after
+# step_2_db_import.py swapped in a new file opens the new one
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_database(path, version):
+    engine = get_engine(path)
+    if stats_queries.QUERY_ENGINE == 'memory':
+        get_columnar_stats(path)
+    return engine
+
+def get_dashboard_engine():
+    return load_database(db_path, db_version(db_path))
 
 # --- Helper Functions ---
 def fetch_distinct_column_values(engine, table, column, order_by=None, fallback=None):
     try:
-        order_clause = f"ORDER BY {order_by or column}"
-        query = f"SELECT DISTINCT {column} FROM {table} {order_clause}"
-        df = pd.read_sql(query, engine)
-        values = df[column].astype(str).tolist()
+        values = stats_queries.distinct_values(engine, table, column, order_by)
         if not values:
             raise ValueError("No values found.")
         return values
@@ -34,15 +46,7 @@ def fetch_distinct_column_values(engine, table, column, order_by=None, fallback=
 
 def fetch_statistics_by_title(engine, stat_title, fallback=None):
     try:
-        query = text("""
-            SELECT s.statistic 
-            FROM statistics AS s
-            JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
-            WHERE st.stat_title = :stat_title
-            ORDER BY s.statistic
-        """)
-        df = pd.read_sql(query, engine, params={'stat_title': stat_title})
-        values = df['statistic'].astype(str).tolist()
+        values = stats_queries.statistics_by_title(engine, stat_title)
         if not values:
             raise ValueError("No statistics found.")
         return values
@@ -53,7 +57,152 @@ def fetch_statistics_by_title(engine, stat_title, fallback=None):
         else:
             st.error(f"Failed to fetch statistics for {stat_title}: {e}")
             return []
-        
+
+# --- Chart data and figures ---
+# Pure functions (no Streamlit calls), so they can run and be timed outside the app
+def yearly_chart_data(df):
+    """
+    Prepare one statistic's yearly results for the bar chart.
+
+    Args:
+        df (pd.DataFrame): Result of stats_queries.statistic_results().
+
+    Returns:
+        tuple: (DataFrame without empty results and with Year as an ordered category, sorted list of years)
+    """
+    df = df.dropna()
+
+    # Ensure values are numeric
+    df["Results"] = pd.to_numeric(df["Results"], errors='coerce')
+
+    # Ensure Year is string and ordered
+    df['Year'] = df['Year'].astype(str)
+    year_order = sorted(df['Year'].unique(), key=int)
+    df['Year'] = pd.Categorical(df['Year'], categories=year_order, ordered=True)
+    return df, year_order
+
+def yearly_bar_chart(df, year_order, league, stat_title, statistic):
+    # Create single bar trace
+    fig = go.Figure(data=[
+        go.Bar(
+            x=df['Year'],
+            y=df['Results'],
+        )
+    ])
+
+    # Layout
+    fig.update_layout(
+        title={
+            'text': f"{statistic} for {league} - {stat_title}",
+            'font': dict(size=20)
+        },
+        xaxis=dict(
+            title='Years',
+            type='category',
+            categoryorder='array',
+            categoryarray=year_order,
+            tickmode='linear'
+        ),
+        yaxis=dict(
+            title='Results'
+        ),
+        bargap=0.15,
+        bargroupgap=0.05,
+        height=500
+    )
+    return fig
+
+def league_comparison_data(df_leagues):
+    """
+    Prepare both leagues' results of one statistic for the line chart (numeric, complete, by year).
+    """
+    # Ensure clean data
+    df_leagues["Year"] = pd.to_numeric(df_leagues["Year"], errors="coerce").astype(int)
+    df_leagues["Results"] = pd.to_numeric(df_leagues["Results"], errors="coerce")
+    df_leagues = df_leagues.dropna(subset=["Year", "Results", "League"])
+
+    return df_leagues.sort_values("Year")
+
+def league_comparison_chart(df_leagues, stat_title, statistic):
+    fig = px.line(
+        df_leagues,
+        x="Year",
+        y="Results",
+        color="League", 
+        markers=True,
+        title=f"American League and National League <br>{stat_title} {statistic} Over Time Compparison"
+    )
+    fig.update_layout(
+        height=500,
+        title={
+            'font': dict(size=20)
+        },
+        xaxis=dict(
+            tickmode='linear',
+            dtick=1  # Force every year to appear
+        )
+    )
+    return fig
+
+def ranking_table(df):
+    """
+    Turn a statistic ranking into the displayed table: Rank, Player Name, Results (0.000), Year.
+    """
+    #  Drop NAs
+    df = df.dropna(subset=['Results'])
+    # Show all decimals in 0.000 format without modifying actual values
+    df['Results'] = df['Results'].apply(lambda x: f"{x:.3f}" if pd.notnull(x) else "")
+    # Add rank column
+    df['Rank'] = range(1, len(df) + 1)
+    # Reorder columns
+    return df[['Rank', 'Player Name', 'Results', 'Year']]
+
+def player_sunburst(filtered_data):
+    # Plot the chart
+    fig = px.sunburst(
+        filtered_data,
+        path=['Team Name', 'Player Name'],
+        values='Count'
+    )
+    fig.update_layout(
+        width=700,
+        height=700
+    )
+    return fig
+
+# --- Page sections ---
+# Query + chart of one part of a page; no Streamlit calls, so they can run in stats_queries' worker pool.
+# Figures come from figure_cache, so an unchanged selection skips the chart building
+def yearly_results_section(engine, league, stat_title, statistic):
+    """
+    One statistic's yearly results in one league and their bar chart.
+
+    Returns:
+        tuple: (results DataFrame, bar chart), the chart is None if there are no results.
+    """
+    df = stats_queries.statistic_results(engine, league, stat_title, statistic)
+    if df.empty:
+        return df, None
+
+    def build():
+        chart_df, year_order = yearly_chart_data(df)
+        return yearly_bar_chart(chart_df, year_order, league, stat_title, statistic)
+
+    params = {'league': league, 'stat_title': stat_title, 'statistic': statistic}
+    return df, cached_figure(engine, 'yearly_bar_chart', params, build)
+
+def league_comparison_section(engine, stat_title, statistic):
+    """
+    Line chart of one statistic in both leagues over time.
+    """
+    def build():
+        # --- Pull both leagues explicitly for second chart ---
+        df_leagues = league_comparison_data(stats_queries.league_comparison(engine, stat_title, statistic))
+        return league_comparison_chart(df_leagues, stat_title, statistic)
+
+    params = {'stat_title': stat_title, 'statistic': statistic}
+    return cached_figure(engine, 'league_comparison_chart', params, build)
+
 # --- Dashboard functions ---
 
 def get_statistics_by_league_stat_title(engine):
@@ -98,127 +247,33 @@ def get_statistics_by_league_stat_title(engine):
         selected_statistic = st.selectbox("Choose Specific Statistic", statistic_options)
 
     try:
-        query = text("""
-            SELECT 
-                s.statistic AS "Statistic",
-                ls.no AS "Results",
-                p.player_name AS "Player Name",
-                t.team_name AS "Team Name",
-                y.year AS "Year"
-            FROM last_5_ys_yealy_stats AS ls
-            JOIN statistics AS s ON ls.statistic_id = s.statistic_id
-            JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
-            JOIN players AS p ON ls.player_id = p.player_id
-            JOIN teams AS t ON p.team_id = t.team_id
-            JOIN years AS y ON ls.year_id = y.year_id
-            JOIN leagues AS l ON ls.league_id = l.league_id
-            WHERE l.league = :league 
-              AND st.stat_title = :stat_title
-              AND s.statistic = :statistic
-        """)
-
-        df = pd.read_sql(query, engine, params={
-            'league': selected_league,
-            'stat_title': selected_stat_title,
-            'statistic': selected_statistic
-        })
-        
-        if df.empty:
-            st.warning("No data found for the selected filters.")
-            return
-
-        # Dinamic title
-        st.subheader(f"Showing {selected_statistic} for {selected_league} - {selected_stat_title}")
-        st.dataframe(df, use_container_width=True)
-
-        df = df.dropna()
-
-        # Ensure values are numeric
-        df["Results"] = pd.to_numeric(df["Results"], errors='coerce')
-
-        # Ensure Year is string and ordered
-        df['Year'] = df['Year'].astype(str)
-        year_order = sorted(df['Year'].unique(), key=int)
-        df['Year'] = pd.Categorical(df['Year'], categories=year_order, ordered=True)
-
-        # Create single bar trace
-        fig = go.Figure(data=[
-            go.Bar(
-                x=df['Year'],
-                y=df['Results'],
-            )
-        ])
-
-        # Layout
-        fig.update_layout(
-            title={
-                'text': f"{selected_statistic} for {selected_league} - {selected_stat_title}",
-                'font': dict(size=20)
-            },
-            xaxis=dict(
-                title='Years',
-                type='category',
-                categoryorder='array',
-                categoryarray=year_order,
-                tickmode='linear'
-            ),
-            yaxis=dict(
-                title='Results'
-            ),
-            bargap=0.15,
-            bargroupgap=0.05,
-            height=500
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Plot comparison chart
-        # --- Pull both leagues explicitly for second chart ---
-        league_query = text("""
-            SELECT 
-                l.league AS "League",
-                y.year AS "Year",
-                ls.no AS "Results"
-            FROM last_5_ys_yealy_stats AS ls
-            JOIN statistics AS s ON ls.statistic_id = s.statistic_id
-            JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
-            JOIN years AS y ON ls.year_id = y.year_id
-            JOIN leagues AS l ON ls.league_id = l.league_id
-            WHERE st.stat_title = :stat_title
-            AND s.statistic = :statistic
-        """)
-
-        df_leagues = pd.read_sql(league_query, engine, params={
-            'stat_title': selected_stat_title,
-            'statistic': selected_statistic
-        })
-
-        # Ensure clean data
-        df_leagues["Year"] = pd.to_numeric(df_leagues["Year"], errors="coerce").astype(int)
-        df_leagues["Results"] = pd.to_numeric(df_leagues["Results"], errors="coerce")
-        df_leagues = df_leagues.dropna(subset=["Year", "Results", "League"])
-
-        df_leagues = df_leagues.sort_values("Year")
-
-        fig2 = px.line(
-            df_leagues,
-            x="Year",
-            y="Results",
-            color="League", 
-            markers=True,
-            title=f"American League and National League <br>{selected_stat_title} {selected_statistic} Over Time Compparison"
-        )
-        fig2.update_layout(
-            height=500,
-            title={
-                'font': dict(size=20)
-            },
-            xaxis=dict(
-                tickmode='linear',
-                dtick=1  # Force every year to appear
-            )
-        )
-        st.plotly_chart(fig2, use_container_width=True)
+        # Both sections are fetched and built at the same time; each is drawn into
+        # its place on the page as soon as it is ready
+        yearly_future = stats_queries.submit(yearly_results_section, 
+            engine, selected_league, selected_stat_title, selected_statistic)
+        comparison_future = stats_queries.submit(league_comparison_section, 
+            engine, selected_stat_title, selected_statistic)
+
+        yearly_container = st.container()
+        comparison_slot = st.empty()
+
+        for future in as_completed([yearly_future, comparison_future]):
+            if future is comparison_future:
+                # Plot comparison chart
+                comparison_slot.plotly_chart(future.result(), use_container_width=True)
+                continue
+
+            df, fig = future.result()
+            if fig is None:
+                yearly_container.warning("No data found for the selected filters.")
+                comparison_slot.empty()
+                return
+
+            with yearly_container:
+                # Dinamic title
+                st.subheader(f"Showing {selected_statistic} for {selected_league} - {selected_stat_title}")
+                st.dataframe(df, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
 
     except Exception as e:
         st.error(f"An error occurred: {e}")
@@ -244,75 +299,15 @@ def top_25_players_ranked(engine):
         statistic_name = st.selectbox("Choose Specific Statistic", statistic_options)
 
     try:
-        query = text("""
-            SELECT 
-                p.player_name AS "Player Name",
-                t.team_name AS "Team Name",
-                ls.no AS "Results",
-                s.statistic AS "Statistic",
-                y.year AS "Year"
-            FROM last_5_ys_yealy_stats AS ls
-            JOIN statistics AS s ON ls.statistic_id = s.statistic_id
-            JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
-            JOIN players AS p ON ls.player_id = p.player_id
-            JOIN teams AS t ON p.team_id = t.team_id
-            JOIN years AS y ON ls.year_id = y.year_id
-            JOIN leagues AS l ON ls.league_id = l.league_id
-            WHERE l.league = :league 
-              AND st.stat_title = :stat_title 
-              AND s.statistic = :statistic
-            ORDER BY ls.no DESC
-        """)
-
-        df = pd.read_sql(query, engine, params={
-            'league': league,
-            'stat_title': stat_title,
-            'statistic': statistic_name
-        })
-
-        #  Drop NAs
-        df = df.dropna(subset=['Results'])
-        # Show all decimals in 0.000 format without modifying actual values
-        df['Results'] = df['Results'].apply(lambda x: f"{x:.3f}" if pd.notnull(x) else "")
-        # Add rank column
-        df['Rank'] = range(1, len(df) + 1)
-        # Reorder columns
-        df = df[['Rank', 'Player Name', 'Results', 'Year']]
+        df = ranking_table(stats_queries.statistic_ranking(engine, league, stat_title, statistic_name))
 
         # Dinamic title
         st.subheader(f"Top 25 {statistic_name} in {league} - {stat_title} (2021-2024)")
         st.dataframe(df, use_container_width=True)
 
-        # Query all player stats with team and year
-        player_counts_query = text("""
-            SELECT 
-                p.player_name AS "Player Name",
-                t.team_name AS "Team Name",
-                ls.no AS "Results",
-                s.statistic AS "Statistic",
-                y.year AS "Year"
-            FROM last_5_ys_yealy_stats AS ls
-            JOIN players AS p ON ls.player_id = p.player_id
-            JOIN teams AS t ON p.team_id = t.team_id
-            JOIN statistics AS s ON ls.statistic_id = s.statistic_id
-            JOIN stat_titles AS st ON s.stat_title_id = st.stat_title_id
-            JOIN years AS y ON ls.year_id = y.year_id
-            JOIN leagues AS l ON ls.league_id = l.league_id
-        """)
-
-        # Run the query (no params needed)
-        player_counts = pd.read_sql(player_counts_query, engine)
-
-        # Replace "To Be Determined" with NaN, then drop rows with NaN in 'Team Name'
-        player_counts['Team Name'] = player_counts['Team Name'].replace("To Be Determined", np.nan)
-        player_counts = player_counts.dropna()
-
-        player_counts = (
-            player_counts.groupby(['Team Name', 'Player Name'])
-            .size()
-            .reset_index(name='Count')
-        )
-        
+        # Appearances per player are precomputed at load time (player_top25_counts)
+        max_count = stats_queries.max_player_appearances(engine)
+
         # Chart title
         st.subheader("Number of Times Each Player Was Best (2021–2024)")
         
@@ -320,24 +315,14 @@ def top_25_players_ranked(engine):
         min_count = st.slider(
         "Minimum Wins per Player",
         min_value=1,
-        max_value=int(player_counts['Count'].max()),
+        max_value=int(max_count),
         value=st.session_state.get("min_count", 1),
         key="min_count"
     )
 
-        # Filter data
-        filtered_data = player_counts[player_counts['Count'] >= min_count]
-
-        # Plot the chart
-        fig = px.sunburst(
-            filtered_data,
-            path=['Team Name', 'Player Name'],
-            values='Count'
-        )
-        fig.update_layout(
-            width=700,
-            height=700
-        )
+        # Filter data (only on a figure cache miss)
+        fig = cached_figure(engine, 'player_sunburst', {'min_count': min_count},
+            lambda: player_sunburst(stats_queries.player_appearances(engine, min_count)))
         st.plotly_chart(fig, use_container_width=True)
 
     except Exception as e:
@@ -345,6 +330,8 @@ def top_25_players_ranked(engine):
 
 # --- Main ---
 if __name__ == "__main__":
+    # Reopened automatically when step_2_db_import.py swaps in a new database file
+    engine = get_dashboard_engine()
     page = st.sidebar.selectbox("Choose Page", ["Yearly Best Results", "Best Players Ranked"])
     if page == "Yearly Best Results":
         get_statistics_by_league_stat_title(engine)
@@ -0,0 +1,171 @@
+import hashlib
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from db_loader import (build_and_swap_database, shadow_path, start_shadow_database,
+                       swap_in_database)
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(REPO_DIR, 'db', 'schema.sql')
+CSV_DIR = os.path.join(REPO_DIR, 'csv')
+
+
+def file_md5(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def row_count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def leftover_files(db_path):
+    new_path = shadow_path(db_path)
+    return [new_path + suffix for suffix in ('', '-wal', '-shm', '-journal')
+            if os.path.exists(new_path + suffix)]
+
+
+@pytest.fixture(scope='module')
+def schema_sql():
+    with open(SCHEMA_PATH) as f:
+        return f.read()
+
+
+@pytest.fixture
+def dfs():
+    return {
+        name[:-len('.csv')]: pd.read_csv(os.path.join(CSV_DIR, name))
+        for name in os.listdir(CSV_DIR) if name.endswith('.csv')
+    }
+
+
+@pytest.fixture
+def live_db(tmp_path, schema_sql, dfs):
+    # A live database holding the current csv/ tables
+    db_path = str(tmp_path / 'baseball_stats.db')
+    build_and_swap_database(db_path, schema_sql, dfs)
+    return db_path
+
+
+def test_build_loads_every_table(live_db, dfs):
+    for table, df in dfs.items():
+        assert row_count(live_db, table) == len(df)
+    assert row_count(live_db, 'yearly_stats_wide') == len(dfs['last_5_ys_yearly_stats'])
+    assert row_count(live_db, 'player_top25_counts') > 0
+    assert leftover_files(live_db) == []
+
+
+def test_swap_replaces_the_live_database(live_db, schema_sql, dfs):
+    dfs['last_5_ys_yearly_stats'] = dfs['last_5_ys_yearly_stats'].iloc[:10]
+
+    row_counts = build_and_swap_database(live_db, schema_sql, dfs)
+
+    assert row_counts['last_5_ys_yearly_stats'] == 10
+    assert row_count(live_db, 'last_5_ys_yearly_stats') == 10
+    assert row_count(live_db, 'yearly_stats_wide') == 10
+    assert leftover_files(live_db) == []
+
+
+def test_failed_validation_leaves_live_database_untouched(live_db, schema_sql, dfs):
+    before = file_md5(live_db)
+    # Fact rows of a player that is not in the players table
+    dfs['players'] = dfs['players'].iloc[1:]
+
+    with pytest.raises(ValueError, match='failed validation'):
+        build_and_swap_database(live_db, schema_sql, dfs)
+
+    assert file_md5(live_db) == before
+    assert leftover_files(live_db) == []
+
+
+def test_failed_load_leaves_live_database_untouched(live_db, schema_sql, dfs):
+    before = file_md5(live_db)
+    # A NOT NULL lookup column without values
+    dfs['teams'] = dfs['teams'].assign(team_name=None)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        build_and_swap_database(live_db, schema_sql, dfs)
+
+    assert file_md5(live_db) == before
+    assert leftover_files(live_db) == []
+
+
+def test_shadow_copy_is_swapped_in_after_changes(live_db):
+    new_path = start_shadow_database(live_db)
+    conn = sqlite3.connect(new_path)
+    with conn:
+        conn.execute("DELETE FROM last_5_ys_yearly_stats WHERE year_id = 0")
+    remaining = conn.execute("SELECT COUNT(*) FROM last_5_ys_yearly_stats").fetchone()[0]
+    conn.close()
+
+    swap_in_database(new_path, live_db)
+
+    assert row_count(live_db, 'last_5_ys_yearly_stats') == remaining
+    # The read model is rebuilt from the facts before the swap
+    assert row_count(live_db, 'yearly_stats_wide') == remaining
+    assert leftover_files(live_db) == []
+
+
+def test_failed_shadow_validation_keeps_live_database(live_db):
+    before = file_md5(live_db)
+    new_path = start_shadow_database(live_db)
+    conn = sqlite3.connect(new_path)
+    with conn:
+        conn.execute("DELETE FROM players")
+    conn.close()
+
+    with pytest.raises(ValueError, match='failed validation'):
+        swap_in_database(new_path, live_db)
+
+    assert file_md5(live_db) == before
+    assert leftover_files(live_db) == []
+
+
+def test_resume_keeps_an_interrupted_shadow(live_db):
+    new_path = start_shadow_database(live_db)
+    conn = sqlite3.connect(new_path)
+    with conn:
+        conn.execute("DELETE FROM last_5_ys_yearly_stats")
+    conn.close()
+
+    assert start_shadow_database(live_db, resume=True) == new_path
+    assert row_count(new_path, 'last_5_ys_yearly_stats') == 0
+
+    # Without resume the shadow starts over from the live database
+    start_shadow_database(live_db)
+    assert row_count(new_path, 'last_5_ys_yearly_stats') == row_count(live_db, 'last_5_ys_yearly_stats')
+
+
+def test_swap_removes_the_old_files_sidecars(live_db, schema_sql, dfs):
+    # Left by a reader or an earlier run on the old file in WAL mode
+    for suffix in ('-wal', '-shm'):
+        with open(live_db + suffix, 'wb') as f:
+            f.write(b'old file')
+
+    build_and_swap_database(live_db, schema_sql, dfs)
+
+    assert not os.path.exists(live_db + '-wal')
+    assert not os.path.exists(live_db + '-shm')
+    assert row_count(live_db, 'last_5_ys_yearly_stats') == len(dfs['last_5_ys_yearly_stats'])
+
+
+def test_locked_live_database_is_reported(live_db, schema_sql, dfs, monkeypatch):
+    before = file_md5(live_db)
+
+    def locked(src, dst):
+        raise PermissionError(13, 'The process cannot access the file', dst)
+    monkeypatch.setattr(os, 'replace', locked)
+
+    with pytest.raises(PermissionError, match='open in another program'):
+        build_and_swap_database(live_db, schema_sql, dfs)
+
+    assert file_md5(live_db) == before
+    # The finished database is kept for the next attempt
+    assert os.path.exists(shadow_path(live_db))
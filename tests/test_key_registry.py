@@ -0,0 +1,175 @@
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from key_registry import REGISTRY_KEYS, load_registry, registry_from_tables, save_registry
+from normalization import normalize_stats
+from scrape_stream import StatsDbWriter
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(REPO_DIR, 'db', 'schema.sql')
+
+
+def stats_rows(rows):
+    return pd.DataFrame(rows, columns=['statistic', 'player_name', 'team_name', 'no', 'top_25',
+                                       'year', 'league', 'stat_title'])
+
+
+FIRST_RUN = stats_rows([
+    ['Home Runs', 'Shohei Ohtani', 'Los Angeles Angels', 46.0, 'Top 25', '2021', 'American League', 'Hitting Statistics'],
+    ['Wins', 'Gerrit Cole', 'New York Yankees', 16.0, 'Top 25', '2021', 'American League', 'Pitching Statistics'],
+    ['Home Runs', 'Fernando Tatis', 'San Diego Padres', 42.0, 'Top 25', '2021', 'National League', 'Hitting Statistics'],
+])
+
+# Next season: one player changed teams, a new player and statistic show up, 2021 is gone
+SECOND_RUN = stats_rows([
+    ['Home Runs', 'Aaron Judge', 'New York Yankees', 62.0, 'Top 25', '2022', 'American League', 'Hitting Statistics'],
+    ['Home Runs', 'Shohei Ohtani', 'Los Angeles Dodgers', 54.0, 'Top 25', '2022', 'National League', 'Hitting Statistics'],
+    ['Saves', 'Gerrit Cole', 'New York Yankees', 0.0, 'Top 25', '2022', 'American League', 'Pitching Statistics'],
+])
+
+
+def run(stats, registry_path):
+    # What step_1 does per run: normalize with the registry ids, then append the new keys
+    normalized = normalize_stats(stats, load_registry(registry_path))
+    save_registry(registry_from_tables(normalized), registry_path)
+    return normalized
+
+
+def ids_by_key(registry, table):
+    id_col, key_cols = REGISTRY_KEYS[table]
+    return {tuple(row[key_cols]): row[id_col] for _, row in registry[table].iterrows()}
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    return str(tmp_path / 'key_registry.db')
+
+
+def test_missing_registry_is_empty(registry_path):
+    assert load_registry(registry_path) == {}
+
+
+def test_rerun_gives_the_same_tables(registry_path):
+    first = run(FIRST_RUN, registry_path)
+    second = run(FIRST_RUN.iloc[::-1].reset_index(drop=True), registry_path)
+
+    for table in REGISTRY_KEYS:
+        pd.testing.assert_frame_equal(second[table], first[table])
+
+
+def test_known_keys_keep_their_ids_across_runs(registry_path):
+    run(FIRST_RUN, registry_path)
+    before = load_registry(registry_path)
+    run(SECOND_RUN, registry_path)
+    after = load_registry(registry_path)
+
+    for table in REGISTRY_KEYS:
+        old_ids = ids_by_key(before, table)
+        new_ids = ids_by_key(after, table)
+        # Append-only: every key keeps its id, even if it is no longer scraped
+        assert {key: new_ids[key] for key in old_ids} == old_ids
+        # New keys get ids after the ones already given out
+        added = set(new_ids) - set(old_ids)
+        assert all(new_ids[key] > max(old_ids.values()) for key in added)
+        assert len(set(new_ids.values())) == len(new_ids)
+
+    players = ids_by_key(after, 'players')
+    assert players[('Shohei Ohtani', 'Los Angeles Angels')] != players[('Shohei Ohtani', 'Los Angeles Dodgers')]
+
+
+def test_normalized_ids_come_from_the_registry(registry_path):
+    run(FIRST_RUN, registry_path)
+    registry = load_registry(registry_path)
+    second = run(SECOND_RUN, registry_path)
+
+    players = second['players'].merge(second['teams'], on='team_id')
+    cole = players.loc[players['player_name'] == 'Gerrit Cole']
+    assert cole['player_id'].tolist() == [ids_by_key(registry, 'players')[('Gerrit Cole', 'New York Yankees')]]
+    assert cole['team_id'].tolist() == [ids_by_key(registry, 'teams')[('New York Yankees',)]]
+
+
+def test_stream_writer_uses_the_same_ids(registry_path, tmp_path):
+    run(FIRST_RUN, registry_path)
+    registry = load_registry(registry_path)
+
+    writer = StatsDbWriter(str(tmp_path / 'stats.db'), SCHEMA_PATH, registry_path=registry_path)
+    for (year, league), page in SECOND_RUN.groupby(['year', 'league']):
+        writer.write_page(year, league, page.to_dict('records'))
+    writer.close()
+
+    conn = sqlite3.connect(str(tmp_path / 'stats.db'))
+    try:
+        db_players = {
+            (name, team): player_id for player_id, name, team in conn.execute(
+                "SELECT p.player_id, p.player_name, t.team_name FROM players AS p JOIN teams AS t USING (team_id)")
+        }
+    finally:
+        conn.close()
+
+    assert db_players[('Gerrit Cole', 'New York Yankees')] == \
+        ids_by_key(registry, 'players')[('Gerrit Cole', 'New York Yankees')]
+    # Keys first given out by the writer are recorded in the registry too
+    assert ids_by_key(load_registry(registry_path), 'players')[('Aaron Judge', 'New York Yankees')] == \
+        db_players[('Aaron Judge', 'New York Yankees')]
+
+
+def write_pages(db_path, registry_path, stats):
+    writer = StatsDbWriter(db_path, SCHEMA_PATH, registry_path=registry_path)
+    for (year, league), page in stats.groupby(['year', 'league']):
+        writer.write_page(year, league, page.to_dict('records'))
+    writer.close()
+
+
+def player_ids(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            (name, team): player_id for player_id, name, team in conn.execute(
+                "SELECT p.player_id, p.player_name, t.team_name FROM players AS p JOIN teams AS t USING (team_id)")
+        }
+    finally:
+        conn.close()
+
+
+def test_databases_sharing_a_registry_get_the_same_ids(registry_path, tmp_path):
+    # The live and the history database are written with one registry
+    live_db = str(tmp_path / 'baseball_stats.db')
+    history_db = str(tmp_path / 'baseball_history.db')
+    write_pages(live_db, registry_path, SECOND_RUN)
+    write_pages(history_db, registry_path, FIRST_RUN)
+    write_pages(live_db, registry_path, FIRST_RUN)
+
+    live_ids = player_ids(live_db)
+    history_ids = player_ids(history_db)
+    for key, player_id in history_ids.items():
+        assert live_ids[key] == player_id
+    registered = ids_by_key(load_registry(registry_path), 'players')
+    assert {key: registered[key] for key in live_ids} == live_ids
+
+
+def test_new_keys_never_take_a_registered_id(registry_path, tmp_path):
+    run(FIRST_RUN, registry_path)
+    registered = ids_by_key(load_registry(registry_path), 'players')
+
+    # A database that has never seen the registry's players
+    db_path = str(tmp_path / 'stats.db')
+    write_pages(db_path, registry_path, SECOND_RUN.iloc[:1])
+
+    assert player_ids(db_path)[('Aaron Judge', 'New York Yankees')] > max(registered.values())
+
+
+def test_database_ids_conflicting_with_the_registry_fail(registry_path, tmp_path):
+    db_path = str(tmp_path / 'stats.db')
+    write_pages(db_path, registry_path, FIRST_RUN)
+
+    # Another registry gave the same players other ids
+    other_registry = str(tmp_path / 'other_registry.db')
+    run(FIRST_RUN.iloc[::-1].reset_index(drop=True).assign(player_name=lambda df: df['player_name'] + ' Jr.'),
+        other_registry)
+    run(FIRST_RUN, other_registry)
+
+    with pytest.raises(ValueError, match='conflicts with the key registry'):
+        StatsDbWriter(db_path, SCHEMA_PATH, registry_path=other_registry)
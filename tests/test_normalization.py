@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from normalization import normalize_stats
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_DIR = os.path.join(REPO_DIR, 'csv')
+
+STATS_COLUMNS = ['statistic', 'player_name', 'team_name', 'no', 'top_25', 'year', 'league', 'stat_title']
+
+
+def read_baseline():
+    # The committed csv/ tables, written by the merge-based normalization
+    return {
+        name[:-len('.csv')]: pd.read_csv(os.path.join(CSV_DIR, name))
+        for name in os.listdir(CSV_DIR) if name.endswith('.csv')
+    }
+
+
+def denormalize(tables):
+    """
+    The flat scrape results the baseline tables were built from, in the same row order.
+    """
+    stats = (tables['last_5_ys_yearly_stats']
+             .merge(tables['statistics'], on='statistic_id', how='left')
+             .merge(tables['stat_titles'], on='stat_title_id', how='left')
+             .merge(tables['players'], on='player_id', how='left')
+             .merge(tables['teams'], on='team_id', how='left')
+             .merge(tables['years'], on='year_id', how='left')
+             .merge(tables['leagues'], on='league_id', how='left'))
+    return stats[STATS_COLUMNS]
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    return read_baseline()
+
+
+def test_matches_baseline_csvs(baseline):
+    normalized = normalize_stats(denormalize(baseline))
+
+    assert set(normalized) == set(baseline)
+    for table, df in normalized.items():
+        with open(os.path.join(CSV_DIR, f"{table}.csv")) as f:
+            assert df.to_csv(index=False) == f.read(), table
+
+
+def test_text_years_give_the_same_tables(baseline):
+    # The scraper hands years over as text
+    stats = denormalize(baseline)
+    stats['year'] = stats['year'].astype(str)
+
+    normalized = normalize_stats(stats)
+    for table, df in normalized.items():
+        with open(os.path.join(CSV_DIR, f"{table}.csv")) as f:
+            assert df.to_csv(index=False) == f.read(), table
+
+
+def test_ids_do_not_depend_on_row_order(baseline):
+    stats = denormalize(baseline)
+    shuffled = stats.sample(frac=1, random_state=0).reset_index(drop=True)
+
+    expected = normalize_stats(stats)
+    actual = normalize_stats(shuffled)
+    for table in ['stat_titles', 'statistics', 'players', 'teams', 'years', 'leagues']:
+        pd.testing.assert_frame_equal(actual[table], expected[table])
+
+
+def test_fact_rows_resolve_to_their_names(baseline):
+    stats = denormalize(baseline)
+    tables = normalize_stats(stats)
+
+    assert len(tables['last_5_ys_yearly_stats']) == len(stats)
+    resolved = denormalize(tables)
+    assert resolved['player_name'].tolist() == stats['player_name'].tolist()
+    assert resolved['team_name'].tolist() == stats['team_name'].tolist()
+    assert resolved['stat_title'].tolist() == stats['stat_title'].tolist()
+    assert np.array_equal(resolved['no'].to_numpy(), stats['no'].to_numpy(), equal_nan=True)
@@ -0,0 +1,97 @@
+import pytest
+
+from scrape_journal import (DONE, FETCH_FAILED, FETCHED, PARSE_FAILED, ScrapeJournal,
+                            content_hash)
+
+PAGE_A = 'https://example.com/yearly/yr2021a.shtml'
+PAGE_N = 'https://example.com/yearly/yr2021n.shtml'
+PAGE_2022 = 'https://example.com/yearly/yr2022a.shtml'
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / 'scrape_journal.db')
+
+
+def open_journal(journal_path, target='csv'):
+    return ScrapeJournal(target, path=journal_path)
+
+
+def interrupted_run(journal_path, target='csv'):
+    # One page done, one failed download, one parse failure; the run never finishes
+    journal = open_journal(journal_path, target)
+    journal.record(PAGE_A, FETCHED, year=2021, league='American League', html=b'<html>a</html>')
+    journal.record(PAGE_A, DONE, row_count=20)
+    journal.record(PAGE_N, FETCH_FAILED, year=2021, league='National League', error='HTTP 503')
+    journal.record(PAGE_2022, FETCHED, year=2022, league='American League', html=b'<html>b</html>')
+    journal.record(PAGE_2022, PARSE_FAILED, error='no stats table')
+    run_id = journal.run_id
+    journal.close()
+    return run_id
+
+
+def test_new_run_starts_empty(journal_path):
+    journal = open_journal(journal_path)
+
+    assert not journal.resumed
+    assert journal.completed_urls() == set()
+    assert journal.failed_pages() == []
+    journal.close()
+
+
+def test_unfinished_run_is_resumed(journal_path):
+    run_id = interrupted_run(journal_path)
+
+    journal = open_journal(journal_path)
+    assert journal.resumed
+    assert journal.run_id == run_id
+    assert journal.completed_urls() == {PAGE_A}
+    assert journal.failed_pages() == [
+        (PAGE_N, FETCH_FAILED, 1, 'HTTP 503'),
+        (PAGE_2022, PARSE_FAILED, 1, 'no stats table'),
+    ]
+    assert journal.status_counts() == {DONE: 1, FETCH_FAILED: 1, PARSE_FAILED: 1}
+    journal.close()
+
+
+def test_retries_keep_the_attempt_count(journal_path):
+    interrupted_run(journal_path)
+
+    journal = open_journal(journal_path)
+    journal.record(PAGE_N, FETCH_FAILED, error='timeout')
+    journal.record(PAGE_N, FETCHED, html=b'<html>n</html>')
+    journal.record(PAGE_N, DONE, row_count=18)
+
+    row = journal.conn.execute(
+        "SELECT year, league, status, attempts, row_count, content_hash, error FROM pages "
+        "WHERE run_id = ? AND url = ?", (journal.run_id, PAGE_N)).fetchone()
+    assert row == (2021, 'National League', DONE, 3, 18, content_hash(b'<html>n</html>'), None)
+    assert journal.completed_urls() == {PAGE_A, PAGE_N}
+    journal.close()
+
+
+def test_finished_run_is_not_resumed(journal_path):
+    run_id = interrupted_run(journal_path)
+    journal = open_journal(journal_path)
+    journal.finish()
+    journal.close()
+
+    journal = open_journal(journal_path)
+    assert not journal.resumed
+    assert journal.run_id != run_id
+    assert journal.completed_urls() == set()
+    journal.close()
+
+
+def test_runs_are_resumed_per_target(journal_path):
+    interrupted_run(journal_path, target='csv')
+
+    journal = open_journal(journal_path, target='db/baseball_history.db')
+    assert not journal.resumed
+    assert journal.completed_urls() == set()
+    journal.close()
+
+    journal = open_journal(journal_path, target='csv')
+    assert journal.resumed
+    assert journal.completed_urls() == {PAGE_A}
+    journal.close()
@@ -0,0 +1,97 @@
+import pytest
+
+from scraper_parse import ROW_FIELDS, iter_page_stats, link_list, parse_html, scrape_stats_table
+
+# ---------------------------------------------------------- #
+# Fixture pages in the site's markup
+# ---------------------------------------------------------- #
+# Hitting table with repeated and empty banner cells, a row with a missing
+# cell, and markup outside table.boxed that must be ignored
+YEAR_PAGE = """
+<html><body>
+<table class="navbar"><tr><td class="datacolBlue">Not a stat</td><td>x</td></tr></table>
+<table class="boxed">
+<tr><td class="header" colspan="5"><h2>2021 American League</h2><p>American League 2021 Hitting Statistics</p></td></tr>
+<tr><td class="banner">Statistic</td><td class="banner">Name(s)</td><td class="banner">Name(s)</td>
+<td class="banner">#</td><td class="banner"></td></tr>
+<tr><td class="datacolBlue">Base on Balls</td><td class="datacolBox">Joey Gallo</td>
+<td class="datacolBox">Texas Rangers</td><td class="datacolBox">111</td><td class="datacolBox">Top 25</td></tr>
+<tr><td class="datacolBlue">Batting Average</td><td class="datacolBox"> Yuli Gurriel </td>
+<td class="datacolBox">Houston Astros</td><td class="datacolBox">.319</td><td class="datacolBox">Top 25</td></tr>
+<tr><td class="datacolBlue">Doubles</td><td class="datacolBox">Jeimer Candelario</td></tr>
+</table>
+<table class="boxed">
+<tr><td class="header" colspan="5"><h2>2021 American League</h2><p>American League 2021 Pitching Statistics</p></td></tr>
+<tr><td class="banner">Statistic</td><td class="banner">Name(s)</td><td class="banner">Team(s)</td>
+<td class="banner">#</td><td class="banner">Top 25</td></tr>
+<tr><td class="datacolBlue">Wins</td><td class="datacolBox">Gerrit Cole</td>
+<td class="datacolBox">New York Yankees</td><td class="datacolBox">16</td><td class="datacolBox">Top 25</td></tr>
+</table>
+<table class="boxed"><tr><td class="datacolBlue">Third table</td><td>ignored</td></tr></table>
+</body></html>
+"""
+
+YEAR_MENU = """
+<table class="boxed">
+<tr><td class="header">American League</td></tr>
+<tr><td class="datacolBox"><table class="ba-sub"><tr>
+<td><a href="yearly/yr2021a.shtml">2021</a></td><td><a href="yearly/yr2022a.shtml">2022</a></td>
+</tr></table></td></tr>
+<tr><td class="header">National League</td></tr>
+<tr><td class="datacolBox"><table class="ba-sub"><tr>
+<td><a href="yearly/yr2021n.shtml">2021</a></td>
+</tr></table></td></tr>
+</table>
+"""
+
+PARSERS = ['lxml', 'html.parser']
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_duplicate_and_empty_banners_keep_every_column(parser):
+    soup = parse_html(YEAR_PAGE, parser)
+    df = scrape_stats_table(soup.find('table', class_='boxed'))
+
+    assert list(df.columns) == ROW_FIELDS + ['year', 'league', 'stat_title']
+    assert df[ROW_FIELDS].values.tolist() == [
+        ['Base on Balls', 'Joey Gallo', 'Texas Rangers', '111', 'Top 25'],
+        ['Batting Average', 'Yuli Gurriel', 'Houston Astros', '.319', 'Top 25'],
+    ]
+    assert set(df['year']) == {'2021'}
+    assert set(df['league']) == {'American League'}
+    assert set(df['stat_title']) == {'Hitting Statistics'}
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_page_rows_come_from_the_first_two_boxed_tables(parser):
+    rows = list(iter_page_stats(parse_html(YEAR_PAGE, parser)))
+
+    assert [row['statistic'] for row in rows] == ['Base on Balls', 'Batting Average', 'Wins']
+    assert rows[-1]['stat_title'] == 'Pitching Statistics'
+    assert rows[-1]['team_name'] == 'New York Yankees'
+
+
+def test_parsers_agree():
+    assert list(iter_page_stats(parse_html(YEAR_PAGE, 'lxml'))) == \
+        list(iter_page_stats(parse_html(YEAR_PAGE, 'html.parser')))
+
+
+def test_table_without_rows_gives_empty_frame():
+    soup = parse_html('<table class="boxed"><tr><td class="header"><h2>2021 American League</h2></td></tr></table>')
+    df = scrape_stats_table(soup.find('table', class_='boxed'))
+
+    assert df.empty
+    assert list(df.columns) == ROW_FIELDS + ['year', 'league', 'stat_title']
+
+
+def test_link_list_reads_year_menu():
+    soup = parse_html(YEAR_MENU)
+    headers = soup.find_all('td', class_='header')
+
+    assert link_list(headers[0], 'https://example.com/') == [
+        {'year_href': 'https://example.com/yearly/yr2021a.shtml', 'year': '2021', 'league_name': 'American League'},
+        {'year_href': 'https://example.com/yearly/yr2022a.shtml', 'year': '2022', 'league_name': 'American League'},
+    ]
+    assert link_list(headers[1], 'https://example.com/') == [
+        {'year_href': 'https://example.com/yearly/yr2021n.shtml', 'year': '2021', 'league_name': 'National League'},
+    ]